@@ -0,0 +1,67 @@
+"""条目内存基准：对比 bibtexparser 原始 dict 与 BibEntry（字段名小写驻留）的内存占用。
+
+用法：python benchmarks/bench_entries.py [--entries 20000]
+
+两种表示各自从同一份 .bib 文本解析；占用按 sys.getsizeof 累加全部条目中
+不重复的对象（条目 dict、字段名、字段值），共享的字符串只计一次。
+key objects 为字段名字符串对象的个数，驻留后应等于字段名的种类数。
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import bibtexparser  # noqa: E402
+from bibtexparser.bparser import BibTexParser  # noqa: E402
+
+from bibcheck.entries import to_entries  # noqa: E402
+from synth import make_entry  # noqa: E402
+
+
+def parse_raw(text: str) -> list:
+    parser = BibTexParser(common_strings=True)
+    parser.customization = None
+    return bibtexparser.loads(text, parser=parser).entries
+
+
+def footprint(entries: list) -> tuple:
+    """返回 (字节数, 字段名对象数)。"""
+    seen = set()
+    size = 0
+    keys = set()
+    for entry in entries:
+        for obj in (entry, *entry.keys(), *entry.values()):
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                size += sys.getsizeof(obj)
+        keys.update(id(k) for k in entry)
+    return size, len(keys)
+
+
+def run(n_entries: int) -> None:
+    text = "\n".join(make_entry(i) for i in range(n_entries))
+    rows = []
+    for name, convert in (("dict (bibtexparser)", list), ("BibEntry (interned)", to_entries)):
+        raw = parse_raw(text)
+        start = time.perf_counter()
+        entries = convert(raw)
+        elapsed = time.perf_counter() - start
+        del raw
+        rows.append((name, *footprint(entries), elapsed))
+    base = rows[0][1]
+    print(f"{'representation':24} {'KB':>10} {'key objects':>12} {'convert s':>10}")
+    for name, size, key_objects, elapsed in rows:
+        print(f"{name:24} {size / 1024:>10.0f} {key_objects:>12} {elapsed:>10.3f}  ({(size - base) / base:+.1%})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="条目内存基准")
+    parser.add_argument("--entries", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""博客页元数据提取基准：单遍流式提取器 vs 旧的逐字段正则扫描。
+
+用法：python benchmarks/bench_html_meta.py [--sizes 50000,1000000,5000000] [--repeat 5]
+
+用 fixtures/blog.html 生成页面，正文用段落填充到指定字节数；两种提取结果先做一致性校验。
+regex 为旧实现（标题/canonical/各 meta 名/BibTeX 块各扫描一遍全文），
+one-pass 为 MetaExtractor 对全文的单遍解析，streaming 为 fetch_blog 的实际路径（逐块 feed，找到 BibTeX 块后停止读取）。
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from string import Template
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bibcheck.auto.resolvers.blog_resolver import _read_page  # noqa: E402
+from bibcheck.auto.resolvers.html_meta import extract_metadata  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "blog.html")
+PARAGRAPH = "<p>" + "Residual streams carry features between layers; circuits compose them. " * 12 + "</p>\n"
+
+
+def make_page(size: int) -> str:
+    with open(FIXTURE, encoding="utf-8") as f:
+        template = Template(f.read())
+    authors = ["Ann Lee", "Bo Wu", "Chris Olah"]
+    page = template.substitute(
+        title="Toy Models of Superposition",
+        url="https://transformer-circuits.pub/2022/toy_model/index.html",
+        authors="\n".join(f'<meta name="citation_author" content="{a}"/>' for a in authors),
+        year="2022",
+        index=0,
+        bibtex_authors=" and ".join(authors),
+        filler="",
+    )
+    filler = PARAGRAPH * max(0, (size - len(page)) // len(PARAGRAPH))
+    return page.replace("<p></p>", filler, 1)
+
+
+# ---- 旧实现（逐字段正则，原 blog_resolver 中的提取函数） ----
+
+def regex_extract(html: str) -> dict:
+    return {
+        "title": _extract_title(html),
+        "canonical_url": _extract_canonical(html),
+        "authors": _extract_meta_list(html, ["citation_author", "author"]),
+        "published_date": _extract_meta_first(html, ["citation_publication_date", "article:published_time"]),
+        "bibtex_snippet": _extract_bibtex_block(html),
+    }
+
+
+def _extract_title(html: str):
+    m = re.search(r"<title>(.*?)</title>", html, flags=re.I | re.S)
+    if m:
+        return m.group(1).strip()
+    m = re.search(r'property="og:title"\s+content="([^"]+)"', html, flags=re.I)
+    if m:
+        return m.group(1).strip()
+    return None
+
+
+def _extract_canonical(html: str):
+    m = re.search(r'rel="canonical"\s+href="([^"]+)"', html, flags=re.I)
+    if m:
+        return m.group(1).strip()
+    return None
+
+
+def _extract_meta_list(html: str, names):
+    vals = []
+    for n in names:
+        for m in re.finditer(rf'name="{n}"\s+content="([^"]+)"', html, flags=re.I):
+            vals.append(m.group(1).strip())
+    return vals
+
+
+def _extract_meta_first(html: str, names):
+    for n in names:
+        m = re.search(rf'(name|property)="{n}"\s+content="([^"]+)"', html, flags=re.I)
+        if m:
+            return m.group(2).strip()
+    return None
+
+
+def _extract_bibtex_block(html: str):
+    m = re.search(r"<pre><code[^>]*>(.*?)</code></pre>", html, flags=re.I | re.S)
+    if m and ("@misc" in m.group(1) or "@article" in m.group(1)):
+        return m.group(1).strip()
+    fence = re.search(r"```(?:bibtex)?(.*?)```", html, flags=re.I | re.S)
+    if fence and ("@misc" in fence.group(1) or "@article" in fence.group(1)):
+        return fence.group(1).strip()
+    return None
+
+
+class _Response:
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    encoding = "utf-8"
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.read = 0
+
+    def iter_content(self, size):
+        for i in range(0, len(self.body), size):
+            self.read = min(len(self.body), i + size)
+            yield self.body[i:i + size]
+
+
+def bench(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, repeat: int) -> None:
+    print(f"{'page bytes':>12} {'regex ms':>10} {'one-pass ms':>12} {'streaming ms':>13} {'bytes read':>11}")
+    for size in sizes:
+        html = make_page(size)
+        body = html.encode("utf-8")
+        old, new = regex_extract(html), extract_metadata(html)
+        # 两种实现在该页面上的结果应完全一致
+        assert old == new, (old, new)
+        t_regex = bench(lambda: regex_extract(html), repeat)
+        t_one = bench(lambda: extract_metadata(html), repeat)
+        resp = _Response(body)
+        t_stream = bench(lambda: _read_page(_Response(body), max_bytes=len(body)), repeat)
+        _read_page(resp, max_bytes=len(body))
+        print(f"{len(body):>12} {t_regex * 1000:>10.2f} {t_one * 1000:>12.2f} {t_stream * 1000:>13.2f} {resp.read:>11}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="博客页元数据提取基准")
+    parser.add_argument("--sizes", default="50000,1000000,5000000", help="逗号分隔的页面字节数")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run([int(s) for s in args.sizes.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
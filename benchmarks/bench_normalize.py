@@ -0,0 +1,89 @@
+"""规范化 memo 基准：在合成的 10k 条目上跑门控 + 元数据对比 + 修复规划，统计正则执行次数。
+
+用法：python benchmarks/bench_normalize.py [--entries 10000] [--candidates 5]
+
+calls 为各规范化函数的调用总数（无 memo 时每次调用都要跑一遍正则），
+misses 为 memo 未命中、实际执行正则的次数。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bibcheck.cache import HTTPCache  # noqa: E402
+from bibcheck.fixer import FixConfig, FixPlanner  # noqa: E402
+from bibcheck.normalize import clear_normalize_caches, normalize_cache_info  # noqa: E402
+from bibcheck.validators_online import OnlineValidator, OnlineValidatorConfig  # noqa: E402
+
+WORDS = [
+    "deep", "residual", "learning", "attention", "graph", "neural", "networks", "transformer",
+    "language", "models", "scaling", "laws", "vision", "reinforcement", "policy", "optimization",
+]
+SURNAMES = ["Smith", "Lee", "He", "Zhang", "Vaswani", "Kaiser", "Brown", "Garcia", "Müller", "Tanaka"]
+VENUES = [
+    "Proceedings of the IEEE Conference on Computer Vision and Pattern Recognition (CVPR 2016)",
+    "Advances in Neural Information Processing Systems",
+    "Proc. ACM SIGKDD Conference on Knowledge Discovery 2020",
+    "Journal of Machine Learning Research",
+]
+
+
+def make_paper(rng: random.Random, idx: int) -> dict:
+    title = " ".join(rng.choice(WORDS) for _ in range(6)).title() + f" {{{idx % 97}}}"
+    authors = [f"{rng.choice(SURNAMES)}, {chr(65 + rng.randrange(26))}." for _ in range(rng.randint(1, 5))]
+    return {"title": title, "authors": authors, "year": str(2010 + rng.randrange(14)), "venue": rng.choice(VENUES)}
+
+
+def run(n_entries: int, n_candidates: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    # 合并后的大文件里同一论文、同一批候选会反复出现，这里用有限论文池模拟
+    pool = [make_paper(rng, i) for i in range(max(1, n_entries // 4))]
+    validator = OnlineValidator(
+        OnlineValidatorConfig(offline=True, sources=[], match_workers=1),
+        cache=HTTPCache(path=":memory:"),
+    )
+    planner = FixPlanner(FixConfig())
+    clear_normalize_caches()
+    start = time.perf_counter()
+    for i in range(n_entries):
+        paper = rng.choice(pool)
+        entry = {
+            "ID": f"k{i}",
+            "ENTRYTYPE": "article",
+            "title": paper["title"],
+            "author": " and ".join(paper["authors"]),
+            "year": paper["year"],
+            "journal": paper["venue"],
+        }
+        candidates = [dict(rng.choice(pool)) for _ in range(n_candidates - 1)] + [dict(paper)]
+        for c in candidates:
+            c["source"] = "bench"
+        resolved, candidates, _ = validator._apply_confidence_gating(entry, candidates, "scholarly_cslike")
+        online = {"resolved": resolved, "candidate_matches": candidates, "title_match_score": (resolved or {}).get("score")}
+        planner.build_plan(entry, [], online)
+    elapsed = time.perf_counter() - start
+
+    total_calls = total_misses = 0
+    print(f"{'function':48} {'calls':>10} {'regex runs':>12}")
+    for name, stats in sorted(normalize_cache_info().items()):
+        total_calls += stats["calls"]
+        total_misses += stats["misses"]
+        print(f"{name:48} {stats['calls']:>10} {stats['misses']:>12}")
+    saved = 1 - total_misses / total_calls if total_calls else 0.0
+    print(f"{'total':48} {total_calls:>10} {total_misses:>12}  (-{saved:.1%})")
+    print(f"{n_entries} entries x {n_candidates} candidates in {elapsed:.2f}s ({n_entries / elapsed:.0f} entries/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="规范化 memo 基准")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--candidates", type=int, default=5)
+    args = parser.parse_args()
+    run(args.entries, args.candidates)
+
+
+if __name__ == "__main__":
+    main()
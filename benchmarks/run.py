@@ -0,0 +1,237 @@
+"""端到端吞吐基准：合成 .bib + 本地桩服务器，测 run_check / run_fix / run_autofix。
+
+每个（模式, 规模）组合在独立子进程里运行（独立 HOME，即空的 HTTP 缓存），报告：
+entries/sec、单条目耗时 p50/p95、峰值 RSS，并可与保存的基线比较。
+
+    python benchmarks/run.py --sizes 100,1000 --modes check,fix,autofix
+    python benchmarks/run.py --sizes 100 --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --sizes 100 --compare benchmarks/baseline.json --fail-on-regression
+
+默认 --min-interval 0 关闭客户端限流，--latency/--rate-limit 控制桩服务器行为；
+--bibcheck-args 可切换数据源组合（如加上 --exhaustive-search 覆盖 OpenAlex/S2/DBLP 回放）。
+"""
+import argparse
+import json
+import os
+import resource
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+DEFAULT_SIZES = "100,1000"
+ALL_SIZES = "100,1000,10000,100000"
+MODES = ("check", "fix", "autofix")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+# ---------------------------------------------------------------- child process
+
+
+def _install_rewriting_session(stub_url: str) -> None:
+    """把所有外部主机的请求改写到桩服务器：https://host/path -> {stub}/host/path。"""
+    import requests
+
+    base_session = requests.Session
+    stub_host = urlsplit(stub_url).netloc
+
+    class RewritingSession(base_session):
+        def request(self, method, url, *args, **kwargs):
+            parts = urlsplit(url)
+            if parts.netloc and parts.netloc != stub_host:
+                url = f"{stub_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+            return super().request(method, url, *args, **kwargs)
+
+    requests.Session = RewritingSession
+
+
+def _install_entry_timer(marks: List[float]):
+    """在 plan_lookups（条目循环开始前）与每次 collect_entry 处打点，得到单条目耗时。"""
+    from bibcheck.report import ReportBuilder
+    from bibcheck.validators_online import OnlineValidator
+
+    plan_lookups = OnlineValidator.plan_lookups
+    collect_entry = ReportBuilder.collect_entry
+
+    def timed_plan(self, entries):
+        result = plan_lookups(self, entries)
+        marks.append(time.perf_counter())
+        return result
+
+    def timed_collect(self, *args, **kwargs):
+        status = collect_entry(self, *args, **kwargs)
+        marks.append(time.perf_counter())
+        return status
+
+    OnlineValidator.plan_lookups = timed_plan
+    ReportBuilder.collect_entry = timed_collect
+
+
+def run_child(args) -> None:
+    sys.path.insert(0, ROOT)
+    _install_rewriting_session(args.stub)
+    import contextlib
+    import io
+
+    from bibcheck import cli
+
+    marks: List[float] = []
+    _install_entry_timer(marks)
+    argv = [args.bib, "--outdir", args.outdir, "--progress", "never", "--min-interval", str(args.min_interval)]
+    argv += shlex.split(args.bibcheck_args or "")
+    if args.mode == "fix":
+        argv.append("--fix")
+    elif args.mode == "autofix":
+        argv.append("--autofix")
+    cli_args = cli.build_parser().parse_args(argv)
+    os.makedirs(args.outdir, exist_ok=True)
+    runner = {"check": cli.run_check, "fix": cli.run_fix, "autofix": cli.run_autofix_cli}[args.mode]
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner(cli_args)
+    wall = time.perf_counter() - started
+
+    per_entry = [b - a for a, b in zip(marks, marks[1:])]
+    entries = len(per_entry)
+    result = {
+        "entries": entries,
+        "wall_s": round(wall, 3),
+        "entries_per_s": round(entries / wall, 2) if wall > 0 else 0.0,
+        "p50_ms": round(percentile(per_entry, 50) * 1000, 2),
+        "p95_ms": round(percentile(per_entry, 95) * 1000, 2),
+        # Linux 上 ru_maxrss 单位为 KB
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    with open(args.result, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+# ---------------------------------------------------------------- parent process
+
+
+def run_suite(args) -> Dict[str, dict]:
+    from stub_server import StubServer
+    from synth import write_bib
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    modes = [m for m in args.modes.split(",") if m.strip()]
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bibcheck-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    server = StubServer(latency=args.latency, rate_limit=args.rate_limit, blog_kb=args.blog_kb).start()
+    results: Dict[str, dict] = {}
+    try:
+        for size in sizes:
+            bib = os.path.join(workdir, f"bench_{size}.bib")
+            if not os.path.exists(bib):
+                write_bib(bib, size)
+            for mode in modes:
+                key = f"{mode}@{size}"
+                home = tempfile.mkdtemp(prefix="home-", dir=workdir)
+                result_path = os.path.join(home, "result.json")
+                cmd = [
+                    sys.executable, os.path.abspath(__file__), "--child",
+                    "--mode", mode, "--bib", bib, "--stub", server.url,
+                    "--outdir", os.path.join(home, "out"), "--result", result_path,
+                    "--min-interval", str(args.min_interval),
+                    "--bibcheck-args", args.bibcheck_args,
+                ]
+                # 独立 HOME -> 空的 ~/.cache/bibcheck，保证每次都真实走桩服务器
+                env = dict(os.environ, HOME=home, PYTHONPATH=os.pathsep.join([ROOT, HERE]))
+                subprocess.run(cmd, env=env, check=True)
+                with open(result_path, "r", encoding="utf-8") as f:
+                    results[key] = json.load(f)
+                r = results[key]
+                print(
+                    f"{key:16} {r['entries']:>7} entries  {r['entries_per_s']:>9.1f} entries/s  "
+                    f"p50 {r['p50_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms  RSS {r['peak_rss_mb']:>7.1f} MB",
+                    flush=True,
+                )
+    finally:
+        server.stop()
+    throttled = {host: n for (host, status), n in server.state.responses.items() if status == 429}
+    print(f"stub requests: {dict(server.state.requests)} throttled: {throttled}")
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> bool:
+    """返回是否存在回退：吞吐下降或 p95/RSS 上升超过 tolerance。"""
+    regressed = False
+    print(f"\n{'case':16} {'metric':14} {'baseline':>10} {'current':>10} {'delta':>8}")
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base:
+            print(f"{key:16} (no baseline)")
+            continue
+        for metric, higher_is_better in (("entries_per_s", True), ("p95_ms", False), ("peak_rss_mb", False)):
+            old, new = base.get(metric), current.get(metric)
+            if not old:
+                continue
+            delta = (new - old) / old
+            bad = delta < -tolerance if higher_is_better else delta > tolerance
+            regressed |= bad
+            flag = "  REGRESSION" if bad else ""
+            print(f"{key:16} {metric:14} {old:>10.2f} {new:>10.2f} {delta:>+7.1%}{flag}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="bibcheck 端到端吞吐基准")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"逗号分隔的条目数，完整规模为 {ALL_SIZES}")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--latency", type=float, default=0.005, help="桩服务器每请求延迟（秒）")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="桩服务器每主机每秒请求上限，0 为不限")
+    parser.add_argument("--blog-kb", type=int, default=4)
+    parser.add_argument("--min-interval", type=float, default=0.0, help="传给 bibcheck 的 --min-interval")
+    parser.add_argument(
+        "--bibcheck-args",
+        default="",
+        help='附加给 bibcheck 的参数，如 "--sources openalex,s2 --enable-dblp --exhaustive-search"',
+    )
+    parser.add_argument("--workdir", default=None, help="合成文件与输出目录，默认临时目录")
+    parser.add_argument("--json", default=None, help="把结果写入 JSON 文件")
+    parser.add_argument("--compare", default=None, help="与基线 JSON 比较")
+    parser.add_argument("--save-baseline", default=None, help="把本次结果保存为基线")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="回退判定阈值，默认 20%%")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    # 子进程参数
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--bib", help=argparse.SUPPRESS)
+    parser.add_argument("--stub", help=argparse.SUPPRESS)
+    parser.add_argument("--outdir", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    sys.path.insert(0, HERE)
+    results = run_suite(args)
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance) and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""基准用本地桩服务器：回放 fixtures/ 下录制的 Crossref/OpenAlex/S2/arXiv/DBLP/CITATION.cff/博客响应。
+
+请求路径的第一段是原始主机名（如 /api.crossref.org/works/10.5555/bench.1），由基准进程里的
+会话把真实 URL 改写过来。响应中的标题/作者/年份按合成论文编号（见 synth.py）替换，
+限流（按主机的令牌桶，超限返回 429 + Retry-After）、固定延迟与故障注入复用 bibcheck.mockserver。
+
+单独启动：python benchmarks/stub_server.py --port 8765 --latency 0.05 --rate-limit 20
+"""
+import argparse
+import copy
+import json
+import os
+import re
+import sys
+from string import Template
+from typing import Dict, Optional
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bibcheck.mockserver import Corpus, MockServer, MockState, Response  # noqa: E402
+from synth import index_from_text, paper  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+_DOI_RE = re.compile(r"10\.5555/bench\.(\d+)", flags=re.I)
+_ARXIV_RE = re.compile(r"23(\d{2})\.(\d{5})")
+_REPO_RE = re.compile(r"^/bench-org/tool(\d+)/[^/]+/CITATION\.cff$")
+_POST_RE = re.compile(r"/post-(\d+)")
+_ENTRY_RE = re.compile(r"  <entry>.*</entry>\n", flags=re.S)
+
+
+def _load(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class Fixtures:
+    def __init__(self, blog_kb: int = 4):
+        self.json = {
+            name: json.loads(_load(f"{name}.json"))
+            for name in ("crossref_work", "crossref_search", "openalex_work", "openalex_search", "s2_paper", "s2_search", "dblp_search")
+        }
+        feed = _load("arxiv_query.xml")
+        self.arxiv_entry = Template(_ENTRY_RE.search(feed).group(0))
+        self.arxiv_feed = Template(_ENTRY_RE.sub("${entries}", feed))
+        self.cff = Template(_load("CITATION.cff"))
+        self.blog = Template(_load("blog.html"))
+        self.filler = ("Recorded paragraph of blog body text. " * 28 + "\n") * max(0, blog_kb)
+
+    def crossref_item(self, item: dict, p: dict) -> dict:
+        item = copy.deepcopy(item)
+        item.update(
+            {
+                "DOI": p["doi"],
+                "title": [p["title"]],
+                "container-title": [p["venue"]],
+                "issued": {"date-parts": [[int(p["year"]), 6]]},
+                "URL": f"http://dx.doi.org/{p['doi']}",
+                "author": [{"given": a.split()[0], "family": a.split()[-1], "sequence": "additional", "affiliation": []} for a in p["authors"]],
+            }
+        )
+        return item
+
+    def openalex_item(self, item: dict, p: dict) -> dict:
+        item = copy.deepcopy(item)
+        item.update(
+            {
+                "doi": f"https://doi.org/{p['doi']}",
+                "title": p["title"],
+                "display_name": p["title"],
+                "publication_year": int(p["year"]),
+                "authorships": [{"author_position": "middle", "author": {"display_name": a}} for a in p["authors"]],
+            }
+        )
+        item["primary_location"] = {"source": {"display_name": p["venue"]}}
+        return item
+
+    def s2_item(self, item: dict, p: dict) -> dict:
+        item = copy.deepcopy(item)
+        item.update(
+            {
+                "title": p["title"],
+                "venue": p["venue"],
+                "year": int(p["year"]),
+                "authors": [{"name": a} for a in p["authors"]],
+                "externalIds": {"DOI": p["doi"]},
+            }
+        )
+        return item
+
+
+class StubState(MockState):
+    """沿用 MockState 的限流、延迟与故障注入，路由改为按主机回放录制的 fixture；路径第一段即主机名。"""
+
+    def __init__(self, latency: float = 0.0, rate_limit: float = 0.0, blog_kb: int = 4):
+        # 按主机的令牌桶：容量与速率都等于 rate_limit（次/秒），0 表示不限流
+        super().__init__(Corpus([]), latency=latency, rate_limits={"*": rate_limit})
+        self.fixtures = Fixtures(blog_kb)
+
+    def route(self, host: str, path: str, query: Dict[str, str]) -> Optional[Response]:
+        fx = self.fixtures
+        if host == "api.crossref.org":
+            if path.startswith("/works/"):
+                p = _paper_from_doi(path)
+                if p is None:
+                    return None
+                body = copy.deepcopy(fx.json["crossref_work"])
+                body["message"] = fx.crossref_item(body["message"], p)
+                return _json(body)
+            body = copy.deepcopy(fx.json["crossref_search"])
+            p = _paper_from_text(query.get("query.bibliographic"))
+            items = body["message"]["items"]
+            body["message"]["items"] = ([fx.crossref_item(items[0], p)] if p else []) + items[1:]
+            return _json(body)
+        if host == "api.openalex.org":
+            if path.startswith("/works/"):
+                p = _paper_from_doi(path)
+                return _json(fx.openalex_item(fx.json["openalex_work"], p)) if p else None
+            body = copy.deepcopy(fx.json["openalex_search"])
+            p = _paper_from_text(query.get("filter"))
+            body["results"] = [fx.openalex_item(body["results"][0], p)] if p else []
+            body["meta"]["count"] = len(body["results"])
+            return _json(body)
+        if host == "api.semanticscholar.org":
+            if path.endswith("/paper/search"):
+                body = copy.deepcopy(fx.json["s2_search"])
+                p = _paper_from_text(query.get("query"))
+                body["data"] = [fx.s2_item(body["data"][0], p)] if p else []
+                body["total"] = len(body["data"])
+                return _json(body)
+            p = _paper_from_doi(path)
+            return _json(fx.s2_item(fx.json["s2_paper"], p)) if p else None
+        if host == "export.arxiv.org":
+            entries = []
+            for arxiv_id in filter(None, (query.get("id_list") or "").split(",")):
+                m = _ARXIV_RE.search(arxiv_id)
+                if not m:
+                    continue
+                p = paper(int(m.group(1)) * 100000 + int(m.group(2)))
+                authors = "\n".join(f"    <author><name>{a}</name></author>" for a in p["authors"])
+                entries.append(fx.arxiv_entry.safe_substitute(arxiv_id=p["arxiv_id"], title=p["title"], year=p["year"], authors=authors))
+            body = fx.arxiv_feed.safe_substitute(arxiv_id=query.get("id_list", ""), entries="".join(entries))
+            return 200, "application/atom+xml; charset=utf-8", body.encode("utf-8"), {}
+        if host == "dblp.org":
+            body = copy.deepcopy(fx.json["dblp_search"])
+            p = _paper_from_text(query.get("q"))
+            hits = body["result"]["hits"]
+            if p:
+                info = hits["hit"][0]["info"]
+                info.update(
+                    {
+                        "title": p["title"] + ".",
+                        "venue": p["venue"],
+                        "year": p["year"],
+                        "doi": p["doi"],
+                        "authors": {"author": [{"text": a} for a in p["authors"]]},
+                    }
+                )
+            else:
+                hits["hit"] = []
+            return _json(body)
+        if host == "raw.githubusercontent.com":
+            m = _REPO_RE.match(path)
+            if not m or "/main/" not in path:
+                return None
+            p = paper(int(m.group(1)))
+            authors = "\n".join(f"  - family-names: {a.split()[-1]}\n    given-names: {a.split()[0]}" for a in p["authors"])
+            body = fx.cff.safe_substitute(title=p["title"], index=p["index"], year=p["year"], authors=authors)
+            return 200, "text/plain; charset=utf-8", body.encode("utf-8"), {}
+        m = _POST_RE.search(path)
+        if m:
+            p = paper(int(m.group(1)))
+            authors = "\n".join(f'<meta name="citation_author" content="{a}"/>' for a in p["authors"])
+            body = fx.blog.safe_substitute(
+                title=p["title"],
+                url=p["url"],
+                authors=authors,
+                year=p["year"],
+                index=p["index"],
+                filler=fx.filler,
+                bibtex_authors=" and ".join(p["authors"]),
+            )
+            return 200, "text/html; charset=utf-8", body.encode("utf-8"), {}
+        return None
+
+
+def _paper_from_doi(text: str) -> Optional[dict]:
+    m = _DOI_RE.search(unquote(text or ""))
+    return paper(int(m.group(1))) if m else None
+
+
+def _paper_from_text(text: Optional[str]) -> Optional[dict]:
+    index = index_from_text(text or "")
+    return paper(index) if index is not None else None
+
+
+def _json(body) -> Response:
+    return 200, "application/json", json.dumps(body).encode("utf-8"), {}
+
+
+class StubServer(MockServer):
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, rate_limit: float = 0.0, blog_kb: int = 4):
+        super().__init__(host=host, port=port, state=StubState(latency=latency, rate_limit=rate_limit, blog_kb=blog_kb))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="基准用本地桩服务器")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的固定延迟（秒）")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="每个主机每秒允许的请求数，0 为不限")
+    parser.add_argument("--blog-kb", type=int, default=4, help="博客页面正文填充大小（KB）")
+    args = parser.parse_args()
+    server = StubServer(port=args.port, latency=args.latency, rate_limit=args.rate_limit, blog_kb=args.blog_kb)
+    print(f"stub server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
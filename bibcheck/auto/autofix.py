@@ -1,24 +1,45 @@
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+
 import requests
 
-from .cache import HTTPCache
 from .matchers.title_match import title_score
 from .matchers.author_match import author_score
 from .matchers.venue_match import venue_score
 from .core.confidence import confidence
-from .core.normalize import norm_doi
-from .resolvers.doi_resolver import resolve_doi
-from .resolvers.arxiv_resolver import resolve_arxiv
-from .resolvers.crossref_resolver import search_crossref
-from .resolvers.semanticscholar_resolver import search_s2
-from .resolvers.openalex_resolver import search_openalex
+from .blog_detector import BlogDetector
+from .host_limiter import HostLimiter
+from ..bibpatch import fields_changed, write_bib_patched
+from ..checkpoint import Checkpoint, restore_entry
 from ..parser import load_bib_entries
 from ..cache import HTTPCache as LegacyCache
-from ..report import ReportBuilder, write_json_report, write_csv_report
+from ..report import open_report_builder
 from ..validators_static import run_static_validations
+from ..metrics import InstrumentedCache
+from ..profiling import Profiler
+from ..sources.http import RetryPolicy
 from ..validators_online import OnlineValidator, OnlineValidatorConfig
 
 
+@dataclass
+class _Run:
+    """一次 run_autofix 内各工作线程共用的对象与参数；随调用传递，同一进程内的多次运行互不影响。"""
+
+    validator: OnlineValidator
+    session: requests.Session
+    cache: InstrumentedCache
+    host_limiter: HostLimiter
+    detector: Optional[BlogDetector]
+    min_conf: float
+    scope: str
+    allow_network: bool
+    user_agent: str
+    profiler: Profiler
+
+
 def run_autofix(
     bibfile: str,
     out_bib: str,
@@ -28,76 +49,184 @@ def run_autofix(
     scope: str = "high",
     allow_network: bool = True,
     user_agent: str = "bibcheck/auto-fix",
+    min_interval: float = 1.0,
+    base_urls: Optional[Dict[str, str]] = None,
+    retry_deadline: float = 30.0,
+    breaker_threshold: int = 5,
+    entry_timeout: Optional[float] = None,
+    run_deadline: Optional[float] = None,
+    metrics_prom: Optional[str] = None,
+    profiler: Optional[Profiler] = None,
+    checkpoint: Optional[Checkpoint] = None,
+    report_detail: str = "full",
+    report_top_k: int = 3,
+    columnar: Optional[str] = None,
+    workers: int = 4,
+    blog_domains: Optional[str] = None,
 ):
-    entries, parse_issues = load_bib_entries(bibfile, max_entries=None)
-    report_builder = ReportBuilder()
+    profiler = profiler or Profiler()
+    with profiler.phase("parse"):
+        entries, parse_issues = load_bib_entries(bibfile, max_entries=None)
+    report_builder = open_report_builder(
+        out_report_json, out_report_csv, detail=report_detail, top_k=report_top_k, columnar=columnar, bibfile=bibfile
+    )
     for issue in parse_issues:
         report_builder.add_file_issue(issue)
 
-    static_results = run_static_validations(entries)
+    with profiler.phase("static"):
+        static_results = run_static_validations(entries)
     online_validator = OnlineValidator(
         OnlineValidatorConfig(
             offline=not allow_network,
             sources=["crossref", "openalex", "s2"],
             verbose=False,
             user_agent=user_agent,
+            min_interval=min_interval,
+            base_urls=base_urls,
+            retry=RetryPolicy(deadline=retry_deadline),
+            breaker_threshold=breaker_threshold,
+            entry_timeout=entry_timeout,
+            run_deadline=run_deadline,
         )
     )
-    session = requests.Session()
-    session.headers["User-Agent"] = user_agent
-    cache = HTTPCache()
+    run = _Run(
+        validator=online_validator,
+        # 与主校验器共用会话（连接池）与缓存库；autofix 的缓存统计单独记在 autofix.* 下
+        session=online_validator.session,
+        cache=InstrumentedCache(online_validator.cache.cache, online_validator.metrics, namespace="autofix"),
+        host_limiter=HostLimiter(min_interval),
+        detector=BlogDetector.from_config(blog_domains) if blog_domains else None,
+        min_conf=min_conf,
+        scope=scope,
+        allow_network=allow_network,
+        user_agent=user_agent,
+        profiler=profiler,
+    )
+    profiler.attach(online_validator.metrics)
+    # 预规划：重复的 DOI/arXiv ID/标题在整个文件中只请求一次
+    with profiler.phase("plan_lookups"):
+        online_validator.plan_lookups(entries)
+
+    done_by_index = {}
+    if checkpoint:
+        for index, entry in enumerate(entries):
+            done = checkpoint.get(index, entry["ID"])
+            if done is not None:
+                done_by_index[index] = done
+    if allow_network:
+        # arXiv 条目合并为一次（每 100 个 ID）批量请求
+        with profiler.phase("arxiv_prefetch"):
+            online_validator.prefetch_arxiv([e for i, e in enumerate(entries) if i not in done_by_index])
+
+    def tasks():
+        for index, entry in enumerate(entries):
+            # 修改前的副本须在提交给工作线程之前取
+            yield index, entry, entry.copy(), done_by_index.get(index)
+
+    def fix(task):
+        index, entry, before, done = task
+        if done is not None:
+            return None
+        return _fix_entry(entry, run)
+
+    # 被改动条目的原始版本（索引 -> 条目），写 bib 时只改写这些条目
+    originals = {}
+    with profiler.concurrent(workers):
+        for (index, entry, before, done), result in _in_order(tasks(), fix, workers):
+            if done is not None:
+                restore_entry(entry, done["entry"])
+                report_builder.restore_entry(done["record"])
+            else:
+                online_result, suggested = result
+                with profiler.phase("collect"):
+                    report_builder.collect_entry(entry, static_results.get(entry["ID"], []), online_result, fix_plan_preview=suggested)
+                if checkpoint:
+                    checkpoint.append(index, entry["ID"], report_builder.last_record, entry)
+            if fields_changed(before, entry):
+                originals[index] = before
 
-    for entry in entries:
-        issues = static_results.get(entry["ID"], [])
-        online_result = online_validator.validate_entry(entry)
+    if checkpoint:
+        checkpoint.close()
+    online_validator.planner.save()
+    report_data = report_builder.build()
+    report_data["degraded_sources"] = online_validator.http.breakers.degraded()
+    report_data["metrics"] = online_validator.metrics.snapshot()
+    if metrics_prom:
+        online_validator.metrics.write_prometheus(metrics_prom)
+    with profiler.phase("write_report"):
+        report_builder.finish(report_data)
+    with profiler.phase("write_bib"):
+        _write_bib(entries, out_bib, source=bibfile, originals=originals)
+    return report_data
+
+
+def _fix_entry(entry, run: _Run):
+    """单个条目的在线校验 + 补充解析 + 博客修复，在工作线程中执行，只修改该条目本身。"""
+    profiler = run.profiler
+    with profiler.entry(entry["ID"]):
+        with profiler.phase("online"):
+            online_result = run.validator.validate_entry(entry)
+        # 超出时限的条目不再走补充解析/博客抓取
+        entry_network = run.allow_network and not online_result.get("timed_out") and not run.validator.run_expired()
         # corrections_suggested/applied
-        suggested, applied = _plan_and_apply(entry, online_result, session, cache, min_conf, scope, allow_network, user_agent)
+        with profiler.phase("autofix_plan"):
+            planned = online_result
+            if entry_network and not online_result.get("resolved"):
+                # 未通过门控时复用在线校验的候选；没有候选时只读校验器缓存（同一规范化 key），不再额外联网
+                records = online_result.get("candidate_matches") or run.validator.cached_records(entry, run.cache)
+                best = max(records, key=lambda r: _record_confidence(entry, r), default=None)
+                planned = dict(online_result, resolved=best)
+            suggested, applied = _plan_and_apply(entry, planned, run.min_conf, run.scope)
         # blog-aware autofix
-        if scope in ("high", "all") and allow_network:
+        if run.scope in ("high", "all") and entry_network:
             from .blog_fixer import plan_blog_fix
-            blog_suggested, blog_applied = plan_blog_fix(entry, session, cache, user_agent, min_conf, accessed_date=None)
+            with profiler.phase("blog_fix"):
+                blog_suggested, blog_applied = plan_blog_fix(
+                    entry, run.session, run.cache, run.user_agent, run.min_conf,
+                    accessed_date=None, host_limiter=run.host_limiter, detector=run.detector,
+                )
             suggested.extend(blog_suggested)
             applied.extend(blog_applied)
         entry["_auto_patches"] = {"suggested": suggested, "applied": applied}
-        report_builder.collect_entry(entry, issues, online_result, fix_plan_preview=suggested)
+    return online_result, suggested
 
-    report_data = report_builder.build()
-    write_json_report(report_data, out_report_json)
-    write_csv_report(report_data, out_report_csv)
-    _write_bib(entries, out_bib)
-    return report_data
+
+def _in_order(tasks, fn, workers: int):
+    """按提交顺序产出 (task, fn(task))；workers > 1 时用线程池并发执行，最多 workers * 4 个任务在途。"""
+    if workers <= 1:
+        for task in tasks:
+            yield task, fn(task)
+        return
+    pending = deque()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="autofix")
+    try:
+        for task in tasks:
+            pending.append((task, pool.submit(fn, task)))
+            if len(pending) >= workers * 4:
+                task, future = pending.popleft()
+                yield task, future.result()
+        while pending:
+            task, future = pending.popleft()
+            yield task, future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
 
 
-def _plan_and_apply(entry, online_result, session, cache, min_conf, scope, allow_network, user_agent):
+def _plan_and_apply(entry, online_result, min_conf, scope):
+    """按 online_result 的 resolved 记录生成并应用字段补丁；候选/缓存回退由 _fix_entry 事先填入。"""
     suggested = []
     applied = []
     resolved = online_result.get("resolved")
-    candidates = online_result.get("candidate_matches") or []
     target_fields = ["title", "author", "year", "doi", "url", "eprint", "journal", "howpublished"]
     if scope == "all":
         target_fields += ["booktitle", "volume", "number", "pages"]
 
-    # 额外来源：直接解析 doi/arxiv/模糊检索
-    if allow_network and not resolved:
-        if entry.get("doi"):
-            resolved = resolve_doi(entry.get("doi"), session, cache, user_agent)
-        if not resolved and entry.get("eprint"):
-            resolved = resolve_arxiv(entry.get("eprint"), session, cache, user_agent)
-        if not resolved and entry.get("url"):
-            if "arxiv.org" in entry.get("url", ""):
-                resolved = resolve_arxiv(entry.get("url"), session, cache, user_agent)
-        if not resolved:
-            resolved = search_crossref(entry.get("title", ""), session, cache, user_agent) or \
-                       search_s2(entry.get("title", ""), session, cache, user_agent) or \
-                       search_openalex(entry.get("title", ""), session, cache, user_agent)
-
     if not resolved:
         return suggested, applied
 
-    t = title_score(entry.get("title"), resolved.get("title"))
-    a = author_score(entry.get("author", ""), resolved.get("authors", []))
-    v = venue_score(entry.get("journal") or entry.get("booktitle") or "", resolved.get("venue", ""))
-    conf = confidence(t, a, v, resolved_by_doi=bool(entry.get("doi") or resolved.get("doi")))
+    conf = _record_confidence(entry, resolved)
+    if resolved.get("source") == "arxiv" and resolved.get("id") and not resolved.get("eprint"):
+        resolved = {**resolved, "eprint": resolved["id"]}
 
     for f in target_fields:
         new_val = resolved.get(f)
@@ -126,7 +255,16 @@ def _plan_and_apply(entry, online_result, session, cache, min_conf, scope, allow
     return suggested, applied
 
 
-def _write_bib(entries, path: str):
+def _record_confidence(entry, record):
+    t = title_score(entry.get("title"), record.get("title"))
+    a = author_score(entry.get("author", ""), record.get("authors", []))
+    v = venue_score(entry.get("journal") or entry.get("booktitle") or "", record.get("venue") or "")
+    return confidence(t, a, v, resolved_by_doi=bool(entry.get("doi") or record.get("doi")))
+
+
+def _write_bib(entries, path: str, source: Optional[str] = None, originals: Optional[Dict[int, dict]] = None):
+    if source and originals is not None and write_bib_patched(source, path, entries, originals):
+        return
     from bibtexparser.bibdatabase import BibDatabase
     from bibtexparser.bwriter import BibTexWriter
 
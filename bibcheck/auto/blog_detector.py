@@ -1,4 +1,8 @@
 import re
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import yaml
 
 DEFAULT_BLOG_DOMAINS = [
     "openai.com",
@@ -14,26 +18,81 @@ DEFAULT_BLOG_DOMAINS = [
     "ai.googleblog.com",
     "example.com",
 ]
+DEFAULT_HINTS = ["blog", "research", "thread", "project page", "distill", "transformer circuits"]
+_WEB_TYPES = {"misc", "online", "techreport", "unpublished"}
+
+
+class BlogDetector:
+    """博客/项目页识别：URL 只解析一次，主机名按后缀在哈希集合中查找，提示词正则预编译。
+
+    域名匹配的是主机名本身或其子域（blog.example.com 命中 example.com，notexample.com / example.com.evil 不命中），
+    每个条目的查找次数只取决于主机名的标签数，与域名列表长度无关。
+    """
 
+    def __init__(self, domains: Iterable[str] = DEFAULT_BLOG_DOMAINS, hints: Iterable[str] = DEFAULT_HINTS):
+        self.domains = frozenset(filter(None, (_normalize_domain(d) for d in domains)))
+        # 列表中最长域名的标签数，更长的后缀不可能命中
+        self.max_labels = max((d.count(".") + 1 for d in self.domains), default=0)
+        hints = [h.strip() for h in hints if h and h.strip()]
+        words = "|".join(r"\s+".join(map(re.escape, h.split())) for h in hints)
+        self.hint_re = re.compile(rf"\b(?:{words})\b", flags=re.I) if hints else None
 
-def is_web_scholarly(entry: dict, allow_domains=None) -> bool:
-    allow_domains = allow_domains or DEFAULT_BLOG_DOMAINS
-    etype = entry.get("ENTRYTYPE", "").lower()
-    url = entry.get("url") or ""
-    doi = entry.get("doi")
-    if not url:
+    @classmethod
+    def from_config(cls, path: str) -> "BlogDetector":
+        """读取 YAML：{"domains": [...], "hints": [...]} 或仅域名列表；在默认列表基础上追加。"""
+        with open(path, "r", encoding="utf-8") as f:
+            payload = yaml.safe_load(f) or {}
+        if isinstance(payload, list):
+            payload = {"domains": payload}
+        if not isinstance(payload, dict):
+            raise ValueError(f"无法识别的博客域名配置: {path}")
+        return cls(
+            DEFAULT_BLOG_DOMAINS + [str(d) for d in payload.get("domains") or []],
+            DEFAULT_HINTS + [str(h) for h in payload.get("hints") or []],
+        )
+
+    def domain_match(self, url: str) -> bool:
+        labels = _host(url).split(".")
+        for i in range(max(0, len(labels) - self.max_labels), len(labels)):
+            if ".".join(labels[i:]) in self.domains:
+                return True
         return False
-    if etype in {"misc", "online", "techreport", "unpublished"} and (not doi):
-        if _domain_match(url, allow_domains):
+
+    def is_web_scholarly(self, entry: dict) -> bool:
+        url = entry.get("url") or ""
+        if not url:
+            return False
+        etype = entry.get("ENTRYTYPE", "").lower()
+        if etype in _WEB_TYPES and not entry.get("doi") and self.domain_match(url):
             return True
-    hint = (entry.get("howpublished") or "") + " " + (entry.get("note") or "") + " " + (entry.get("journal") or "")
-    if re.search(r"\b(blog|research|thread|project page|distill|transformer circuits)\b", hint, flags=re.I):
-        return True
-    return False
+        if self.hint_re is None:
+            return False
+        hint = (entry.get("howpublished") or "") + " " + (entry.get("note") or "") + " " + (entry.get("journal") or "")
+        return self.hint_re.search(hint) is not None
 
 
-def _domain_match(url: str, allow_domains) -> bool:
-    for d in allow_domains:
-        if d in url:
-            return True
-    return False
+def _normalize_domain(domain: str) -> str:
+    """允许写成 URL、带 www. 或 *. 前缀；统一为小写主机名。"""
+    host = _host(domain.strip())
+    for prefix in ("*.", "www."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host.strip(".")
+
+
+def _host(url: str) -> str:
+    if "//" not in url:
+        url = "//" + url
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return host.rstrip(".")
+
+
+def is_web_scholarly(entry: dict, allow_domains: Optional[List[str]] = None) -> bool:
+    detector = BlogDetector(allow_domains) if allow_domains else _default
+    return detector.is_web_scholarly(entry)
+
+
+_default = BlogDetector()
@@ -6,10 +6,10 @@ from .matchers.author_match import author_score
 from .core.confidence import confidence
 
 
-def plan_blog_fix(entry: dict, session, cache, user_agent: str, min_conf: float, accessed_date: str):
-    if not is_web_scholarly(entry):
+def plan_blog_fix(entry: dict, session, cache, user_agent: str, min_conf: float, accessed_date: str, host_limiter=None, detector=None):
+    if not (detector.is_web_scholarly(entry) if detector else is_web_scholarly(entry)):
         return [], []
-    resolved = fetch_blog(entry.get("url"), session, cache, user_agent)
+    resolved = fetch_blog(entry.get("url"), session, cache, user_agent, host_limiter)
     if not resolved:
         return [], []
     suggested = []
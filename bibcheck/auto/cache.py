@@ -36,15 +36,15 @@ class HTTPCache:
         finally:
             conn.close()
 
-    def get(self, key):
+    def get(self, key, default=None):
         with self._conn() as c:
             row = c.execute("SELECT payload FROM cache WHERE key=?", (key,)).fetchone()
             if not row:
-                return None
+                return default
             try:
                 return json.loads(row[0])
             except json.JSONDecodeError:
-                return None
+                return default
 
     def set(self, key, payload):
         with self._conn() as c:
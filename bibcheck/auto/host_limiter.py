@@ -0,0 +1,42 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+class _HostState:
+    __slots__ = ("slots", "next_at")
+
+    def __init__(self, max_per_host: int):
+        self.slots = threading.Semaphore(max_per_host)
+        self.next_at = 0.0
+
+
+class HostLimiter:
+    """按主机的礼貌限制：同一主机同时最多 max_per_host 个请求，相邻请求的发出间隔不小于 min_interval 秒。
+
+    不同主机之间互不等待，并发抓取网页时只对同一站点排队。
+    """
+
+    def __init__(self, min_interval: float = 1.0, max_per_host: int = 1):
+        self.min_interval = min_interval
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.max_per_host)
+        with state.slots:
+            with self._lock:
+                now = time.monotonic()
+                at = max(now, state.next_at)
+                state.next_at = at + self.min_interval
+            if at > now:
+                time.sleep(at - now)
+            yield
@@ -1,77 +1,76 @@
-import re
+import codecs
+import time
+from contextlib import nullcontext
+
 import requests
 
+from .html_meta import MetaExtractor
+
+# 需要 <head> 元数据与正文中可选的 BibTeX 块：流式读取，找到 BibTeX 块即停止，最多 MAX_BYTES
+MAX_BYTES = 512 * 1024
+_CHUNK = 16 * 1024
+_TIMEOUT = (5, 10)
+# 缓存超过该时长后用 ETag/Last-Modified 条件请求重新验证
+REVALIDATE_AFTER = 7 * 24 * 3600
 
-def fetch_blog(url: str, session: requests.Session, cache, user_agent: str):
+
+def fetch_blog(url: str, session: requests.Session, cache, user_agent: str, host_limiter=None, max_bytes: int = MAX_BYTES):
     if not url:
         return None
     ck = f"blog:{url}"
     cached = cache.get(ck)
-    if cached:
-        return cached
+    stored = cached if isinstance(cached, dict) and "fetched_at" in cached else None
+    if stored and time.time() - stored["fetched_at"] < REVALIDATE_AFTER:
+        return stored["data"]
     headers = {"User-Agent": user_agent}
+    if stored and stored.get("etag"):
+        headers["If-None-Match"] = stored["etag"]
+    if stored and stored.get("last_modified"):
+        headers["If-Modified-Since"] = stored["last_modified"]
     try:
-        r = session.get(url, headers=headers, timeout=20, allow_redirects=True)
+        with host_limiter.slot(url) if host_limiter else nullcontext():
+            with session.get(url, headers=headers, timeout=_TIMEOUT, allow_redirects=True, stream=True) as r:
+                if r.status_code == 304 and stored:
+                    stored["fetched_at"] = time.time()
+                    cache.set(ck, stored)
+                    return stored["data"]
+                if r.status_code >= 400:
+                    return None
+                page = _read_page(r, max_bytes).result()
+                resolved_url = r.url
+                etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
     except requests.RequestException:
-        return None
-    if r.status_code >= 400:
-        return None
-    html = r.text
-    resolved_url = r.url
+        # 重新验证失败时沿用旧结果
+        return stored["data"] if stored else None
     data = {
         "source": "web",
         "url": resolved_url,
-        "title": _extract_title(html),
-        "canonical_url": _extract_canonical(html) or resolved_url,
-        "authors": _extract_meta_list(html, ["citation_author", "author"]),
-        "published_date": _extract_meta_first(html, ["citation_publication_date", "article:published_time"]),
-        "bibtex_snippet": _extract_bibtex_block(html),
+        "title": page["title"],
+        "canonical_url": page["canonical_url"] or resolved_url,
+        "authors": page["authors"],
+        "published_date": page["published_date"],
+        "bibtex_snippet": page["bibtex_snippet"],
         "evidence": {},
     }
-    cache.set(ck, data)
+    cache.set(ck, {"data": data, "etag": etag, "last_modified": last_modified, "fetched_at": time.time()})
     return data
 
 
-def _extract_title(html: str):
-    m = re.search(r"<title>(.*?)</title>", html, flags=re.I | re.S)
-    if m:
-        return m.group(1).strip()
-    m = re.search(r'property="og:title"\s+content="([^"]+)"', html, flags=re.I)
-    if m:
-        return m.group(1).strip()
-    return None
-
-
-def _extract_canonical(html: str):
-    m = re.search(r'rel="canonical"\s+href="([^"]+)"', html, flags=re.I)
-    if m:
-        return m.group(1).strip()
-    return None
-
-
-def _extract_meta_list(html: str, names):
-    vals = []
-    for n in names:
-        for m in re.finditer(rf'name="{n}"\s+content="([^"]+)"', html, flags=re.I):
-            vals.append(m.group(1).strip())
-    return vals
-
-
-def _extract_meta_first(html: str, names):
-    for n in names:
-        m = re.search(rf'(name|property)="{n}"\s+content="([^"]+)"', html, flags=re.I)
-        if m:
-            return m.group(2).strip()
-    return None
-
-
-def _extract_bibtex_block(html: str):
-    # 简化：找包含 @misc/@article 的 <pre><code> 或 ``` 块
-    m = re.search(r"<pre><code[^>]*>(.*?)</code></pre>", html, flags=re.I | re.S)
-    if m and "@misc" in m.group(1) or "@article" in m.group(1):
-        return m.group(1).strip()
-    fence = re.search(r"```(?:bibtex)?(.*?)```", html, flags=re.I | re.S)
-    if fence and ("@misc" in fence.group(1) or "@article" in fence.group(1)):
-        return fence.group(1).strip()
-    return None
-
+def _read_page(resp, max_bytes: int) -> MetaExtractor:
+    """流式读取页面并逐块交给单遍提取器；提取器 done（已找到 BibTeX 块）或读满 max_bytes 即停止。"""
+    encoding = resp.encoding if "charset" in (resp.headers.get("Content-Type") or "").lower() else "utf-8"
+    try:
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    extractor = MetaExtractor()
+    read = 0
+    for chunk in resp.iter_content(_CHUNK):
+        chunk = chunk[:max_bytes - read]
+        read += len(chunk)
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done or read >= max_bytes:
+            break
+    extractor.feed(decoder.decode(b"", final=True))
+    extractor.close()
+    return extractor
@@ -0,0 +1,190 @@
+"""单遍流式 HTML 元数据提取。
+
+基于标准库 HTMLParser 的分词器，边 feed 边收集 <title>、og:* / citation_* / article:* 等 meta、
+canonical 链接、<pre>/<code> 或 ``` 围栏中的 BibTeX 块，以及 JSON-LD（ScholarlyArticle 等）元数据，
+整页只扫描一遍；done 为真（已找到 BibTeX 块）时调用方即可停止读取。
+"""
+import json
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+_META_PREFIXES = ("og:", "citation_", "article:", "dc.")
+_META_NAMES = {"author", "description"}
+_AUTHOR_KEYS = ("citation_author", "author")
+_DATE_KEYS = ("citation_publication_date", "article:published_time", "citation_date", "dc.date")
+_TITLE_KEYS = ("og:title", "citation_title", "dc.title")
+# 按优先级；JSON-LD 中第一个命中的类型生效
+_JSONLD_TYPES = ("ScholarlyArticle", "TechArticle", "Report", "BlogPosting", "Article")
+_BIBTEX_RE = re.compile(r"@\w+\s*[{(]")
+_FENCE = "```"
+
+
+class MetaExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title: Optional[str] = None
+        self.canonical: Optional[str] = None
+        self.meta: Dict[str, List[str]] = {}
+        self.bibtex: Optional[str] = None
+        self.jsonld: List[dict] = []
+        self.head_closed = False
+        self._capture: Optional[str] = None  # 正在收集文本的元素：title / pre / jsonld
+        self._buf: List[str] = []
+        self._fence: Optional[List[str]] = None
+
+    @property
+    def done(self) -> bool:
+        """已找到 BibTeX 块：只取第一个块，meta 也在其之前，后续内容不会再改变结果。
+
+        BibTeX 块通常在正文末尾，仅凭 <head> 元数据不能提前结束，否则会漏掉它。
+        """
+        return self.bibtex is not None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            self._meta(dict(attrs))
+        elif tag == "link":
+            a = dict(attrs)
+            if self.canonical is None and "canonical" in (a.get("rel") or "").lower().split() and a.get("href"):
+                self.canonical = a["href"].strip()
+        elif tag == "title" and self.title is None and self._capture is None:
+            self._start("title")
+        elif tag == "script" and (dict(attrs).get("type") or "").lower() == "application/ld+json":
+            self._start("jsonld")
+        elif tag == "pre" and self.bibtex is None and self._capture is None:
+            self._start("pre")
+        elif tag == "body":
+            self.head_closed = True
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.head_closed = True
+        if tag != self._capture and not (tag == "script" and self._capture == "jsonld"):
+            return
+        text = "".join(self._buf)
+        kind, self._capture, self._buf = self._capture, None, []
+        if kind == "title":
+            self.title = text.strip() or None
+        elif kind == "jsonld":
+            self._jsonld(text)
+        elif kind == "pre":
+            self._bibtex(text)
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._buf.append(data)
+            return
+        if self.bibtex is not None or (_FENCE not in data and self._fence is None):
+            return
+        # ``` 围栏可能跨多个文本片段
+        while data:
+            if self._fence is None:
+                start = data.find(_FENCE)
+                if start < 0:
+                    return
+                self._fence, data = [], data[start + 3:]
+                continue
+            end = data.find(_FENCE)
+            if end < 0:
+                self._fence.append(data)
+                return
+            self._fence.append(data[:end])
+            block = "".join(self._fence)
+            self._fence, data = None, data[end + 3:]
+            if block.lower().startswith("bibtex"):
+                block = block[6:]
+            if self._bibtex(block):
+                return
+
+    def result(self) -> dict:
+        """按 fetch_blog 的字段返回；meta 缺失时回退到 JSON-LD。"""
+        article = self._article()
+        authors = [v for k in _AUTHOR_KEYS for v in self.meta.get(k, [])]
+        if not authors and article:
+            authors = _jsonld_authors(article.get("author"))
+        return {
+            "title": self.title or self._first(_TITLE_KEYS) or _text(article.get("headline") or article.get("name")),
+            "canonical_url": self.canonical or self._first(("og:url",)) or _text(article.get("url")),
+            "authors": authors,
+            "published_date": self._first(_DATE_KEYS) or _text(article.get("datePublished")),
+            "bibtex_snippet": self.bibtex,
+        }
+
+    def _start(self, kind: str) -> None:
+        self._capture = kind
+        self._buf = []
+
+    def _meta(self, a: Dict[str, Optional[str]]) -> None:
+        key = (a.get("name") or a.get("property") or "").strip().lower()
+        content = (a.get("content") or "").strip()
+        if key and content and (key in _META_NAMES or key.startswith(_META_PREFIXES)):
+            self.meta.setdefault(key, []).append(content)
+
+    def _bibtex(self, text: str) -> bool:
+        if self.bibtex is None and _BIBTEX_RE.search(text):
+            self.bibtex = text.strip()
+            return True
+        return False
+
+    def _jsonld(self, text: str) -> None:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+            elif isinstance(node, dict):
+                if "@graph" in node:
+                    stack.append(node["@graph"])
+                if _jsonld_type(node):
+                    self.jsonld.append(node)
+
+    def _article(self) -> dict:
+        for t in _JSONLD_TYPES:
+            for node in self.jsonld:
+                if t in _jsonld_type(node):
+                    return node
+        return {}
+
+    def _first(self, keys) -> Optional[str]:
+        for k in keys:
+            values = self.meta.get(k)
+            if values:
+                return values[0]
+        return None
+
+
+def extract_metadata(html: str) -> dict:
+    parser = MetaExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.result()
+
+
+def _jsonld_type(node: dict) -> List[str]:
+    t = node.get("@type")
+    types = t if isinstance(t, list) else [t]
+    return [x for x in types if x in _JSONLD_TYPES]
+
+
+def _jsonld_authors(value) -> List[str]:
+    items = value if isinstance(value, list) else [value]
+    names = []
+    for item in items:
+        name = item.get("name") if isinstance(item, dict) else item
+        if isinstance(name, str) and name.strip():
+            names.append(name.strip())
+    return names
+
+
+def _text(value) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value.strip() if isinstance(value, str) and value.strip() else None
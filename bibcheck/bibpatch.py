@@ -0,0 +1,254 @@
+"""按字节区间原地改写 bib 文件。
+
+解析时记录每个条目在源文件中的字节区间（entry["_span"]），写回时只改写有变化的条目，
+其余内容（注释、@string、原有排版）按字节原样从源文件流式拷贝。
+有变化的条目按字段打补丁：改值只替换值本身，删字段只删该字段，新字段追加在最后一个字段之后，
+因此 diff 只包含真正修改的行。无法定位字段时该条目退回整体重新序列化。
+"""
+import os
+import re
+import shutil
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bibtexparser.bibdatabase import BibDatabase
+from bibtexparser.bwriter import BibTexWriter
+
+_TYPE_RE = re.compile(rb"@\s*([A-Za-z]+)\s*([{(])")
+_HEAD_RE = re.compile(r"@\s*[A-Za-z]+\s*[{(]")
+_FIELD_NAME_RE = re.compile(r"([^\s=,{}()\"#]+)\s*=\s*")
+_BARE_RE = re.compile(r"[^\s,#{}()\"]+")
+_CONCAT_RE = re.compile(r"\s*#\s*")
+_BRACE_SCAN_RE = re.compile(rb"[{}]")
+_PAREN_SCAN_RE = re.compile(rb"[{})]")
+_NON_ENTRY_TYPES = {b"comment", b"string", b"preamble"}
+_COPY_CHUNK = 1 << 20
+
+
+def scan_entries(data: bytes) -> List[Tuple[str, int, int]]:
+    """扫描源文件中的条目，返回 (citekey, start, end)；@comment/@string/@preamble 不计入。"""
+    spans = []
+    pos = 0
+    while True:
+        at = data.find(b"@", pos)
+        if at < 0:
+            return spans
+        m = _TYPE_RE.match(data, at)
+        if not m:
+            pos = at + 1
+            continue
+        end = _match_delimiter(data, m.end() - 1)
+        if end is None:
+            return spans
+        if m.group(1).lower() not in _NON_ENTRY_TYPES:
+            comma = data.find(b",", m.end(), end)
+            key_end = comma if comma >= 0 else end - 1
+            spans.append((data[m.end():key_end].strip().decode("utf-8", "replace"), at, end))
+        pos = end
+
+
+def _match_delimiter(data: bytes, open_at: int) -> Optional[int]:
+    """返回与 open_at 处 { 或 ( 配对的闭合符之后的位置。"""
+    paren = data[open_at:open_at + 1] == b"("
+    depth = 0
+    for m in (_PAREN_SCAN_RE if paren else _BRACE_SCAN_RE).finditer(data, open_at + 1):
+        ch = m.group()
+        if ch == b"{":
+            depth += 1
+        elif ch == b"}":
+            if depth == 0:
+                return None if paren else m.end()
+            depth -= 1
+        elif depth == 0:
+            return m.end()
+    return None
+
+
+def attach_spans(entries: List[dict], data: bytes) -> None:
+    """按顺序把扫描到的区间对齐到解析出的条目上（解析器跳过的条目类型在扫描结果中被略过）。"""
+    scanned = scan_entries(data)
+    j = 0
+    for entry in entries:
+        while j < len(scanned) and scanned[j][0] != entry["ID"]:
+            j += 1
+        if j == len(scanned):
+            return
+        entry["_span"] = (scanned[j][1], scanned[j][2])
+        j += 1
+
+
+class _Field:
+    __slots__ = ("name", "start", "value_start", "value_end")
+
+    def __init__(self, name: str, start: int, value_start: int, value_end: int):
+        self.name = name
+        self.start = start
+        self.value_start = value_start
+        self.value_end = value_end
+
+
+def scan_fields(text: str) -> Optional[List[_Field]]:
+    """定位条目文本中每个字段的名称与值区间；格式无法识别时返回 None。"""
+    m = _HEAD_RE.match(text)
+    if not m:
+        return None
+    comma = text.find(",", m.end())
+    if comma < 0:
+        return []
+    fields = []
+    pos = comma + 1
+    close = len(text) - 1
+    while True:
+        while pos < close and (text[pos].isspace() or text[pos] == ","):
+            pos += 1
+        if pos >= close:
+            return fields
+        nm = _FIELD_NAME_RE.match(text, pos)
+        if not nm:
+            return None
+        value_start = nm.end()
+        value_end = _scan_value(text, value_start, close)
+        if value_end is None:
+            return None
+        fields.append(_Field(nm.group(1).lower(), pos, value_start, value_end))
+        pos = value_end
+
+
+def _scan_value(text: str, pos: int, close: int) -> Optional[int]:
+    """值由 {..}、"..." 或裸词（宏/数字）经 # 连接组成。"""
+    while True:
+        if pos >= close:
+            return None
+        ch = text[pos]
+        if ch in "{\"":
+            depth = 0
+            i = pos
+            while i < close:
+                c = text[i]
+                if c == "{":
+                    depth += 1
+                elif c == "}":
+                    depth -= 1
+                    if depth == 0 and ch == "{":
+                        break
+                elif c == "\"" and ch == "\"" and depth == 0 and i > pos:
+                    break
+                i += 1
+            else:
+                return None
+            end = i + 1
+        else:
+            bare = _BARE_RE.match(text, pos)
+            if not bare:
+                return None
+            end = bare.end()
+        hash_m = _CONCAT_RE.match(text, end)
+        if not hash_m:
+            return end
+        pos = hash_m.end()
+
+
+def _public_fields(entry: dict) -> Dict[str, str]:
+    return {
+        k: v
+        for k, v in entry.items()
+        if not k.startswith("_") and k not in ("ID", "ENTRYTYPE") and isinstance(v, str)
+    }
+
+
+def patch_entry(text: str, old: dict, new: dict) -> str:
+    """在原条目文本上按字段打补丁。"""
+    fields = scan_fields(text)
+    old_fields, new_fields = _public_fields(old), _public_fields(new)
+    if not fields or new.get("ENTRYTYPE") != old.get("ENTRYTYPE"):
+        return render_entry(new)
+    by_name = {f.name: f for f in fields}
+    if any(name not in by_name for name in old_fields):
+        return render_entry(new)
+
+    newline = "\r\n" if "\r\n" in text else "\n"
+    edits = []  # (start, end, replacement)
+    for idx, f in enumerate(fields):
+        if f.name not in old_fields:
+            continue
+        if f.name not in new_fields:
+            # 连同前面的分隔逗号一起删除；第一个字段则删到下一个字段开头
+            if idx > 0:
+                edits.append((fields[idx - 1].value_end, f.value_end, ""))
+            else:
+                stop = fields[1].start if len(fields) > 1 else f.value_end
+                edits.append((f.start, stop, ""))
+        elif new_fields[f.name] != old_fields[f.name]:
+            edits.append((f.value_start, f.value_end, "{" + new_fields[f.name] + "}"))
+    added = [k for k in new_fields if k not in old_fields]
+    if added:
+        anchor = fields[-1]
+        indent = _indent_of(text, anchor.start)
+        body = "".join(f",{newline}{indent}{k} = {{{new_fields[k]}}}" for k in added)
+        edits.append((anchor.value_end, anchor.value_end, body))
+    for start, end, repl in sorted(edits, key=lambda e: (e[0], e[1]), reverse=True):
+        text = text[:start] + repl + text[end:]
+    return text
+
+
+def _indent_of(text: str, pos: int) -> str:
+    line_start = text.rfind("\n", 0, pos) + 1
+    prefix = text[line_start:pos]
+    return prefix if prefix.strip() == "" else "  "
+
+
+def render_entry(entry: dict) -> str:
+    db = BibDatabase()
+    db.entries = [{k: v for k, v in entry.items() if k in ("ID", "ENTRYTYPE")} | _public_fields(entry)]
+    writer = BibTexWriter()
+    writer.order_entries_by = None
+    return writer.write(db).strip()
+
+
+def write_bib_patched(source_path: str, out_path: str, entries: List[dict], originals: Dict[int, dict]) -> bool:
+    """只改写 originals 中的条目（索引 -> 修改前的条目），其余字节从源文件原样拷贝。
+
+    条目缺少区间或源文件已变化时返回 False，由调用方退回整体序列化。
+    """
+    changes = []
+    for idx in sorted(originals):
+        span = entries[idx].get("_span")
+        if not span:
+            return False
+        changes.append((int(span[0]), int(span[1]), originals[idx], entries[idx]))
+    tmp_path = os.fspath(out_path) + ".tmp"
+    with open(source_path, "rb") as src:
+        # 源文件在解析后被改动则放弃原地补丁
+        for start, end, old, _ in changes:
+            src.seek(start)
+            head = src.read(end - start)
+            if not head.startswith(b"@") or old["ID"].encode("utf-8") not in head:
+                return False
+        src.seek(0)
+        with open(tmp_path, "wb") as out:
+            pos = 0
+            for start, end, old, new in changes:
+                _copy_range(src, out, start - pos)
+                text = src.read(end - start).decode("utf-8")
+                out.write(patch_entry(text, old, new).encode("utf-8"))
+                pos = end
+            shutil.copyfileobj(src, out, _COPY_CHUNK)
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def _copy_range(src, out, length: int) -> None:
+    while length > 0:
+        chunk = src.read(min(length, _COPY_CHUNK))
+        if not chunk:
+            return
+        out.write(chunk)
+        length -= len(chunk)
+
+
+def fields_changed(old: dict, new: dict) -> bool:
+    return _public_fields(old) != _public_fields(new)
+
+
+def changed_indices(before: Iterable[dict], after: Iterable[dict]) -> Dict[int, dict]:
+    """FixApplier 写时复制：被修改的条目与原对象不是同一个。"""
+    return {i: old for i, (old, new) in enumerate(zip(before, after)) if old is not new}
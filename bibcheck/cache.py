@@ -48,16 +48,17 @@ class HTTPCache:
                 """
             )
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """读取缓存；key 不存在（或内容损坏）时返回 default，用于区分“未缓存”与“缓存了空结果”。"""
         with self._conn() as conn:
             cur = conn.execute("SELECT payload FROM responses WHERE key=?", (key,))
             row = cur.fetchone()
             if not row:
-                return None
+                return default
             try:
                 return json.loads(row[0])
             except json.JSONDecodeError:
-                return None
+                return default
 
     def set(self, key: str, value: Any) -> None:
         payload = json.dumps(value)
@@ -67,3 +68,13 @@ class HTTPCache:
                 "INSERT OR REPLACE INTO responses(key, payload, updated_at) VALUES (?, ?, ?)",
                 (key, payload, ts),
             )
+
+    def set_many(self, items) -> None:
+        """批量写入 (key, value)，单个事务。"""
+        ts = time.time()
+        rows = [(key, json.dumps(value), ts) for key, value in items]
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO responses(key, payload, updated_at) VALUES (?, ?, ?)",
+                rows,
+            )
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+CHECKPOINT_VERSION = 1
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def run_fingerprint(bibfile: str, mode: str, options: Optional[dict] = None) -> str:
+    """bib 文件内容 + 运行模式 + 影响结果的选项；任一变化时旧检查点作废。"""
+    digest = hashlib.sha256(file_sha256(bibfile).encode("ascii"))
+    digest.update(json.dumps({"mode": mode, "options": options or {}}, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """逐条目追加写的检查点（JSONL），用于 --resume。
+
+    第一行是头部（版本与运行指纹），之后每完成一个条目追加一行：
+    {"kind": "entry", "index": i, "citekey": ..., "record": 报告记录, "entry": 处理后的条目, "plan": 修复计划}。
+    每行写完即 flush，进程被杀也不会丢已完成的条目；fsync 按 fsync_interval 秒节流。
+    读取时忽略末尾写了一半的行，并把文件截断到最后一个完整行后继续追加。
+    """
+
+    def __init__(self, path: str, fingerprint: str, resume: bool = False, fsync_interval: float = 1.0):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.fsync_interval = fsync_interval
+        self.done: Dict[int, dict] = {}
+        self.stale = False
+        valid_bytes = self._load() if resume else None
+        if valid_bytes is None:
+            self.done = {}
+            self._file = open(path, "w", encoding="utf-8")
+            self._write({"kind": "header", "version": CHECKPOINT_VERSION, "fingerprint": fingerprint})
+        else:
+            with open(path, "r+b") as f:
+                f.truncate(valid_bytes)
+            self._file = open(path, "a", encoding="utf-8")
+        self._last_sync = time.monotonic()
+
+    def _load(self) -> Optional[int]:
+        """返回可续写的字节数；文件不存在或指纹不符时返回 None（从头开始）。"""
+        if not os.path.exists(self.path):
+            return None
+        valid = 0
+        with open(self.path, "rb") as f:
+            for lineno, raw in enumerate(f):
+                try:
+                    if not raw.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    item = json.loads(raw)
+                except ValueError:
+                    break
+                if lineno == 0:
+                    if item.get("kind") != "header" or item.get("version") != CHECKPOINT_VERSION or item.get("fingerprint") != self.fingerprint:
+                        self.stale = True
+                        return None
+                elif item.get("kind") == "entry":
+                    self.done[item["index"]] = item
+                valid += len(raw)
+        return valid or None
+
+    def get(self, index: int, citekey: str) -> Optional[dict]:
+        """已完成的条目；超时或数据源不可用的条目视为未完成，续跑时重新查询。"""
+        item = self.done.get(index)
+        if item is None or item.get("citekey") != citekey:
+            return None
+        online = item["record"].get("online") or {}
+        if online.get("timed_out") or online.get("unavailable_sources"):
+            return None
+        return item
+
+    def append(self, index: int, citekey: str, record: dict, entry: dict, plan: Optional[dict] = None) -> None:
+        self._write({"kind": "entry", "index": index, "citekey": citekey, "record": record, "entry": entry, "plan": plan})
+
+    def _write(self, item: dict) -> None:
+        self._file.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        now = time.monotonic()
+        if now - getattr(self, "_last_sync", 0.0) >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_sync = now
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+
+def restore_entry(entry: dict, saved: dict) -> None:
+    """把检查点中的条目状态（含 _online_issues 等内部字段）写回原对象，保持 entries 列表身份不变。"""
+    entry.clear()
+    entry.update(saved)
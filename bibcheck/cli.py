@@ -5,11 +5,18 @@ import shutil
 import time
 from typing import List, Optional, Tuple, Dict
 
+from .bibpatch import changed_indices
+from .columnar import COLUMNAR_FORMATS
+from .checkpoint import Checkpoint, restore_entry, run_fingerprint
 from .parser import load_bib_entries
-from .report import ReportBuilder, write_csv_report, write_json_report, print_summary
+from .report import DETAIL_LEVELS, open_report_builder, print_summary
 from .validators_static import run_static_validations
-from .validators_online import OnlineValidatorConfig, OnlineValidator
-from .fixer import FixPlanner, FixConfig, FixApplier, ApplyConfig, write_changelog, write_fix_summary
+from .validators_online import SOURCES, OnlineValidatorConfig, OnlineValidator
+from .sources.http import RetryPolicy
+from .profiling import Profiler
+from .cache import HTTPCache
+from .fixer.planfile import PlanFileMismatch, read_plan_file, write_plan_file
+from .fixer import ChangelogWriter, FixPlanner, FixConfig, FixApplier, ApplyConfig, PlanCache, PlanStage, write_fix_summary
 
 
 class ProgressBar:
@@ -119,6 +126,93 @@ def build_parser() -> argparse.ArgumentParser:
         default=0.6,
         help="中置信门控阈值，默认 0.6",
     )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=1.0,
+        help="同一数据源两次请求的最小间隔秒数，默认 1.0",
+    )
+    parser.add_argument(
+        "--base-url",
+        action="append",
+        default=[],
+        metavar="SOURCE=URL",
+        help="覆盖数据源 API 地址，可重复（如指向 python -m bibcheck.mockserver）",
+    )
+    parser.add_argument(
+        "--retry-deadline",
+        type=float,
+        default=30.0,
+        help="单次数据源调用（含重试与退避）的总时限秒数，默认 30",
+    )
+    parser.add_argument(
+        "--entry-timeout",
+        type=float,
+        default=None,
+        help="单个条目全部在线查询的时限秒数，超时的条目记为 ONLINE_TIMEOUT",
+    )
+    parser.add_argument(
+        "--run-deadline",
+        type=float,
+        default=None,
+        help="整个在线校验的时限秒数，到时后剩余条目不再联网（记为 ONLINE_TIMEOUT），报告照常写出",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help="数据源连续失败多少次后熔断（本次运行内跳过该源，报告中记为降级），默认 5",
+    )
+    parser.add_argument(
+        "--exhaustive-search",
+        action="store_false",
+        dest="early_stop",
+        help="无 DOI 条目查询全部数据源（默认命中高置信候选后即停止）",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        default=None,
+        help="额外以 Prometheus 文本格式导出数据源/缓存指标到该路径（report.json 中始终包含 metrics 段）",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="记录各阶段/各条目的墙钟时间、CPU 时间与内存分配，写出 out/profile.trace.json（Chrome trace）",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="--profile 时打印最慢的 N 个条目及其数据源调用，默认 10",
+    )
+    parser.add_argument(
+        "--report-detail",
+        choices=DETAIL_LEVELS,
+        default="full",
+        help="报告详略：summary（不含候选列表）、topk（仅保留前 --report-top-k 个候选）、full（默认，完整在线数据）",
+    )
+    parser.add_argument(
+        "--report-top-k",
+        type=int,
+        default=3,
+        help="--report-detail topk 时保留的候选数，默认 3",
+    )
+    parser.add_argument(
+        "--columnar",
+        choices=COLUMNAR_FORMATS,
+        default=None,
+        help="另写列式报告 out/report.parquet 或 out/report.arrow（需要 pyarrow），便于跨运行分析",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="逐条目检查点路径（追加写），默认 out/checkpoint.jsonl",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="从检查点续跑：跳过已完成的条目，最终报告与不中断运行一致（bib 或选项变化时自动重新开始）",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -140,12 +234,44 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--no-network", action="store_true", help="禁止联网（autofix 时跳过在线解析）")
     parser.add_argument("--min-conf", type=float, default=0.85, help="自动写回的最小置信度阈值，默认 0.85")
     parser.add_argument("--autofix-scope", choices=["high", "all"], default="high", help="autofix 字段范围")
+    parser.add_argument(
+        "--autofix-workers",
+        type=int,
+        default=4,
+        help="autofix 并发处理条目的线程数，默认 4；各数据源仍按 --min-interval 限流，输出顺序与串行一致",
+    )
+    parser.add_argument(
+        "--blog-domains",
+        default=None,
+        help="追加博客/项目页域名与提示词的 YAML 文件（{domains: [...], hints: [...]} 或域名列表）",
+    )
     parser.add_argument("--latex-apostrophe", action="store_true", help="将作者名中的 ’ 转为 {\\textquoteright}")
     parser.add_argument(
         "--fix",
         action="store_true",
         help="启用自动修复（生成 fixed.bib 与 change log，默认仅检查）",
     )
+    parser.add_argument(
+        "--fix-workers",
+        type=_non_negative_int,
+        default=1,
+        help="--fix 时并行构建修复计划的进程数，0 表示全部 CPU 核心，默认 1（在主进程内构建）",
+    )
+    parser.add_argument(
+        "--save-plan",
+        default=None,
+        help="--fix 时保存全部候选修复的计划文件路径，默认 out/fix_plan.jsonl（供 apply-plan 离线重放）",
+    )
+    parser.add_argument(
+        "--plan-cache",
+        default=None,
+        help="修复计划缓存（SQLite）路径，默认与 HTTP 缓存共用 ~/.cache/bibcheck/cache.sqlite",
+    )
+    parser.add_argument(
+        "--no-plan-cache",
+        action="store_true",
+        help="不读写修复计划缓存，每次重新规划",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -179,11 +305,44 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _non_negative_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"应为整数: {value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"不能为负数: {value}")
+    return number
+
+
 def parse_sources(src: str) -> List[str]:
     return [s.strip() for s in src.split(",") if s.strip()]
 
 
+def parse_base_urls(specs: List[str]) -> Dict[str, str]:
+    bases = {}
+    for spec in specs or []:
+        source, sep, url = spec.partition("=")
+        if not sep or not source.strip() or not url.strip():
+            raise SystemExit(f"--base-url 格式应为 SOURCE=URL: {spec}")
+        source = source.strip()
+        if source not in SOURCES:
+            raise SystemExit(f"--base-url 未知的数据源 {source}，可选: {', '.join(SOURCES)}")
+        bases[source] = url.strip()
+    return bases
+
+
 def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "apply-plan":
+        args = build_apply_plan_parser().parse_args(argv[1:])
+        for path in (args.plan, args.bibfile):
+            if not os.path.isfile(path):
+                print(f"找不到文件: {path}", file=sys.stderr)
+                sys.exit(1)
+        os.makedirs(args.outdir, exist_ok=True)
+        sys.exit(run_apply_plan(args))
+
     args = build_parser().parse_args(argv)
 
     if not os.path.isfile(args.bibfile):
@@ -201,14 +360,25 @@ def main(argv: Optional[List[str]] = None) -> None:
     sys.exit(exit_code)
 
 
-def run_check(args, planner: FixPlanner = None) -> int:
-    entries, parse_issues = load_bib_entries(args.bibfile, args.max_entries)
+def run_check(args, planner: FixPlanner = None, profiler: Optional[Profiler] = None) -> int:
+    owns_profiler = profiler is None
+    profiler = profiler or Profiler(args.profile)
+    with profiler.phase("parse"):
+        entries, parse_issues = load_bib_entries(args.bibfile, args.max_entries)
 
-    report_builder = ReportBuilder()
+    report_builder = open_report_builder(
+        os.path.join(args.outdir, "report.json"),
+        os.path.join(args.outdir, "report.csv"),
+        detail=args.report_detail,
+        top_k=args.report_top_k,
+        columnar=args.columnar,
+        bibfile=args.bibfile,
+    )
     for issue in parse_issues:
         report_builder.add_file_issue(issue)
 
-    static_results = run_static_validations(entries)
+    with profiler.phase("static"):
+        static_results = run_static_validations(entries)
     online_validator = OnlineValidator(
         OnlineValidatorConfig(
             offline=args.offline,
@@ -220,9 +390,23 @@ def run_check(args, planner: FixPlanner = None) -> int:
             enable_citation_cff=args.enable_citation_cff,
             high_conf=args.high_conf,
             mid_conf=args.mid_conf,
+            early_stop=args.early_stop,
+            min_interval=args.min_interval,
+            base_urls=parse_base_urls(args.base_url),
+            retry=RetryPolicy(deadline=args.retry_deadline),
+            breaker_threshold=args.breaker_threshold,
+            entry_timeout=args.entry_timeout,
+            run_deadline=args.run_deadline,
         )
     )
 
+    profiler.attach(online_validator.metrics)
+    with profiler.phase("plan_lookups"):
+        lookup_plan = online_validator.plan_lookups(entries)
+    if args.verbose and lookup_plan["planned"]:
+        print(f"在线查询预规划: {lookup_plan['planned']} 次查询，去重后 {lookup_plan['unique']} 次")
+
+    checkpoint = open_checkpoint(args, "fix" if planner else "check")
     plans = {}
     if args.progress == "never":
         progress_enabled = False
@@ -231,73 +415,203 @@ def run_check(args, planner: FixPlanner = None) -> int:
     else:
         progress_enabled = None if not args.verbose else False
     progress = ProgressBar(len(entries), enabled=progress_enabled)
-    for index, entry in enumerate(entries, start=1):
-        issues = static_results.get(entry["ID"], [])
-        online_result = online_validator.validate_entry(entry)
-        fix_preview = None
+    # 修复计划在独立阶段并行构建，结果按条目顺序合并后再写报告/检查点
+    stage = None
+    if planner:
+        plan_cache = None if args.no_plan_cache else PlanCache(HTTPCache(args.plan_cache), planner.config)
+        stage = PlanStage(planner, workers=args.fix_workers, cache=plan_cache)
+
+    def collect(ctx, plan):
+        index, entry, issues, online_result, restored = ctx
         if planner:
-            plan = planner.build_plan(entry, issues, online_result)
             plans[entry["ID"]] = plan
-            fix_preview = plan.get("preview")
-        entry_status = report_builder.collect_entry(entry, issues, online_result, fix_plan_preview=fix_preview)
-        if args.verbose:
-            print(f"[{entry['ID']}] status={entry_status} issues={len(issues)}")
+        if restored is not None:
+            report_builder.restore_entry(restored)
+        else:
+            with profiler.phase("collect"):
+                entry_status = report_builder.collect_entry(
+                    entry, issues, online_result, fix_plan_preview=plan.get("preview") if plan else None
+                )
+                checkpoint.append(index - 1, entry["ID"], report_builder.last_record, entry, plan)
+            if args.verbose:
+                print(f"[{entry['ID']}] status={entry_status} issues={len(issues)}")
         progress.update(index)
+
+    for index, entry in enumerate(entries, start=1):
+        issues = static_results.get(entry["ID"], [])
+        done = checkpoint.get(index - 1, entry["ID"])
+        if done is not None:
+            restore_entry(entry, done["entry"])
+            ctx = (index, entry, issues, None, done["record"])
+            ready = stage.push(ctx, done["plan"]) if stage else [(ctx, None)]
+        else:
+            with profiler.entry(entry["ID"]):
+                with profiler.phase("online"):
+                    online_result = online_validator.validate_entry(entry)
+                ctx = (index, entry, issues, online_result, None)
+                if stage:
+                    with profiler.phase("plan"):
+                        ready = stage.submit(ctx, entry, issues, online_result)
+                else:
+                    ready = [(ctx, None)]
+        for ctx, plan in ready:
+            collect(ctx, plan)
+    if stage:
+        with profiler.phase("plan"):
+            for ctx, plan in stage.finish():
+                collect(ctx, plan)
     progress.finish()
+    checkpoint.close()
+    online_validator.planner.save()
 
     report_data = report_builder.build()
-
-    json_path = os.path.join(args.outdir, "report.json")
-    csv_path = os.path.join(args.outdir, "report.csv")
-    write_json_report(report_data, json_path)
-    write_csv_report(report_data, csv_path)
-    print_summary(report_data)
+    report_data["degraded_sources"] = online_validator.http.breakers.degraded()
+    report_data["metrics"] = online_validator.metrics.snapshot()
+    if stage and stage.cache:
+        report_data["plan_cache"] = stage.cache.summary()
+    if args.metrics_prom:
+        online_validator.metrics.write_prometheus(args.metrics_prom)
+
+    with profiler.phase("write_report"):
+        report_builder.finish(report_data)
+    print_summary(report_data, error_keys=report_builder.error_keys)
+    if owns_profiler:
+        _finish_profile(profiler, args)
 
     has_file_error = any(i["severity"] == "ERROR" for i in report_data.get("file_issues", []))
     exit_code = 1 if report_data["stats"]["error"] > 0 or has_file_error else 0
     return exit_code if not planner else (exit_code, entries, plans, report_data)
 
 
+def open_checkpoint(args, mode: str) -> Checkpoint:
+    path = args.checkpoint or os.path.join(args.outdir, "checkpoint.jsonl")
+    options = {
+        key: getattr(args, key, None)
+        for key in (
+            "offline", "max_entries", "sources", "enable_arxiv", "enable_dblp", "enable_citation_cff",
+            "high_conf", "mid_conf", "early_stop", "base_url", "aggressive",
+            "min_conf", "autofix_scope", "no_network",
+        )
+    }
+    checkpoint = Checkpoint(path, run_fingerprint(args.bibfile, mode, options), resume=args.resume)
+    if args.resume:
+        if checkpoint.stale:
+            print(f"检查点与当前 bib/选项不一致，重新开始: {path}")
+        else:
+            print(f"从检查点续跑: 已完成 {len(checkpoint.done)} 条")
+    return checkpoint
+
+
+def _finish_profile(profiler: Profiler, args) -> None:
+    profiler.finish(os.path.join(args.outdir, "profile.trace.json"), top=args.profile_top)
+
+
 def run_fix(args) -> int:
     planner = FixPlanner(FixConfig(aggressive=args.aggressive))
-    result = run_check(args, planner=planner)
+    profiler = Profiler(args.profile)
+    result = run_check(args, planner=planner, profiler=profiler)
     # result is (exit_code, entries, plans, report_data)
     if isinstance(result, int):
         # Should not happen, but guard
         return result
     exit_code, entries, plans, report_data = result
-
-    applier = FixApplier(
-        ApplyConfig(
-            aggressive=args.aggressive,
-            high_threshold=0.9,
-            mid_threshold=0.8,
-            dry_run=args.dry_run,
-            inplace=args.inplace,
-        )
+    plan_cache = report_data.get("plan_cache")
+    if plan_cache and plan_cache["hits"] and not plan_cache["misses"]:
+        print("修复计划全部命中缓存：条目与在线结果均未变化，与上次运行相比无新变更")
+
+    plan_path = args.save_plan or os.path.join(args.outdir, "fix_plan.jsonl")
+    write_plan_file(plan_path, args.bibfile, plans)
+    apply_config = ApplyConfig(
+        aggressive=args.aggressive,
+        high_threshold=0.9,
+        mid_threshold=0.8,
+        dry_run=args.dry_run,
+        inplace=args.inplace,
     )
-    new_entries, applied, suggested = applier.apply(entries, plans)
+    apply_and_write(args, entries, plans, apply_config, profiler)
+    print(f"修复计划已保存到 {plan_path}，可用 apply-plan 以其他阈值离线重放")
+    _finish_profile(profiler, args)
+
+    # 如果修复后仍有 ERROR，保持退出码 1；否则 0
+    has_file_error = any(i["severity"] == "ERROR" for i in report_data.get("file_issues", []))
+    exit_code = 1 if report_data["stats"]["error"] > 0 or has_file_error else 0
+    return exit_code
+
+
+def apply_and_write(args, entries: List[dict], plans: Dict[str, Dict], apply_config: ApplyConfig, profiler: Profiler) -> Tuple[list, list]:
+    """run_fix 与 apply-plan 共用：应用计划，写出 fixed.bib（或原地）、变更日志与汇总。"""
+    applier = FixApplier(apply_config)
+    changes_path = args.changes_log or os.path.join(args.outdir, "changes.jsonl")
+    # 变更记录按条目顺序边应用边写出
+    with profiler.phase("apply"), ChangelogWriter(changes_path) as changelog:
+        new_entries, applied, suggested = applier.apply(entries, plans, on_change=changelog.write)
 
     base_name = os.path.splitext(os.path.basename(args.bibfile))[0]
     fixed_path = args.fixed_bib or os.path.join(args.outdir, f"{base_name}.fixed.bib")
-    changes_path = args.changes_log or os.path.join(args.outdir, "changes.jsonl")
     summary_path = args.fix_summary or os.path.join(args.outdir, "fix_summary.md")
 
     target_path = fixed_path
+    source_path = args.bibfile
     if not args.dry_run:
         if args.inplace:
             backup = args.bibfile + ".bak"
             shutil.copy2(args.bibfile, backup)
             target_path = args.bibfile
-        applier.write_bib(new_entries, target_path)
+            source_path = backup
+        with profiler.phase("write_bib"):
+            applier.write_bib(new_entries, target_path, source_path=source_path, originals=changed_indices(entries, new_entries))
 
-    write_changelog(applied + suggested, changes_path)
-    write_fix_summary(applied, suggested, summary_path, target_path if not args.dry_run else "dry-run", args.dry_run)
+    with profiler.phase("write_changelog"):
+        write_fix_summary(applied, suggested, summary_path, target_path if not args.dry_run else "dry-run", args.dry_run)
+    return applied, suggested
 
-    # 如果修复后仍有 ERROR，保持退出码 1；否则 0
-    has_file_error = any(i["severity"] == "ERROR" for i in report_data.get("file_issues", []))
-    exit_code = 1 if report_data["stats"]["error"] > 0 or has_file_error else 0
-    return exit_code
+
+def build_apply_plan_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="bibcheck apply-plan",
+        description="按 --fix 保存的修复计划离线应用修复（不联网、不重新校验），可反复调整阈值",
+    )
+    parser.add_argument("plan", help="--fix 生成的计划文件（默认 out/fix_plan.jsonl）")
+    parser.add_argument("bibfile", help="生成计划时使用的原始 .bib 文件")
+    parser.add_argument("--outdir", default="out", help="输出目录，默认 out")
+    parser.add_argument("--aggressive", action="store_true", help="中置信修复也自动应用")
+    parser.add_argument("--high-threshold", type=float, default=0.9, help="自动应用的高置信阈值，默认 0.9")
+    parser.add_argument("--mid-threshold", type=float, default=0.8, help="--aggressive 时的中置信阈值，默认 0.8")
+    parser.add_argument("--dry-run", action="store_true", help="仅输出 change log，不生成 fixed.bib")
+    parser.add_argument("--inplace", action="store_true", help="覆盖原 bib 文件（会先备份为 .bak）")
+    parser.add_argument("--fixed-bib", default=None, help="修复后 bib 输出路径，默认 out/<name>.fixed.bib")
+    parser.add_argument("--changes-log", default=None, help="变更日志 jsonl 路径，默认 out/changes.jsonl")
+    parser.add_argument("--fix-summary", default=None, help="修复汇总 markdown 路径，默认 out/fix_summary.md")
+    parser.add_argument("--force", action="store_true", help="bib 内容与生成计划时不一致也继续应用")
+    parser.add_argument("--profile", action="store_true", help="记录各阶段耗时，写出 out/profile.trace.json")
+    parser.add_argument("--profile-top", type=int, default=10, help=argparse.SUPPRESS)
+    return parser
+
+
+def run_apply_plan(args) -> int:
+    profiler = Profiler(args.profile)
+    try:
+        _, plans = read_plan_file(args.plan, args.bibfile, check=not args.force)
+    except PlanFileMismatch as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    with profiler.phase("parse"):
+        entries, parse_issues = load_bib_entries(args.bibfile)
+    if any(i["severity"] == "ERROR" for i in parse_issues):
+        for issue in parse_issues:
+            print(f"{issue['type']}: {issue['message']}", file=sys.stderr)
+        return 1
+    apply_config = ApplyConfig(
+        aggressive=args.aggressive,
+        high_threshold=args.high_threshold,
+        mid_threshold=args.mid_threshold,
+        dry_run=args.dry_run,
+        inplace=args.inplace,
+    )
+    applied, suggested = apply_and_write(args, entries, plans, apply_config, profiler)
+    print(f"已应用 {len(applied)} 项修复，{len(suggested)} 项建议未自动应用")
+    _finish_profile(profiler, args)
+    return 0
 
 
 def run_autofix_cli(args) -> int:
@@ -309,6 +623,7 @@ def run_autofix_cli(args) -> int:
     csv_path = os.path.join(args.outdir, "report.csv")
 
     os.makedirs(args.outdir, exist_ok=True)
+    profiler = Profiler(args.profile)
     run_autofix(
         bibfile=args.bibfile,
         out_bib=fixed_path,
@@ -318,5 +633,20 @@ def run_autofix_cli(args) -> int:
         scope=args.autofix_scope,
         allow_network=not args.no_network,
         user_agent=args.user_agent,
+        min_interval=args.min_interval,
+        base_urls=parse_base_urls(args.base_url),
+        retry_deadline=args.retry_deadline,
+        breaker_threshold=args.breaker_threshold,
+        entry_timeout=args.entry_timeout,
+        run_deadline=args.run_deadline,
+        metrics_prom=args.metrics_prom,
+        profiler=profiler,
+        checkpoint=open_checkpoint(args, "autofix"),
+        report_detail=args.report_detail,
+        report_top_k=args.report_top_k,
+        columnar=args.columnar,
+        workers=args.autofix_workers,
+        blog_domains=args.blog_domains,
     )
+    _finish_profile(profiler, args)
     return 0
@@ -0,0 +1,120 @@
+"""报告的列式输出（Parquet / Arrow IPC），便于跨多次运行做分析。
+
+每个条目一行、列固定（见 SCHEMA_FIELDS），附带 run_id / bibfile 以便多次运行的文件直接拼接查询。
+依赖 pyarrow（可选依赖），仅在启用时导入。
+"""
+import os
+from typing import List, Optional
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# (列名, 类型)：类型为 pyarrow 构造函数名，list_string 表示 list<string>
+SCHEMA_FIELDS = (
+    ("run_id", "string"),
+    ("bibfile", "string"),
+    ("citekey", "string"),
+    ("entry_type", "string"),
+    ("status", "string"),
+    ("issue_count", "int32"),
+    ("issue_types", "list_string"),
+    ("title", "string"),
+    ("year", "string"),
+    ("doi", "string"),
+    ("venue", "string"),
+    ("entry_kind", "string"),
+    ("resolved_source", "string"),
+    ("resolved_doi", "string"),
+    ("resolved_confidence", "float64"),
+    ("title_match_score", "float64"),
+    ("candidate_count", "int32"),
+    ("timed_out", "bool_"),
+    ("unavailable_sources", "list_string"),
+)
+
+
+def columnar_row(record: dict, run_id: str = "", bibfile: str = "") -> dict:
+    """把一条报告记录（任意详略级别）展平成一行。"""
+    fs = record.get("fields_summary") or {}
+    online = record.get("online") or {}
+    resolved = online.get("resolved") or {}
+    if "candidate_count" in online:
+        candidate_count = online["candidate_count"]
+    else:
+        candidate_count = len(online.get("candidate_matches") or [])
+    score = online.get("title_match_score")
+    confidence = resolved.get("confidence")
+    return {
+        "run_id": run_id,
+        "bibfile": bibfile,
+        "citekey": record.get("citekey"),
+        "entry_type": record.get("entry_type"),
+        "status": record.get("status"),
+        "issue_count": len(record.get("issues", [])),
+        "issue_types": [i["type"] for i in record.get("issues", [])],
+        "title": fs.get("title"),
+        "year": fs.get("year"),
+        "doi": fs.get("doi"),
+        "venue": fs.get("venue"),
+        "entry_kind": online.get("entry_kind"),
+        "resolved_source": resolved.get("source"),
+        "resolved_doi": resolved.get("doi"),
+        "resolved_confidence": float(confidence) if confidence is not None else None,
+        "title_match_score": float(score) if score is not None else None,
+        "candidate_count": candidate_count,
+        "timed_out": bool(online.get("timed_out")),
+        "unavailable_sources": list(online.get("unavailable_sources") or []),
+    }
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise SystemExit("列式报告需要 pyarrow：pip install pyarrow")
+    return pyarrow
+
+
+class ColumnarReportWriter:
+    """流式写出 Parquet / Arrow IPC：按 batch_size 行攒成 RecordBatch 追加，内存只占一个批次。"""
+
+    def __init__(self, path: str, fmt: str = "parquet", run_id: str = "", bibfile: str = "", batch_size: int = 1024):
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"unknown columnar format: {fmt}")
+        pa = self._pa = _import_pyarrow()
+        self.path = path
+        self.fmt = fmt
+        self.run_id = run_id
+        self.bibfile = bibfile
+        self.batch_size = batch_size
+        self.schema = pa.schema(
+            [(name, pa.list_(pa.string()) if kind == "list_string" else getattr(pa, kind)()) for name, kind in SCHEMA_FIELDS]
+        )
+        self._rows: List[dict] = []
+        self._tmp = path + ".tmp"
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self._tmp, self.schema)
+        else:
+            import pyarrow.ipc as ipc
+
+            self._sink = pa.OSFile(self._tmp, "wb")
+            self._writer = ipc.new_file(self._sink, self.schema)
+
+    def write(self, record: dict):
+        self._rows.append(columnar_row(record, self.run_id, self.bibfile))
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        self._writer.write_batch(self._pa.RecordBatch.from_pylist(self._rows, schema=self.schema))
+        self._rows = []
+
+    def close(self, report: Optional[dict] = None):
+        self._flush()
+        self._writer.close()
+        if self.fmt == "arrow":
+            self._sink.close()
+        os.replace(self._tmp, self.path)
@@ -0,0 +1,122 @@
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from .kind import extract_arxiv_id, get_field
+from .normalize import normalize_doi, normalize_title
+
+Entry = Dict[str, object]
+
+# MinHash：32 个哈希分 8 段、每段 4 行；Jaccard≈0.8 的标题几乎必然落入同一桶，≈0.3 的很少碰撞
+_NUM_HASHES = 32
+_BANDS = 8
+_ROWS = _NUM_HASHES // _BANDS
+_SHINGLE = 3
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240611)
+_HASH_A = _rng.integers(1, 1 << 31, size=_NUM_HASHES, dtype=np.uint64)
+_HASH_B = _rng.integers(0, 1 << 31, size=_NUM_HASHES, dtype=np.uint64)
+
+
+def find_duplicate_clusters(entries: Sequence[Entry], threshold: int = 90) -> List[dict]:
+    """分块检测同一文献的重复/近似重复条目。
+
+    先按 DOI、arXiv ID、标题 MinHash 分段签名分块，只在块内用 rapidfuzz 比较标题，
+    避免全量两两比较；DOI/arXiv ID 相同直接视为重复。返回按条目顺序排列的簇列表。
+    """
+    n = len(entries)
+    parent = list(range(n))
+    reasons: Dict[int, set] = defaultdict(set)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int, reason: str) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            if rj < ri:
+                ri, rj = rj, ri
+            parent[rj] = ri
+            reasons[ri] |= reasons.pop(rj, set())
+        reasons[ri].add(reason)
+
+    id_blocks: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    title_blocks: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+    titles: List[str] = []
+    years: List[str] = []
+    for idx, entry in enumerate(entries):
+        doi = normalize_doi(get_field(entry, "doi"))
+        if doi:
+            id_blocks[("doi", doi.lower())].append(idx)
+        arxiv_id = extract_arxiv_id(entry)
+        if arxiv_id:
+            id_blocks[("arxiv", _strip_arxiv_version(arxiv_id).lower())].append(idx)
+        title = normalize_title(get_field(entry, "title") or "")
+        titles.append(title)
+        years.append(str(get_field(entry, "year") or "").strip())
+        signature = _minhash(title)
+        if signature is not None:
+            for band in range(_BANDS):
+                title_blocks[(band, signature[band * _ROWS:(band + 1) * _ROWS].tobytes())].append(idx)
+
+    for (reason, _), members in id_blocks.items():
+        for other in members[1:]:
+            union(members[0], other, reason)
+
+    for members in title_blocks.values():
+        if len(members) < 2 or len({find(m) for m in members}) < 2:
+            continue
+        block_titles = [titles[m] for m in members]
+        scores = process.cdist(block_titles, block_titles, scorer=fuzz.token_sort_ratio, score_cutoff=threshold, dtype=np.uint8)
+        for a, b in zip(*np.nonzero(np.triu(scores, k=1))):
+            i, j = members[a], members[b]
+            if _years_compatible(years[i], years[j]):
+                union(i, j, "title")
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for idx in range(n):
+        clusters[find(idx)].append(idx)
+    result = []
+    for root, members in sorted(clusters.items()):
+        if len(members) < 2:
+            continue
+        result.append(
+            {
+                "indices": members,
+                "citekeys": [entries[m]["ID"] for m in members],
+                "reasons": sorted(reasons.get(root, set())),
+            }
+        )
+    return result
+
+
+def _minhash(title: str):
+    compact = title.replace(" ", "")
+    if len(compact) < _SHINGLE:
+        return None
+    shingles = {compact[i:i + _SHINGLE] for i in range(len(compact) - _SHINGLE + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(_HASH_A, hashes) + _HASH_B[:, None]) % _PRIME).min(axis=1)
+
+
+def _strip_arxiv_version(arxiv_id: str) -> str:
+    head, sep, tail = arxiv_id.rpartition("v")
+    if sep and head and tail.isdigit():
+        return head
+    return arxiv_id
+
+
+def _years_compatible(a: str, b: str) -> bool:
+    """标题近似但年份相差过大时，多半是同名的不同论文（如系列综述）。"""
+    if not a or not b:
+        return True
+    try:
+        return abs(int(a) - int(b)) <= 1
+    except ValueError:
+        return True
@@ -1,12 +1,17 @@
 from .planner import FixPlanner, FixConfig
 from .applier import FixApplier, ApplyConfig
-from .changelog import write_changelog, write_fix_summary
+from .changelog import ChangelogWriter, write_changelog, write_fix_summary
+from .pipeline import PlanStage
+from .plan_cache import PlanCache
 
 __all__ = [
     "FixPlanner",
     "FixConfig",
     "FixApplier",
     "ApplyConfig",
+    "ChangelogWriter",
+    "PlanCache",
+    "PlanStage",
     "write_changelog",
     "write_fix_summary",
 ]
@@ -1,13 +1,14 @@
 import os
 import time
-from copy import deepcopy
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 
 import bibtexparser
 from bibtexparser.bibdatabase import BibDatabase
 from bibtexparser.bwriter import BibTexWriter
 
+from ..bibpatch import write_bib_patched
+from ..entries import CopyOnWriteEntries
 from .formatters import normalize_doi_value
 
 
@@ -24,27 +25,34 @@ class FixApplier:
     def __init__(self, config: ApplyConfig):
         self.config = config
 
-    def apply(self, entries: List[dict], plans: Dict[str, Dict]) -> Tuple[List[dict], List[dict], List[dict]]:
-        new_entries = deepcopy(entries)
+    def apply(
+        self, entries: List[dict], plans: Dict[str, Dict], on_change: Callable[[dict], None] = None
+    ) -> Tuple[List[dict], List[dict], List[dict]]:
+        """按 plans 顺序应用；on_change 依次收到每条变更记录（已应用与建议交错，按条目顺序）。"""
+        # 写时复制：只复制实际被修改的条目，其余与输入共享，输入列表本身不变
+        snapshot = CopyOnWriteEntries(entries)
         applied: List[dict] = []
         suggested: List[dict] = []
 
-        entry_by_key = {e["ID"]: e for e in new_entries}
         for citekey, plan in plans.items():
-            entry = entry_by_key.get(citekey)
-            if not entry:
+            if citekey not in snapshot:
                 continue
             for action in plan.get("actions", []):
                 if self._should_apply(action["confidence"]):
+                    entry = snapshot.writable(citekey)
                     # 处理需要删除的字段（如 arXiv 迁移时删除 journal/booktitle）
                     extra = action.get("extra") or {}
                     for rf in extra.get("remove_fields", []):
                         entry.pop(rf, None)
                     entry[action["field"]] = action["new"]
-                    applied.append(self._make_change_record(action, applied=True))
+                    record = self._make_change_record(action, applied=True)
+                    applied.append(record)
                 else:
-                    suggested.append(self._make_change_record(action, applied=False))
-        return new_entries, applied, suggested
+                    record = self._make_change_record(action, applied=False)
+                    suggested.append(record)
+                if on_change is not None:
+                    on_change(record)
+        return snapshot.entries, applied, suggested
 
     def _should_apply(self, confidence: float) -> bool:
         if confidence >= self.config.high_threshold:
@@ -66,7 +74,10 @@ class FixApplier:
             "applied": applied,
         }
 
-    def write_bib(self, entries: List[dict], path: str):
+    def write_bib(self, entries: List[dict], path: str, source_path: str = None, originals: Dict[int, dict] = None):
+        """有源文件与修改前条目（索引 -> 条目）时只改写变化的条目，其余原样保留；否则整体序列化。"""
+        if source_path and originals is not None and write_bib_patched(source_path, path, entries, originals):
+            return
         cleaned_entries = [self._clean_entry(e) for e in entries]
         db = BibDatabase()
         db.entries = cleaned_entries
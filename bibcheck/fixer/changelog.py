@@ -13,6 +13,32 @@ def write_changelog(changes: List[dict], path: str):
             f.write("\n")
 
 
+class ChangelogWriter:
+    """逐条写出变更日志（jsonl），首条变更到来时才创建文件，与 write_changelog 一致。"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def write(self, change: dict):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+        json.dump(change, self._file, ensure_ascii=False)
+        self._file.write("\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def write_fix_summary(applied: List[dict], suggested: List[dict], path: str, fixed_path: str, dry_run: bool):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     lines = []
@@ -0,0 +1,91 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Iterator, Optional, Tuple
+
+from .plan_cache import PlanCache
+from .planner import FixConfig, FixPlanner
+
+# 工作进程内的 planner，由 _init_worker 创建一次
+_worker_planner: Optional[FixPlanner] = None
+
+
+def _init_worker(config: FixConfig) -> None:
+    global _worker_planner
+    _worker_planner = FixPlanner(config)
+
+
+def _build_plan(entry: dict, issues: list, online_result: dict) -> dict:
+    return _worker_planner.build_plan(entry, issues, online_result)
+
+
+class PlanStage:
+    """修复计划阶段：在线结果到达后把 build_plan 提交到进程池，按提交顺序取回（确定性合并）。
+
+    workers <= 1 时在当前进程内同步构建；workers == 0 表示使用全部 CPU 核心。
+    push 的 context 原样随结果返回；也可以 push 已有结果（如检查点恢复的条目）以保持顺序。
+    排队中的条目超过 max_pending 时 push 会等待最早的结果，避免在线结果在内存中堆积。
+    给定 cache（PlanCache）时先查缓存，命中则不再构建，新构建的计划在取回时写入缓存。
+    """
+
+    def __init__(
+        self, planner: FixPlanner, workers: int = 1, max_pending: Optional[int] = None, cache: Optional[PlanCache] = None
+    ):
+        if workers < 0:
+            raise ValueError(f"workers 不能为负数: {workers}")
+        self.planner = planner
+        self.cache = cache
+        self._pool = None
+        if workers != 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers or None, initializer=_init_worker, initargs=(planner.config,)
+            )
+            workers = self._pool._max_workers
+        self.max_pending = max_pending or max(4, workers * 4)
+        self._pending: Deque[Tuple[Any, Any, Optional[str]]] = deque()
+
+    def submit(self, context, entry: dict, issues: list, online_result: dict) -> Iterator[Tuple[Any, dict]]:
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(entry, online_result)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self.push(context, cached)
+        if self._pool is None:
+            plan = self.planner.build_plan(entry, issues, online_result)
+        else:
+            plan = self._pool.submit(_build_plan, entry, issues, online_result)
+        return self.push(context, plan, key)
+
+    def push(self, context, plan, cache_key: Optional[str] = None) -> Iterator[Tuple[Any, dict]]:
+        """加入一个结果（或 Future），返回此刻已按顺序就绪的 (context, plan)。"""
+        self._pending.append((context, plan, cache_key))
+        return self._drain(block_until=len(self._pending) - self.max_pending)
+
+    def finish(self) -> Iterator[Tuple[Any, dict]]:
+        """取回剩余全部结果并关闭进程池。"""
+        try:
+            return self._drain(block_until=len(self._pending))
+        finally:
+            self.close()
+
+    def _drain(self, block_until: int) -> Iterator[Tuple[Any, dict]]:
+        ready = []
+        while self._pending:
+            context, plan, cache_key = self._pending[0]
+            if isinstance(plan, Future):
+                if len(ready) >= block_until and not plan.done():
+                    break
+                plan = plan.result()
+            self._pending.popleft()
+            if cache_key is not None:
+                self.cache.put(cache_key, plan)
+            ready.append((context, plan))
+        return iter(ready)
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.flush()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
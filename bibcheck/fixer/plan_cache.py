@@ -0,0 +1,68 @@
+import hashlib
+import json
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+
+from .planner import FixConfig
+
+# 规划逻辑变化时递增，使旧计划全部失效
+PLANNER_VERSION = 2
+_KEY_PREFIX = "fixplan:"
+_FLUSH_EVERY = 500
+
+
+def plan_fingerprint(entry: dict, online_result: dict, config: FixConfig) -> str:
+    """build_plan 的全部输入：条目字段、解析结果（或候选的 DOI/得分）、FixConfig 阈值与规划器版本。"""
+    fields = {k: v for k, v in entry.items() if not k.startswith("_") and isinstance(v, str)}
+    resolved = online_result.get("resolved")
+    payload = {
+        "v": PLANNER_VERSION,
+        "config": asdict(config),
+        "entry": fields,
+        "resolved": resolved,
+        "title_match_score": online_result.get("title_match_score") if resolved else None,
+        # 无解析结果时 planner 只看候选的 score/doi/source
+        "candidates": None
+        if resolved
+        else [[c.get("score"), c.get("doi"), c.get("source")] for c in online_result.get("candidate_matches") or []],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """修复计划的磁盘缓存（复用 HTTPCache 的 SQLite），按 plan_fingerprint 命中。
+
+    写入先攒批，flush 时一次事务写入。
+    """
+
+    def __init__(self, cache, config: FixConfig):
+        self.cache = cache
+        self.config = config
+        self.hits = 0
+        self.misses = 0
+        self._pending: List[Tuple[str, dict]] = []
+
+    def key(self, entry: dict, online_result: dict) -> str:
+        return _KEY_PREFIX + plan_fingerprint(entry, online_result, self.config)
+
+    def get(self, key: str) -> Optional[dict]:
+        plan = self.cache.get(key)
+        if isinstance(plan, dict):
+            self.hits += 1
+            return plan
+        self.misses += 1
+        return None
+
+    def put(self, key: str, plan: dict) -> None:
+        self._pending.append((key, plan))
+        if len(self._pending) >= _FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self.cache.set_many(self._pending)
+            self._pending = []
+
+    def summary(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,53 @@
+import json
+import os
+import time
+from typing import Dict, Tuple
+
+from ..checkpoint import file_sha256
+
+PLAN_FILE_VERSION = 1
+
+
+class PlanFileMismatch(Exception):
+    """计划文件与当前 bib 文件不对应（bib 已被修改或不是同一个文件）。"""
+
+
+def write_plan_file(path: str, bibfile: str, plans: Dict[str, Dict]) -> None:
+    """保存全部候选修复，供 apply-plan 以任意阈值离线应用。
+
+    计划中被 FixPlanner 按中置信阈值挡下的候选（plan["held"]）一并写入 actions。
+
+    JSONL：首行头部记录 bib 文件的 sha256，之后每个条目一行 {"citekey", "actions"}，按条目顺序。
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        header = {
+            "kind": "header",
+            "version": PLAN_FILE_VERSION,
+            "bibfile": os.path.basename(bibfile),
+            "bib_sha256": file_sha256(bibfile),
+            "created_at": int(time.time()),
+        }
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for citekey, plan in plans.items():
+            actions = plan.get("actions", []) + plan.get("held", [])
+            if actions:
+                f.write(json.dumps({"kind": "plan", "citekey": citekey, "actions": actions}, ensure_ascii=False) + "\n")
+
+
+def read_plan_file(path: str, bibfile: str = None, check: bool = True) -> Tuple[dict, Dict[str, Dict]]:
+    """读取计划文件；给定 bibfile 且 check 为真时校验其内容与生成计划时一致。"""
+    plans: Dict[str, Dict] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("kind") != "header" or header.get("version") != PLAN_FILE_VERSION:
+            raise PlanFileMismatch(f"不是 bibcheck 计划文件或版本不兼容: {path}")
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            plans[item["citekey"]] = {"citekey": item["citekey"], "actions": item["actions"]}
+    if bibfile and check and file_sha256(bibfile) != header["bib_sha256"]:
+        raise PlanFileMismatch(f"{bibfile} 与生成计划时的内容不一致（可用 --force 跳过校验）")
+    return header, plans
+
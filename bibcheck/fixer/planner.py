@@ -35,10 +35,12 @@ class FixPlanner:
         if arxiv_venue_action:
             actions.append(arxiv_venue_action)
 
+        # 低于中置信阈值的候选 DOI 不进入 actions（不应用、不报告），只随计划文件保存
+        held: List[dict] = []
         if resolved:
             actions.extend(self._plan_from_resolved(entry, resolved, title_score))
         else:
-            actions.extend(self._plan_from_candidates(entry, online_data.get("candidate_matches", [])))
+            actions.extend(self._plan_from_candidates(entry, online_data.get("candidate_matches", []), held))
 
         # pages 规范化（若未从在线覆盖）
         if not any(a["field"] == "pages" for a in actions):
@@ -59,7 +61,10 @@ class FixPlanner:
             f"{a['field']}: {a.get('old')} -> {a.get('new')} (conf={a['confidence']:.2f}, src={a['source']})"
             for a in actions
         ]
-        return {"citekey": entry["ID"], "actions": actions, "preview": preview}
+        plan = {"citekey": entry["ID"], "actions": actions, "preview": preview}
+        if held:
+            plan["held"] = held
+        return plan
 
     def _plan_arxiv_doi(self, entry: dict) -> Optional[dict]:
         """arXiv DOI 统一小写；若无 DOI 但有 eprint/url 含 arXiv id 则补全。"""
@@ -162,17 +167,21 @@ class FixPlanner:
                     actions.append(self._make_action(entry, f, new=new_val, confidence=conf, source=resolved.get("source", "online"), reason=f"补全 {f}"))
         return actions
 
-    def _plan_from_candidates(self, entry: dict, candidates: List[dict]) -> List[dict]:
+    def _plan_from_candidates(self, entry: dict, candidates: List[dict], held: List[dict]) -> List[dict]:
         actions = []
         if not candidates:
             return actions
         best = max(candidates, key=lambda m: m.get("score", 0))
         score = best.get("score", 0)
         conf = confidence_from_candidate(score)
-        if best.get("doi") and conf >= self.config.mid_threshold:
-            doi_new = normalize_doi_value(best["doi"])
-            if doi_new and doi_new != normalize_doi_value(entry.get("doi")):
-                actions.append(self._make_action(entry, "doi", new=doi_new, confidence=conf, source=best.get("source", "candidate"), reason="高置信候选 DOI"))
+        doi_new = normalize_doi_value(best["doi"]) if best.get("doi") else None
+        if not doi_new or doi_new == normalize_doi_value(entry.get("doi")):
+            return actions
+        source = best.get("source", "candidate")
+        if conf >= self.config.mid_threshold:
+            actions.append(self._make_action(entry, "doi", new=doi_new, confidence=conf, source=source, reason="高置信候选 DOI"))
+        else:
+            held.append(self._make_action(entry, "doi", new=doi_new, confidence=conf, source=source, reason="候选 DOI"))
         return actions
 
     def _make_action(self, entry: dict, field: str, new, confidence: float, source: str, reason: str, extra: dict = None) -> dict:
@@ -1,6 +1,8 @@
 import re
 from typing import Optional
 
+from .entries import BibEntry, intern_field
+
 
 ARXIV_NEW_RE = re.compile(r"\b(\d{4}\.\d{4,5})(v\d+)?\b", flags=re.I)
 ARXIV_OLD_RE = re.compile(r"\b([a-z\-]+/\d{7})(v\d+)?\b", flags=re.I)
@@ -9,6 +11,9 @@ GITHUB_REPO_RE = re.compile(r"https?://github\.com/([^/\s]+)/([^/\s#?]+)", flags
 
 
 def get_field(entry: dict, name: str) -> Optional[str]:
+    if isinstance(entry, BibEntry):
+        # 解析时字段名已统一小写
+        return entry.get(intern_field(name))
     if name in entry:
         return entry.get(name)
     lower = name.lower()
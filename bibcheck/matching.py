@@ -1,8 +1,12 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 
-from .normalize import normalize_title, normalize_authors, normalize_doi
+from .normalize import memoized, normalize_title, normalize_authors, normalize_doi
+
+# 分数矩阵小于该规模时忽略 workers，单线程计算（线程启动开销大于矩阵本身）
+PARALLEL_MIN_PAIRS = 10_000
 
 
 def title_score(local_title: str, candidate_title: str) -> float:
@@ -11,6 +15,25 @@ def title_score(local_title: str, candidate_title: str) -> float:
     return fuzz.token_set_ratio(normalize_title(local_title), normalize_title(candidate_title)) / 100.0
 
 
+def title_score_matrix(local_titles: Sequence[str], candidate_titles: Sequence[str], workers: int = 1) -> np.ndarray:
+    """批量标题相似度：每个标题只规范化一次，一次 cdist 得到 (len(local), len(candidate)) 的 0-100 分数矩阵。
+
+    空标题所在的行/列得分为 0，与 title_score 的约定一致；workers=-1 使用全部 CPU 核心，
+    仅在矩阵不小于 PARALLEL_MIN_PAIRS 时生效。
+    """
+    queries = [normalize_title(t or "") for t in local_titles]
+    choices = [normalize_title(t or "") for t in candidate_titles]
+    if not queries or not choices:
+        return np.zeros((len(queries), len(choices)), dtype=np.float64)
+    if len(queries) * len(choices) < PARALLEL_MIN_PAIRS:
+        workers = 1
+    matrix = process.cdist(queries, choices, scorer=fuzz.token_set_ratio, dtype=np.float64, workers=workers)
+    matrix[[not q for q in queries], :] = 0.0
+    matrix[:, [not c for c in choices]] = 0.0
+    return matrix
+
+
+@memoized
 def _surname(author: str) -> str:
     if not author:
         return ""
@@ -59,18 +82,40 @@ def venue_score(local_venue: str, candidate_venue: str) -> float:
 
 
 def compute_match_confidence(entry: dict, candidate: dict) -> Tuple[float, Dict[str, float]]:
+    return compute_match_confidences(entry, [candidate])[0]
+
+
+def compute_match_confidences(
+    entry: dict,
+    candidates: List[dict],
+    workers: int = 1,
+    title_scores: Optional[Sequence[float]] = None,
+) -> List[Tuple[float, Dict[str, float]]]:
+    """对整批候选计算置信度：标题与 venue 各走一次 cdist，本地字段只规范化一次。
+
+    title_scores 可传入调用方已算好的标题分数行（0-100），避免重复计算。
+    """
+    if not candidates:
+        return []
+    title_row = title_scores
+    if title_row is None:
+        title_row = title_score_matrix([entry.get("title", "")], [c.get("title", "") for c in candidates], workers=workers)[0]
+    local_venue = entry.get("journal") or entry.get("booktitle") or entry.get("publisher") or ""
+    venue_row = title_score_matrix([local_venue], [c.get("venue") or "" for c in candidates], workers=workers)[0]
     local_doi = normalize_doi(entry.get("doi"))
-    candidate_doi = normalize_doi(candidate.get("doi"))
-    if local_doi and candidate_doi and local_doi.lower() == candidate_doi.lower():
-        return 1.0, {"title": 1.0, "authors": 1.0, "year": 1.0, "venue": 1.0, "doi_match": 1.0}
-
-    t_score = title_score(entry.get("title", ""), candidate.get("title", ""))
-    a_score = author_score(entry.get("author", ""), candidate.get("authors", []) or [])
-    y_score = year_score(entry.get("year"), candidate.get("year"))
-    v_score = venue_score(
-        entry.get("journal") or entry.get("booktitle") or entry.get("publisher") or "",
-        candidate.get("venue") or "",
-    )
-
-    total = 0.55 * t_score + 0.30 * a_score + 0.10 * y_score + 0.05 * v_score
-    return max(0.0, min(1.0, total)), {"title": t_score, "authors": a_score, "year": y_score, "venue": v_score, "doi_match": 0.0}
+
+    results: List[Tuple[float, Dict[str, float]]] = []
+    for idx, candidate in enumerate(candidates):
+        candidate_doi = normalize_doi(candidate.get("doi"))
+        if local_doi and candidate_doi and local_doi.lower() == candidate_doi.lower():
+            results.append((1.0, {"title": 1.0, "authors": 1.0, "year": 1.0, "venue": 1.0, "doi_match": 1.0}))
+            continue
+        t_score = float(title_row[idx]) / 100.0
+        a_score = author_score(entry.get("author", ""), candidate.get("authors", []) or [])
+        y_score = year_score(entry.get("year"), candidate.get("year"))
+        v_score = float(venue_row[idx]) / 100.0
+        total = 0.55 * t_score + 0.30 * a_score + 0.10 * y_score + 0.05 * v_score
+        results.append(
+            (max(0.0, min(1.0, total)), {"title": t_score, "authors": a_score, "year": y_score, "venue": v_score, "doi_match": 0.0})
+        )
+    return results
@@ -0,0 +1,297 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 延迟直方图桶上界（秒），与 Prometheus 客户端默认桶接近
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 缓存 key 前缀 -> 数据源名（与 OnlineValidator.clients 的键一致）
+_CACHE_PREFIX_ALIASES = {"citationcff": "citation_cff"}
+_MISS = object()
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """按桶上界估计分位数；落入 +Inf 桶时返回观测到的最大值。"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.buckets[idx] if idx < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 6),
+            "buckets": {_fmt_le(le): n for le, n in zip(self.buckets + (float("inf"),), _cumulative(self.counts))},
+        }
+
+
+class _SourceStats:
+    __slots__ = ("requests", "errors", "retries", "backoff", "throttle", "bytes", "status", "latency", "breaker_trips", "short_circuited")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.backoff = 0.0
+        self.throttle = 0.0
+        self.breaker_trips = 0
+        self.short_circuited = 0
+        self.bytes = 0
+        self.status: Dict[str, int] = defaultdict(int)
+        self.latency = Histogram()
+
+
+class _CacheStats:
+    __slots__ = ("hit", "miss", "negative_hit", "set", "get_latency", "set_latency")
+
+    def __init__(self):
+        self.hit = 0
+        self.miss = 0
+        self.negative_hit = 0
+        self.set = 0
+        self.get_latency = Histogram()
+        self.set_latency = Histogram()
+
+
+class Metrics:
+    """按数据源统计在线请求与缓存访问，线程安全。
+
+    - 请求：次数、状态码（异常记为异常类名）、失败数、重试次数与退避时长、响应字节数、延迟直方图；
+    - 缓存：命中 / 未命中 / 负命中（缓存的是“查无结果”）次数，读写耗时直方图。
+
+    add_listener 注册的回调会收到 (event, source, seconds, status)，event 为 request/retry/wait，
+    供 --profile 把数据源调用归到当前条目。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sources: Dict[str, _SourceStats] = defaultdict(_SourceStats)
+        self.cache: Dict[str, _CacheStats] = defaultdict(_CacheStats)
+        self._listeners: List[Callable] = []
+
+    def add_listener(self, fn: Callable) -> None:
+        self._listeners.append(fn)
+
+    def _notify(self, event: str, source: str, seconds: float, status=None) -> None:
+        for fn in self._listeners:
+            fn(event, source, seconds, status)
+
+    def observe_request(self, source: str, latency: float, status, nbytes: int = 0) -> None:
+        with self._lock:
+            s = self.sources[source]
+            s.requests += 1
+            s.status[str(status)] += 1
+            if not isinstance(status, int) or status >= 400:
+                s.errors += 1
+            s.bytes += nbytes
+            s.latency.observe(latency)
+        self._notify("request", source, latency, status)
+
+    def observe_retry(self, source: str, delay: float) -> None:
+        with self._lock:
+            s = self.sources[source]
+            s.retries += 1
+            s.backoff += delay
+        self._notify("retry", source, delay)
+
+    def observe_wait(self, source: str, seconds: float) -> None:
+        """客户端限流（min_interval）造成的等待。"""
+        with self._lock:
+            self.sources[source].throttle += seconds
+        self._notify("wait", source, seconds)
+
+    def observe_breaker_open(self, source: str) -> None:
+        with self._lock:
+            self.sources[source].breaker_trips += 1
+
+    def observe_short_circuit(self, source: str) -> None:
+        """熔断打开期间被直接跳过的调用。"""
+        with self._lock:
+            self.sources[source].short_circuited += 1
+
+    def observe_cache_get(self, source: str, outcome: str, latency: float) -> None:
+        with self._lock:
+            c = self.cache[source]
+            setattr(c, outcome, getattr(c, outcome) + 1)
+            c.get_latency.observe(latency)
+
+    def observe_cache_set(self, source: str, latency: float) -> None:
+        with self._lock:
+            c = self.cache[source]
+            c.set += 1
+            c.set_latency.observe(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            sources = {
+                name: {
+                    "requests": s.requests,
+                    "errors": s.errors,
+                    "retries": s.retries,
+                    "backoff_s": round(s.backoff, 3),
+                    "throttle_s": round(s.throttle, 3),
+                    "breaker_trips": s.breaker_trips,
+                    "short_circuited": s.short_circuited,
+                    "bytes": s.bytes,
+                    "status": dict(sorted(s.status.items())),
+                    "latency_s": s.latency.snapshot(),
+                }
+                for name, s in sorted(self.sources.items())
+            }
+            cache = {}
+            for name, c in sorted(self.cache.items()):
+                lookups = c.hit + c.miss + c.negative_hit
+                cache[name] = {
+                    "gets": lookups,
+                    "hits": c.hit,
+                    "negative_hits": c.negative_hit,
+                    "misses": c.miss,
+                    "hit_rate": round((c.hit + c.negative_hit) / lookups, 3) if lookups else None,
+                    "sets": c.set,
+                    "get_latency_s": c.get_latency.snapshot(),
+                    "set_latency_s": c.set_latency.snapshot(),
+                }
+        return {"sources": sources, "cache": cache}
+
+    def to_prometheus(self) -> str:
+        """导出 Prometheus 文本格式（exposition format 0.0.4）。"""
+        snap = self.snapshot()
+        lines = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def hist(name: str, labels: Dict[str, str], h: Dict[str, Any]):
+            for le, n in h["buckets"].items():
+                lines.append(f"{name}_bucket{_labels(dict(labels, le=le))} {n}")
+            lines.append(f"{name}_sum{_labels(labels)} {h['sum']}")
+            lines.append(f"{name}_count{_labels(labels)} {h['count']}")
+
+        family("bibcheck_source_requests_total", "counter", "HTTP requests sent to each metadata source by status.")
+        for src, s in snap["sources"].items():
+            for status, n in s["status"].items():
+                lines.append(f"bibcheck_source_requests_total{_labels({'source': src, 'status': status})} {n}")
+        for metric, key, help_text in (
+            ("bibcheck_source_retries_total", "retries", "Retried requests per source."),
+            ("bibcheck_source_backoff_seconds_total", "backoff_s", "Time spent sleeping in retry backoff."),
+            ("bibcheck_source_throttle_seconds_total", "throttle_s", "Time spent waiting on the client-side rate limit."),
+            ("bibcheck_source_response_bytes_total", "bytes", "Response body bytes received."),
+            ("bibcheck_source_breaker_trips_total", "breaker_trips", "Times the circuit breaker opened."),
+            ("bibcheck_source_short_circuited_total", "short_circuited", "Calls skipped while the circuit was open."),
+        ):
+            family(metric, "counter", help_text)
+            for src, s in snap["sources"].items():
+                lines.append(f"{metric}{_labels({'source': src})} {s[key]}")
+        family("bibcheck_source_request_duration_seconds", "histogram", "Per-attempt request latency.")
+        for src, s in snap["sources"].items():
+            hist("bibcheck_source_request_duration_seconds", {"source": src}, s["latency_s"])
+
+        family("bibcheck_cache_lookups_total", "counter", "Cache lookups by result (hit, negative_hit, miss).")
+        for src, c in snap["cache"].items():
+            for result, key in (("hit", "hits"), ("negative_hit", "negative_hits"), ("miss", "misses")):
+                lines.append(f"bibcheck_cache_lookups_total{_labels({'source': src, 'result': result})} {c[key]}")
+        family("bibcheck_cache_writes_total", "counter", "Cache writes.")
+        for src, c in snap["cache"].items():
+            lines.append(f"bibcheck_cache_writes_total{_labels({'source': src})} {c['sets']}")
+        family("bibcheck_cache_operation_duration_seconds", "histogram", "SQLite cache get/set latency.")
+        for src, c in snap["cache"].items():
+            hist("bibcheck_cache_operation_duration_seconds", {"source": src, "op": "get"}, c["get_latency_s"])
+            hist("bibcheck_cache_operation_duration_seconds", {"source": src, "op": "set"}, c["set_latency_s"])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+
+class InstrumentedCache:
+    """包装 HTTPCache，按 key 前缀（数据源）统计命中率与读写耗时；其余属性透传。"""
+
+    def __init__(self, cache, metrics: Metrics, namespace: Optional[str] = None):
+        self.cache = cache
+        self.metrics = metrics
+        # 同一 Metrics 统计多个缓存库时用前缀区分，如 autofix.crossref
+        self.namespace = namespace
+
+    def get(self, key: str, default=None):
+        started = time.perf_counter()
+        value = self.cache.get(key, _MISS)
+        elapsed = time.perf_counter() - started
+        if value is _MISS:
+            outcome, value = "miss", default
+        elif _is_negative(value):
+            outcome = "negative_hit"
+        else:
+            outcome = "hit"
+        self.metrics.observe_cache_get(self._source(key), outcome, elapsed)
+        return value
+
+    def set(self, key: str, value) -> None:
+        started = time.perf_counter()
+        self.cache.set(key, value)
+        self.metrics.observe_cache_set(self._source(key), time.perf_counter() - started)
+
+    def _source(self, key: str) -> str:
+        source = cache_source(key)
+        return f"{self.namespace}.{source}" if self.namespace else source
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+
+def cache_source(key: str) -> str:
+    prefix = key.split(":", 1)[0] if ":" in key else "other"
+    return _CACHE_PREFIX_ALIASES.get(prefix, prefix)
+
+
+def _is_negative(value) -> bool:
+    if value is None or value == [] or value == {}:
+        return True
+    return isinstance(value, dict) and value.get("status") == "missing"
+
+
+def _cumulative(counts):
+    total = 0
+    for n in counts:
+        total += n
+        yield total
+
+
+def _fmt_le(le: float) -> str:
+    return "+Inf" if le == float("inf") else repr(le)
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    body = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,518 @@
+"""本地元数据桩服务器：离线模拟 bibcheck.sources 用到的上游 API，用于并发/限流/容错测试。
+
+实现的子集（路径第一段区分数据源）：
+  /crossref/works, /crossref/works/{doi}
+  /openalex/works, /openalex/works/https://doi.org/{doi}
+  /s2/graph/v1/paper/search, /s2/graph/v1/paper/DOI:{doi}
+  /arxiv/api/query?id_list=...
+  /dblp/search/publ/api?q=...
+  /citation_cff/{owner}/{repo}/{branch}/CITATION.cff
+
+语料来自 .bib 文件（或同结构的 JSON 记录列表），按 DOI / arXiv ID / GitHub 仓库索引，
+标题检索用 rapidfuzz 打分。故障注入由 FaultRule 脚本描述（YAML/JSON 文件或运行时 inject）。
+
+    python -m bibcheck.mockserver --corpus refs.bib --port 8780 --faults faults.yaml
+    python -m bibcheck refs.bib --base-url crossref=http://127.0.0.1:8780/crossref ...
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, fields
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import yaml
+from rapidfuzz import fuzz, process
+
+from .kind import extract_arxiv_id, extract_github_repo, get_field
+from .normalize import normalize_authors, normalize_doi, normalize_title
+
+Record = Dict[str, object]
+Response = Tuple[int, str, bytes, Dict[str, str]]
+
+# 数据源（与 OnlineValidator.clients 的键一致）-> 客户端 base 相对服务器根的路径，与各客户端 DEFAULT_BASE 的结构一致
+BASE_PATHS = {
+    "crossref": "/crossref",
+    "openalex": "/openalex/works",
+    "s2": "/s2/graph/v1/paper",
+    "arxiv": "/arxiv/api/query",
+    "dblp": "/dblp/search/publ/api",
+    "citation_cff": "/citation_cff",
+}
+SOURCES = tuple(BASE_PATHS)
+_SEARCH_CUTOFF = 60
+_DOI_PREFIX_RE = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:)", flags=re.I)
+_ARXIV_VERSION_RE = re.compile(r"v\d+$")
+_FILTER_YEAR_RE = re.compile(r"(\d{4})")
+
+
+@dataclass
+class FaultRule:
+    """一条故障注入规则。
+
+    source/path 用于匹配请求（source 为 "*" 匹配全部，path 为路径正则）；
+    跳过前 after 次匹配后生效，最多触发 count 次（None 为不限），每次按 probability 抽样。
+    status 为 0 时只注入延迟 delay，否则直接返回该状态码（可带 Retry-After）。
+    """
+
+    source: str = "*"
+    path: Optional[str] = None
+    status: int = 503
+    retry_after: Optional[float] = None
+    delay: float = 0.0
+    after: int = 0
+    count: Optional[int] = None
+    probability: float = 1.0
+    body: Optional[str] = None
+
+    def __post_init__(self):
+        self._path_re = re.compile(self.path) if self.path else None
+        self.seen = 0
+        self.fired = 0
+
+    def matches(self, source: str, path: str) -> bool:
+        if self.source not in ("*", source):
+            return False
+        return self._path_re is None or bool(self._path_re.search(path))
+
+    def fire(self, rng: random.Random) -> bool:
+        self.seen += 1
+        if self.seen <= self.after:
+            return False
+        if self.count is not None and self.fired >= self.count:
+            return False
+        if self.probability < 1.0 and rng.random() >= self.probability:
+            return False
+        self.fired += 1
+        return True
+
+
+def load_fault_rules(path: str) -> List[FaultRule]:
+    """读取 YAML/JSON 故障脚本：顶层为规则列表，或 {"faults": [...]}。"""
+    with open(path, "r", encoding="utf-8") as f:
+        payload = yaml.safe_load(f) or []
+    if isinstance(payload, dict):
+        payload = payload.get("faults", [])
+    known = {f.name for f in fields(FaultRule)}
+    rules = []
+    for item in payload:
+        unknown = set(item) - known
+        if unknown:
+            raise ValueError(f"未知的故障规则字段: {', '.join(sorted(unknown))}")
+        rules.append(FaultRule(**item))
+    return rules
+
+
+def load_corpus(path: str) -> List[Record]:
+    """.bib 文件按条目转换为记录；.json 文件直接视为记录列表。"""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    from .parser import load_bib_entries
+
+    entries, _ = load_bib_entries(path)
+    return [record_from_entry(entry) for entry in entries]
+
+
+def record_from_entry(entry: dict) -> Record:
+    venue = get_field(entry, "journal") or get_field(entry, "booktitle")
+    return {
+        "title": get_field(entry, "title") or "",
+        "authors": normalize_authors(get_field(entry, "author")),
+        "year": get_field(entry, "year"),
+        "venue": venue,
+        "doi": normalize_doi(get_field(entry, "doi")),
+        "arxiv_id": extract_arxiv_id(entry),
+        "repo": extract_github_repo(entry),
+    }
+
+
+class Corpus:
+    def __init__(self, records: List[Record]):
+        self.records = list(records)
+        self.by_doi: Dict[str, Record] = {}
+        self.by_arxiv: Dict[str, Record] = {}
+        self.by_repo: Dict[str, Record] = {}
+        for rec in self.records:
+            if rec.get("doi"):
+                self.by_doi[str(rec["doi"]).lower()] = rec
+            if rec.get("arxiv_id"):
+                self.by_arxiv[_ARXIV_VERSION_RE.sub("", str(rec["arxiv_id"]))] = rec
+            if rec.get("repo"):
+                self.by_repo[str(rec["repo"]).lower()] = rec
+        self._titles = [normalize_title(str(rec.get("title") or "")) for rec in self.records]
+
+    def doi(self, doi: str) -> Optional[Record]:
+        return self.by_doi.get(_DOI_PREFIX_RE.sub("", unquote(doi)).lower())
+
+    def arxiv(self, arxiv_id: str) -> Optional[Record]:
+        return self.by_arxiv.get(_ARXIV_VERSION_RE.sub("", arxiv_id.strip()))
+
+    def repo(self, owner: str, repo: str) -> Optional[Record]:
+        return self.by_repo.get(f"{owner}/{repo}".lower())
+
+    def search(self, query: str, limit: int = 5) -> List[Record]:
+        query = normalize_title(query or "")
+        if not query or not self.records:
+            return []
+        hits = process.extract(query, self._titles, scorer=fuzz.token_set_ratio, score_cutoff=_SEARCH_CUTOFF, limit=limit)
+        return [self.records[idx] for _, _, idx in hits]
+
+
+def _crossref_item(rec: Record) -> dict:
+    authors = []
+    for name in rec.get("authors") or []:
+        given, _, family = str(name).rpartition(" ")
+        authors.append({"given": given, "family": family} if given else {"family": family})
+    item = {
+        "DOI": rec.get("doi"),
+        "title": [rec.get("title")],
+        "author": authors,
+        "container-title": [rec["venue"]] if rec.get("venue") else [],
+        "URL": f"https://doi.org/{rec['doi']}" if rec.get("doi") else None,
+    }
+    if rec.get("year"):
+        item["issued"] = {"date-parts": [[int(rec["year"])]]}
+    return item
+
+
+def _openalex_item(rec: Record) -> dict:
+    return {
+        "id": f"https://openalex.org/W{zlib.crc32(str(rec.get('title')).encode('utf-8'))}",
+        "doi": f"https://doi.org/{rec['doi']}" if rec.get("doi") else None,
+        "title": rec.get("title"),
+        "display_name": rec.get("title"),
+        "publication_year": int(rec["year"]) if rec.get("year") else None,
+        "authorships": [{"author": {"display_name": a}} for a in rec.get("authors") or []],
+        "primary_location": {"source": {"display_name": rec.get("venue")}} if rec.get("venue") else None,
+    }
+
+
+def _s2_item(rec: Record) -> dict:
+    return {
+        "title": rec.get("title"),
+        "year": int(rec["year"]) if rec.get("year") else None,
+        "venue": rec.get("venue") or "",
+        "authors": [{"name": a} for a in rec.get("authors") or []],
+        "externalIds": {"DOI": rec["doi"]} if rec.get("doi") else {},
+        "url": None,
+    }
+
+
+def _dblp_hit(rec: Record) -> dict:
+    info = {
+        "title": f"{rec.get('title')}.",
+        "venue": rec.get("venue"),
+        "year": rec.get("year"),
+        "authors": {"author": [{"text": a} for a in rec.get("authors") or []]},
+    }
+    if rec.get("doi"):
+        info["doi"] = rec["doi"]
+    return {"info": info}
+
+
+def _arxiv_entry(rec: Record) -> str:
+    authors = "".join(f"<author><name>{escape(str(a))}</name></author>" for a in rec.get("authors") or [])
+    year = rec.get("year") or "2000"
+    doi = f"<arxiv:doi>{escape(str(rec['doi']))}</arxiv:doi>" if rec.get("doi") else ""
+    return (
+        f"<entry><id>http://arxiv.org/abs/{escape(str(rec['arxiv_id']))}</id>"
+        f"<title>{escape(str(rec.get('title')))}</title>{authors}"
+        f"<published>{year}-01-01T00:00:00Z</published>{doi}</entry>"
+    )
+
+
+def _cff(rec: Record) -> str:
+    payload = {"cff-version": "1.2.0", "title": rec.get("title"), "authors": []}
+    for name in rec.get("authors") or []:
+        given, _, family = str(name).rpartition(" ")
+        payload["authors"].append({"family-names": family, "given-names": given} if given else {"family-names": family})
+    if rec.get("year"):
+        payload["date-released"] = f"{rec['year']}-01-01"
+    if rec.get("doi"):
+        payload["doi"] = rec["doi"]
+    return yaml.safe_dump(payload, allow_unicode=True, sort_keys=False)
+
+
+def _json(body, status: int = 200) -> Response:
+    return status, "application/json", json.dumps(body).encode("utf-8"), {}
+
+
+_NOT_FOUND: Response = (404, "application/json", b'{"message": "not found"}', {})
+
+
+class MockState:
+    def __init__(
+        self,
+        corpus: Corpus,
+        latency: float = 0.0,
+        rate_limits: Optional[Dict[str, float]] = None,
+        faults: Optional[List[FaultRule]] = None,
+        seed: int = 0,
+    ):
+        self.corpus = corpus
+        self.latency = latency
+        self.rate_limits = dict(rate_limits or {})
+        self.faults: List[FaultRule] = list(faults or [])
+        self.requests = Counter()
+        self.responses = Counter()
+        self._rng = random.Random(seed)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, source: str) -> Optional[float]:
+        """按数据源的令牌桶限流；被拒绝时返回建议的 Retry-After 秒数。"""
+        rate = self.rate_limits.get(source, self.rate_limits.get("*", 0.0))
+        if rate <= 0:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(source, (rate, now))
+            tokens = min(rate, tokens + (now - last) * rate)
+            if tokens < 1.0:
+                self._buckets[source] = (tokens, now)
+                return (1.0 - tokens) / rate
+            self._buckets[source] = (tokens - 1.0, now)
+            return None
+
+    def fault(self, source: str, path: str) -> Tuple[float, Optional[Response]]:
+        """返回（注入延迟, 注入响应）；多条规则命中时延迟累加，响应取第一条。"""
+        delay, response = 0.0, None
+        with self._lock:
+            for rule in self.faults:
+                if not rule.matches(source, path) or not rule.fire(self._rng):
+                    continue
+                delay += rule.delay
+                if rule.status and response is None:
+                    headers = {"Retry-After": _fmt_seconds(rule.retry_after)} if rule.retry_after is not None else {}
+                    body = (rule.body or json.dumps({"message": "injected fault"})).encode("utf-8")
+                    response = (rule.status, "application/json", body, headers)
+        return delay, response
+
+    def handle(self, source: str, path: str, query: Dict[str, str]) -> Response:
+        with self._lock:
+            self.requests[source] += 1
+        wait = self.admit(source)
+        if wait is not None:
+            return 429, "application/json", b'{"message": "rate limited"}', {"Retry-After": _fmt_seconds(wait)}
+        delay, injected = self.fault(source, path)
+        if self.latency + delay > 0:
+            time.sleep(self.latency + delay)
+        if injected is not None:
+            return injected
+        return self.route(source, path, query) or _NOT_FOUND
+
+    def route(self, source: str, path: str, query: Dict[str, str]) -> Optional[Response]:
+        """按路径第一段分发到各数据源；子类可覆盖以换用其他响应来源（如基准回放的录制 fixture）。"""
+        if source not in SOURCES:
+            return None
+        return getattr(self, f"_route_{source}")(path, query)
+
+    def _route_crossref(self, path: str, query: Dict[str, str]) -> Response:
+        if path.startswith("/works/"):
+            rec = self.corpus.doi(path[len("/works/"):])
+            return _json({"status": "ok", "message": _crossref_item(rec)}) if rec else _NOT_FOUND
+        if path.rstrip("/") == "/works":
+            hits = self._filter_year(self.corpus.search(query.get("query.bibliographic", "")), query.get("filter"))
+            rows = int(query.get("rows") or 20)
+            return _json({"status": "ok", "message": {"items": [_crossref_item(r) for r in hits[:rows]]}})
+        return _NOT_FOUND
+
+    def _route_openalex(self, path: str, query: Dict[str, str]) -> Response:
+        if path.startswith("/works/"):
+            rec = self.corpus.doi(path[len("/works/"):])
+            return _json(_openalex_item(rec)) if rec else _NOT_FOUND
+        if path.rstrip("/") == "/works":
+            filters = dict(part.split(":", 1) for part in (query.get("filter") or "").split(",") if ":" in part)
+            title = filters.get("display_name.search") or filters.get("title.search") or query.get("search", "")
+            hits = self._filter_year(self.corpus.search(title), filters.get("from_publication_date"))
+            per_page = int(query.get("per-page") or 25)
+            results = [_openalex_item(r) for r in hits[:per_page]]
+            return _json({"meta": {"count": len(results)}, "results": results})
+        return _NOT_FOUND
+
+    def _route_s2(self, path: str, query: Dict[str, str]) -> Response:
+        if path.endswith("/paper/search"):
+            limit = int(query.get("limit") or 10)
+            data = [_s2_item(r) for r in self.corpus.search(query.get("query", ""), limit)]
+            return _json({"total": len(data), "offset": 0, "data": data})
+        if "/paper/DOI:" in path:
+            rec = self.corpus.doi(path.split("/paper/DOI:", 1)[1])
+            return _json(_s2_item(rec)) if rec else _NOT_FOUND
+        return _NOT_FOUND
+
+    def _route_arxiv(self, path: str, query: Dict[str, str]) -> Response:
+        if path.rstrip("/") != "/api/query":
+            return _NOT_FOUND
+        ids = [i for i in (query.get("id_list") or "").split(",") if i.strip()]
+        entries = "".join(_arxiv_entry(rec) for rec in filter(None, map(self.corpus.arxiv, ids)))
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+            f"{entries}</feed>"
+        )
+        return 200, "application/atom+xml; charset=utf-8", body.encode("utf-8"), {}
+
+    def _route_dblp(self, path: str, query: Dict[str, str]) -> Response:
+        if path.rstrip("/") != "/search/publ/api":
+            return _NOT_FOUND
+        q = query.get("q", "")
+        rec = self.corpus.doi(q) if q.startswith("10.") else None
+        hits = [rec] if rec else self.corpus.search(q)
+        count = len(hits)
+        return _json({"result": {"hits": {"@total": str(count), "@sent": str(count), "hit": [_dblp_hit(r) for r in hits]}}})
+
+    def _route_citation_cff(self, path: str, query: Dict[str, str]) -> Response:
+        parts = path.strip("/").split("/")
+        if len(parts) != 4 or parts[3] != "CITATION.cff":
+            return _NOT_FOUND
+        rec = self.corpus.repo(parts[0], parts[1])
+        if rec is None:
+            return _NOT_FOUND
+        return 200, "text/plain; charset=utf-8", _cff(rec).encode("utf-8"), {}
+
+    @staticmethod
+    def _filter_year(hits: List[Record], spec: Optional[str]) -> List[Record]:
+        m = _FILTER_YEAR_RE.search(spec or "")
+        if not m:
+            return hits
+        return [r for r in hits if not r.get("year") or str(r["year"]) == m.group(1)]
+
+
+def _fmt_seconds(value: float) -> str:
+    # Retry-After 只允许整数秒
+    return str(max(0, int(value + 0.999)))
+
+
+def _make_handler(state: MockState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            source, _, rest = parts.path.lstrip("/").partition("/")
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            status, content_type, body, headers = state.handle(source, "/" + rest, query)
+            with state._lock:
+                state.responses[(source, status)] += 1
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class MockServer:
+    """在后台线程运行的桩服务器，可作为上下文管理器使用。传入 state 时忽略语料与限流等参数。"""
+
+    def __init__(
+        self,
+        records: Optional[List[Record]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate_limits: Optional[Dict[str, float]] = None,
+        faults: Optional[List[FaultRule]] = None,
+        seed: int = 0,
+        state: Optional[MockState] = None,
+    ):
+        self.state = state or MockState(Corpus(records or []), latency=latency, rate_limits=rate_limits, faults=faults, seed=seed)
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self.state))
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        """可直接传给 OnlineValidatorConfig.base_urls 的各数据源 base。"""
+        return {source: self.url + path for source, path in BASE_PATHS.items()}
+
+    def inject(self, rule: FaultRule) -> FaultRule:
+        with self.state._lock:
+            self.state.faults.append(rule)
+        return rule
+
+    def clear_faults(self) -> None:
+        with self.state._lock:
+            self.state.faults.clear()
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def _parse_rate_limits(specs: List[str]) -> Dict[str, float]:
+    limits = {}
+    for spec in specs:
+        source, sep, value = spec.rpartition("=")
+        limits[source if sep else "*"] = float(value)
+    return limits
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="bibcheck 本地元数据桩服务器（离线负载/容错测试）")
+    parser.add_argument("--corpus", default=None, help="语料 .bib 或 JSON 记录列表")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的固定延迟（秒）")
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        default=[],
+        metavar="[SOURCE=]RPS",
+        help="令牌桶限流（次/秒），可重复，如 crossref=5；不带数据源时作用于全部",
+    )
+    parser.add_argument("--faults", default=None, help="故障注入脚本（YAML/JSON）")
+    parser.add_argument("--seed", type=int, default=0, help="概率型故障的随机种子")
+    args = parser.parse_args(argv)
+
+    server = MockServer(
+        records=load_corpus(args.corpus) if args.corpus else [],
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        rate_limits=_parse_rate_limits(args.rate_limit),
+        faults=load_fault_rules(args.faults) if args.faults else [],
+        seed=args.seed,
+    )
+    print(f"mock server listening on {server.url}")
+    for source, url in server.base_urls.items():
+        print(f"  --base-url {source}={url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,46 @@
 import re
 import string
-from typing import List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 
 from rapidfuzz import fuzz
 
 
+# 同一字符串在候选/数据源/修复规划中会被反复规范化，memo 上限足以覆盖单次运行的常见规模
+NORMALIZE_CACHE_SIZE = 1 << 16
+_memoized: Dict[str, Callable] = {}
+
+
+def memoized(fn: Callable) -> Callable:
+    """有界 memo（lru_cache）并登记到全局表，便于统计与清理。被装饰函数的参数必须可哈希。"""
+    cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(fn)
+    _memoized[f"{fn.__module__}.{fn.__qualname__}"] = cached
+    return cached
+
+
+def normalize_cache_info() -> Dict[str, Dict[str, int]]:
+    """各 memo 的调用统计：calls 为总调用数，misses 为实际执行正则的次数。"""
+    info = {}
+    for name, fn in _memoized.items():
+        ci = fn.cache_info()
+        info[name] = {"calls": ci.hits + ci.misses, "misses": ci.misses, "size": ci.currsize}
+    return info
+
+
+def clear_normalize_caches() -> None:
+    for fn in _memoized.values():
+        fn.cache_clear()
+
+
 _latex_cmd_re = re.compile(r"\\[a-zA-Z]+\s*|\{|\}")
 _latex_math_re = re.compile(r"\$[^$]*\$")
 _whitespace_re = re.compile(r"\s+")
 _punct_tbl = str.maketrans("", "", string.punctuation)
+_and_re = re.compile(r"\band\b", flags=re.I)
+_and_split_re = re.compile(r"\s+and\s+", flags=re.I)
 
 
+@memoized
 def normalize_title(title: str) -> str:
     if not title:
         return ""
@@ -25,15 +55,21 @@ def normalize_authors(authors: Optional[str]) -> List[str]:
     """优先按 'and' 分隔作者，避免把“Last, First”误拆。"""
     if not authors:
         return []
+    # memo 中保存元组，返回副本以免调用方修改缓存内容
+    return list(_split_authors(authors))
+
+
+@memoized
+def _split_authors(authors: str) -> Tuple[str, ...]:
     # 若包含 and，以 and 为准
-    if re.search(r"\band\b", authors, flags=re.I):
-        parts = re.split(r"\s+and\s+", authors, flags=re.I)
+    if _and_re.search(authors):
+        parts = _and_split_re.split(authors)
     elif ";" in authors:
         parts = authors.split(";")
     else:
         # 最后兜底才用逗号，避免误拆姓/名
         parts = [authors]
-    return [a.strip() for a in parts if a.strip()]
+    return tuple(a.strip() for a in parts if a.strip())
 
 
 def normalize_doi(doi: Optional[str]) -> Optional[str]:
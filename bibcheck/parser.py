@@ -4,6 +4,9 @@ from typing import Dict, List, Tuple
 import bibtexparser
 from bibtexparser.bparser import BibTexParser
 
+from .bibpatch import attach_spans
+from .entries import to_entries
+
 Issue = Dict[str, object]
 Entry = Dict[str, object]
 
@@ -14,8 +17,10 @@ def load_bib_entries(path: str, max_entries: int = None) -> Tuple[List[Entry], L
     parser.customization = None
     parse_issues: List[Issue] = []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
+        with open(path, "rb") as f:
+            raw = f.read()
+        # 与文本模式读取一致：统一换行后交给 bibtexparser，字节区间仍以原始字节计
+        content = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
     except OSError as exc:
         parse_issues.append(
             {
@@ -42,7 +47,9 @@ def load_bib_entries(path: str, max_entries: int = None) -> Tuple[List[Entry], L
         )
         return [], parse_issues
 
-    entries = bib_db.entries
+    entries = to_entries(bib_db.entries)
+    # 记录每个条目在源文件中的字节区间，供 bibpatch 原地改写
+    attach_spans(entries, raw)
     if max_entries:
         entries = entries[:max_entries]
     return entries, parse_issues
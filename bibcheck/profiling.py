@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+
+class _Span:
+    __slots__ = ("name", "cat", "start", "cpu_start", "memory", "mem_start", "peak", "calls")
+
+    def __init__(self, name: str, cat: str, memory: bool):
+        self.name = name
+        self.cat = cat
+        self.start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.memory = memory
+        self.mem_start = tracemalloc.get_traced_memory()[0] if memory else 0
+        self.peak = 0
+        self.calls: List[dict] = []
+
+
+class Profiler:
+    """--profile：按阶段与条目记录墙钟时间、CPU 时间和内存分配，输出 Chrome trace。
+
+    - phase(name)：流水线阶段（parse/static/online/plan/apply/write_bib/write_report 等），
+      同名阶段按条目多次出现时在汇总中累加；
+    - entry(citekey)：单个条目，期间的数据源请求/重试退避/限流等待经 Metrics 监听归到该条目；
+    - 内存分配用 tracemalloc 统计净增量与峰值，仅在启用时开启；其计数是进程级的，
+      concurrent(workers) 区段内多线程同时分配无法区分，区段内的 span 不记录内存。
+    未启用时所有方法都是空操作。
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[dict] = []
+        self.phases: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "alloc_kb": 0.0})
+        self.entries: List[dict] = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._tids: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        # 进行中的并发区段数与累计进入次数；span 跨越过并发区段时同样不记录内存
+        self._concurrent = 0
+        self._regions = 0
+        self.memory_skipped = False
+        self._owns_tracing = enabled and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+
+    def attach(self, metrics) -> None:
+        """监听 Metrics 的数据源事件（请求、重试退避、限流等待）。"""
+        if self.enabled:
+            metrics.add_listener(self._on_source_event)
+
+    def phase(self, name: str):
+        return self._span(name, "phase") if self.enabled else nullcontext()
+
+    def entry(self, citekey: str):
+        return self._span(citekey, "entry") if self.enabled else nullcontext()
+
+    @contextmanager
+    def concurrent(self, workers: int):
+        """标记 workers 个线程并发处理条目的区段。"""
+        if not self.enabled or workers <= 1:
+            yield
+            return
+        with self._lock:
+            self._concurrent += 1
+            self._regions += 1
+            self.memory_skipped = True
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._concurrent -= 1
+
+    def _tracks_memory(self) -> bool:
+        return tracemalloc.is_tracing() and not self._concurrent
+
+    @property
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _span(self, name: str, cat: str):
+        stack = self._stack
+        memory = self._tracks_memory()
+        if memory:
+            self._fold_peak(stack)
+        span = _Span(name, cat, memory)
+        regions = self._regions
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+            end = time.perf_counter()
+            wall = end - span.start
+            cpu = time.thread_time() - span.cpu_start
+            args = {"cpu_ms": round(cpu * 1000, 3)}
+            alloc = 0
+            if span.memory and self._tracks_memory() and self._regions == regions:
+                current, traced_peak = tracemalloc.get_traced_memory()
+                span.peak = max(span.peak, traced_peak)
+                alloc = current - span.mem_start
+                peak = max(0, span.peak - span.mem_start)
+                if stack:
+                    stack[-1].peak = max(stack[-1].peak, span.peak)
+                tracemalloc.reset_peak()
+                args.update(alloc_kb=round(alloc / 1024, 1), peak_kb=round(peak / 1024, 1))
+            self._emit(name, cat, span.start, wall, args)
+            with self._lock:
+                if cat == "phase":
+                    p = self.phases[name]
+                    p["count"] += 1
+                    p["wall_ms"] += wall * 1000
+                    p["cpu_ms"] += cpu * 1000
+                    p["alloc_kb"] += alloc / 1024
+                else:
+                    self.entries.append(
+                        {"citekey": name, "wall_ms": round(wall * 1000, 3), **args, "calls": span.calls}
+                    )
+
+    @staticmethod
+    def _fold_peak(stack: List[_Span]) -> None:
+        # 子 span 开始前把当前峰值记到父 span，再重置，使每个 span 的峰值互不干扰
+        if tracemalloc.is_tracing():
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+    def _on_source_event(self, event: str, source: str, seconds: float, status) -> None:
+        end = time.perf_counter()
+        name = source if event == "request" else f"{source}:{event}"
+        self._emit(name, "source", end - seconds, seconds, {"status": status} if status is not None else {})
+        for span in reversed(self._stack):
+            if span.cat == "entry":
+                span.calls.append({"source": source, "event": event, "ms": round(seconds * 1000, 3), "status": status})
+                break
+
+    def _emit(self, name: str, cat: str, start: float, dur: float, args: dict) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            tid = self._tids.setdefault(ident, len(self._tids) + 1)
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": round((start - self._origin) * 1e6, 1),
+                    "dur": round(dur * 1e6, 1),
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+
+    def slowest(self, n: int = 10) -> List[dict]:
+        return sorted(self.entries, key=lambda e: -e["wall_ms"])[:n]
+
+    def summary(self, top: int = 10) -> dict:
+        summary = {
+            "phases": {name: {k: round(v, 3) for k, v in p.items()} for name, p in self.phases.items()},
+            "slowest_entries": self.slowest(top),
+        }
+        if self.memory_skipped:
+            summary["memory_note"] = _MEMORY_NOTE
+        return summary
+
+    def write_trace(self, path: str, top: int = 10) -> None:
+        """Chrome trace（JSON object 格式），可直接用 chrome://tracing、Perfetto 或 speedscope 打开。"""
+        payload = {"traceEvents": self.events, "displayTimeUnit": "ms", "otherData": self.summary(top)}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+    def print_summary(self, top: int = 10) -> None:
+        print("====== Profile ======")
+        print(f"{'阶段':16} {'次数':>7} {'wall ms':>11} {'cpu ms':>11} {'alloc KB':>11}")
+        for name, p in self.phases.items():
+            print(f"{name:18} {p['count']:>7} {p['wall_ms']:>11.1f} {p['cpu_ms']:>11.1f} {p['alloc_kb']:>11.1f}")
+        slowest = self.slowest(top)
+        if slowest:
+            print(f"最慢的 {len(slowest)} 个条目:")
+        for e in slowest:
+            alloc = f", alloc {e['alloc_kb']:.1f} KB" if "alloc_kb" in e else ""
+            print(f"  {e['citekey']}: {e['wall_ms']:.1f} ms (cpu {e['cpu_ms']:.1f} ms{alloc})")
+            for line in _describe_calls(e["calls"]):
+                print(f"    {line}")
+        if self.memory_skipped:
+            print(_MEMORY_NOTE)
+
+    def finish(self, trace_path: Optional[str] = None, top: int = 10) -> None:
+        if not self.enabled:
+            return
+        if trace_path:
+            self.write_trace(trace_path, top)
+        self.print_summary(top)
+        if trace_path:
+            print(f"trace 已写入 {trace_path}")
+        if self._owns_tracing:
+            tracemalloc.stop()
+
+
+_MEMORY_NOTE = "注意：多线程并发处理条目期间未统计内存（tracemalloc 计数为进程级，无法按条目区分），alloc KB 只含串行阶段"
+
+
+def _describe_calls(calls: List[dict]) -> List[str]:
+    """按数据源汇总条目内的调用：请求次数/耗时/状态码，以及退避与限流等待。"""
+    grouped: Dict[str, dict] = {}
+    for c in calls:
+        g = grouped.setdefault(c["source"], {"requests": 0, "request_ms": 0.0, "statuses": [], "retry_ms": 0.0, "wait_ms": 0.0})
+        if c["event"] == "request":
+            g["requests"] += 1
+            g["request_ms"] += c["ms"]
+            g["statuses"].append(str(c["status"]))
+        else:
+            g[f"{c['event']}_ms"] += c["ms"]
+    lines = []
+    for source, g in sorted(grouped.items(), key=lambda kv: -(kv[1]["request_ms"] + kv[1]["retry_ms"] + kv[1]["wait_ms"])):
+        line = f"{source}: {g['requests']} 次请求 {g['request_ms']:.1f} ms"
+        if g["statuses"]:
+            line += f" [{','.join(g['statuses'])}]"
+        if g["retry_ms"]:
+            line += f"，退避 {g['retry_ms']:.1f} ms"
+        if g["wait_ms"]:
+            line += f"，限流等待 {g['wait_ms']:.1f} ms"
+        lines.append(line)
+    return lines
@@ -0,0 +1,71 @@
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+STATS_CACHE_KEY = "query_planner:stats"
+# 没有历史数据时的先验：命中率 1/2、耗时 1s，保证冷启动时沿用配置顺序
+_PRIOR_LATENCY = 1.0
+_SAVE_EVERY = 50
+
+
+class QueryPlanner:
+    """按条目类型（classify_entry）为检索数据源排序。
+
+    每个数据源按“单位耗时的期望命中数”排序：命中指该源返回了能通过高置信门控的候选。
+    统计持久化在 HTTP 缓存里，跨运行逐步调优顺序。
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.stats: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        self._dirty = 0
+        # 并发 autofix 的多个线程共用一个 planner
+        self._lock = threading.Lock()
+        stored = cache.get(STATS_CACHE_KEY) if cache is not None else None
+        if isinstance(stored, dict):
+            for kind, per_source in stored.items():
+                self.stats[kind] = {src: dict(s) for src, s in per_source.items()}
+
+    def order(self, entry_kind: str, sources: List[str]) -> List[str]:
+        per_source = self.stats.get(entry_kind, {})
+        # sorted 是稳定排序，得分相同时保持配置中的顺序
+        return sorted(sources, key=lambda src: -self._score(per_source.get(src)))
+
+    def record(self, entry_kind: str, source: str, latency: float, hit: bool) -> None:
+        with self._lock:
+            s = self.stats[entry_kind].setdefault(source, {"calls": 0, "hits": 0, "latency": 0.0})
+            s["calls"] += 1
+            s["hits"] += 1 if hit else 0
+            s["latency"] += max(0.0, latency)
+            self._dirty += 1
+            due = self._dirty >= _SAVE_EVERY
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        with self._lock:
+            if self.cache is None or not self._dirty:
+                return
+            self.cache.set(STATS_CACHE_KEY, self.stats)
+            self._dirty = 0
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        return {
+            kind: {
+                src: {
+                    "calls": s["calls"],
+                    "hit_rate": round(s["hits"] / s["calls"], 3) if s["calls"] else None,
+                    "avg_latency": round(s["latency"] / s["calls"], 3) if s["calls"] else None,
+                }
+                for src, s in per_source.items()
+            }
+            for kind, per_source in self.stats.items()
+        }
+
+    @staticmethod
+    def _score(s: Optional[Dict[str, float]]) -> float:
+        calls = s["calls"] if s else 0
+        hits = s["hits"] if s else 0
+        hit_rate = (hits + 1) / (calls + 2)
+        avg_latency = (s["latency"] + _PRIOR_LATENCY) / (calls + 1) if s else _PRIOR_LATENCY
+        return hit_rate / max(avg_latency, 1e-3)
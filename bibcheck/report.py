@@ -1,13 +1,38 @@
 import csv
 import json
+import os
+import time
+from abc import ABC, abstractmethod
 from collections import defaultdict
 from typing import Dict, List
 
+DETAIL_LEVELS = ("summary", "topk", "full")
+# summary 级别保留的 online 字段
+_SUMMARY_ONLINE_KEYS = ("checked", "entry_kind", "title_match_score", "unavailable_sources", "timed_out")
+# 候选/解析结果的精简字段
+_CANDIDATE_BRIEF_KEYS = ("title", "year", "doi", "source", "confidence")
+
 
 class ReportBuilder:
-    def __init__(self):
+    """收集条目记录并增量统计。
+
+    sinks 为流式写出器（write(record) / close(report)），每条记录收集后立即写出；
+    keep_entries=False 时不在内存中保留记录，内存占用不随条目数增长。
+    detail 控制写出记录的详略（见 shape_record）；last_record 始终是完整记录，供检查点使用。
+    """
+
+    def __init__(self, sinks: List = None, keep_entries: bool = True, detail: str = "full", top_k: int = 3):
+        if detail not in DETAIL_LEVELS:
+            raise ValueError(f"unknown report detail level: {detail}")
+        self.detail = detail
+        self.top_k = top_k
         self.entries = []
         self.file_issues = []
+        self.sinks = list(sinks or [])
+        self.keep_entries = keep_entries
+        self.stats = {"total": 0, "ok": 0, "warning": 0, "error": 0, "by_issue_type": defaultdict(int)}
+        self.error_keys: List[str] = []
+        self.last_record = None
 
     def add_file_issue(self, issue: dict):
         self.file_issues.append(issue)
@@ -41,33 +66,111 @@ class ReportBuilder:
             "online": online_data,
             "fix_plan_preview": fix_plan_preview or [],
         }
-        self.entries.append(record)
+        self._add(record)
         return status
 
-    def build(self) -> dict:
-        stats = {
-            "total": len(self.entries),
-            "ok": 0,
-            "warning": 0,
-            "error": 0,
-            "by_issue_type": defaultdict(int),
-        }
-        for e in self.entries:
-            if e["status"] == "OK":
-                stats["ok"] += 1
-            elif e["status"] == "WARNING":
-                stats["warning"] += 1
-            else:
-                stats["error"] += 1
-            for iss in e["issues"]:
-                stats["by_issue_type"][iss["type"]] += 1
+    def restore_entry(self, record: dict):
+        """续跑时直接放回检查点中的条目记录。"""
+        self._add(record)
+        return record["status"]
+
+    def _add(self, record: dict):
+        stats = self.stats
+        stats["total"] += 1
+        if record["status"] == "OK":
+            stats["ok"] += 1
+        elif record["status"] == "WARNING":
+            stats["warning"] += 1
+        else:
+            stats["error"] += 1
+            self.error_keys.append(record["citekey"])
+        for iss in record["issues"]:
+            stats["by_issue_type"][iss["type"]] += 1
+        self.last_record = record
+        record = shape_record(record, self.detail, self.top_k)
+        for sink in self.sinks:
+            sink.write(record)
+        if self.keep_entries:
+            self.entries.append(record)
 
+    def build(self) -> dict:
         return {
             "entries": self.entries,
             "file_issues": self.file_issues,
-            "stats": stats,
+            "stats": self.stats,
         }
 
+    def finish(self, report: dict):
+        """写完流式输出的尾部（file_issues、stats 等）并关闭。"""
+        for sink in self.sinks:
+            sink.close(report)
+
+
+def open_report_builder(
+    json_path: str,
+    csv_path: str,
+    detail: str = "full",
+    top_k: int = 3,
+    columnar: str = None,
+    bibfile: str = "",
+) -> ReportBuilder:
+    """check/fix/autofix 共用：流式写出 report.json / .csv / .jsonl，columnar 为 parquet/arrow 时另写列式文件。"""
+    stem = os.path.splitext(json_path)[0]
+    sinks = []
+    if columnar:
+        # 先建列式写出器：缺少 pyarrow 时在写任何文件前退出
+        from .columnar import ColumnarReportWriter
+
+        run_id = time.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+        sinks.append(ColumnarReportWriter(f"{stem}.{columnar}", columnar, run_id=run_id, bibfile=bibfile))
+    sinks[:0] = [JsonReportWriter(json_path), CsvReportWriter(csv_path), JsonlReportWriter(stem + ".jsonl")]
+    return ReportBuilder(sinks=sinks, keep_entries=False, detail=detail, top_k=top_k)
+
+
+def shape_record(record: dict, detail: str = "full", top_k: int = 3) -> dict:
+    """按详略级别裁剪条目记录（不修改原记录）。
+
+    - full：原样；
+    - topk：candidate_matches 只保留置信度最高的 top_k 个，问题 details 中的候选同样截断，
+      CANDIDATE_FOUND_NO_DOI 的 details 只留精简字段；
+    - summary：不含候选列表，online 只留解析结果摘要与 candidate_count，问题 details 中的候选替换为数量。
+    """
+    if detail == "full":
+        return record
+    online = record.get("online") or {}
+    candidates = online.get("candidate_matches") or []
+    if detail == "topk":
+        shaped_online = dict(online, candidate_matches=candidates[:top_k])
+    else:
+        shaped_online = {k: online[k] for k in _SUMMARY_ONLINE_KEYS if k in online}
+        shaped_online["resolved"] = _brief(online.get("resolved"))
+        shaped_online["candidate_count"] = len(candidates)
+    issues = [_shape_issue(i, detail, top_k) for i in record.get("issues", [])]
+    return dict(record, online=shaped_online, issues=issues)
+
+
+def _shape_issue(issue: dict, detail: str, top_k: int) -> dict:
+    details = issue.get("details")
+    if not isinstance(details, dict):
+        return issue
+    if issue.get("type") == "CANDIDATE_FOUND_NO_DOI":
+        return dict(issue, details=_brief(details))
+    if isinstance(details.get("candidates"), list):
+        cands = details["candidates"]
+        if detail == "topk":
+            shaped = dict(details, candidates=cands[:top_k])
+        else:
+            shaped = {k: v for k, v in details.items() if k != "candidates"}
+            shaped["candidate_count"] = len(cands)
+        return dict(issue, details=shaped)
+    return issue
+
+
+def _brief(candidate):
+    if not candidate:
+        return candidate
+    return {k: candidate.get(k) for k in _CANDIDATE_BRIEF_KEYS if candidate.get(k) is not None}
+
 
 def _status_from_issues(issues: List[dict]) -> str:
     severities = [i["severity"] for i in issues]
@@ -83,18 +186,90 @@ def write_json_report(report: dict, path: str):
         json.dump(report, f, ensure_ascii=False, indent=2, default=_default_serializer)
 
 
+CSV_HEADER = ["citekey", "status", "issue_types", "issue_messages", "doi", "title", "year"]
+
+
+def _csv_row(e: dict) -> list:
+    issue_types = ";".join(i["type"] for i in e["issues"])
+    issue_messages = ";".join(i["message"] for i in e["issues"])
+    fs = e["fields_summary"]
+    return [e["citekey"], e["status"], issue_types, issue_messages, fs["doi"], fs["title"], fs["year"]]
+
+
 def write_csv_report(report: dict, path: str):
     with open(path, "w", encoding="utf-8", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow(["citekey", "status", "issue_types", "issue_messages", "doi", "title", "year"])
+        writer.writerow(CSV_HEADER)
         for e in report["entries"]:
-            issue_types = ";".join(i["type"] for i in e["issues"])
-            issue_messages = ";".join(i["message"] for i in e["issues"])
-            fs = e["fields_summary"]
-            writer.writerow([e["citekey"], e["status"], issue_types, issue_messages, fs["doi"], fs["title"], fs["year"]])
+            writer.writerow(_csv_row(e))
+
+
+class _StreamingWriter(ABC):
+    """先写到 path.tmp，close 时原子替换，避免中断后留下半截报告。子类实现 write 写出单条记录。"""
+
+    def __init__(self, path: str, newline=None):
+        self.path = path
+        self._tmp = path + ".tmp"
+        self._file = open(self._tmp, "w", encoding="utf-8", newline=newline)
+
+    @abstractmethod
+    def write(self, record: dict):
+        ...
+
+    def _finish(self, report: dict):
+        pass
+
+    def close(self, report: dict):
+        self._finish(report)
+        self._file.close()
+        os.replace(self._tmp, self.path)
+
+
+class JsonReportWriter(_StreamingWriter):
+    """流式写出 report.json，输出与 write_json_report 逐字节一致。"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._count = 0
+
+    def write(self, record: dict):
+        self._file.write('{\n  "entries": [\n' if not self._count else ",\n")
+        self._file.write(_indent(json.dumps(record, ensure_ascii=False, indent=2, default=_default_serializer), 4))
+        self._count += 1
+
+    def _finish(self, report: dict):
+        self._file.write('{\n  "entries": []' if not self._count else "\n  ]")
+        for key, value in report.items():
+            if key == "entries":
+                continue
+            body = json.dumps(value, ensure_ascii=False, indent=2, default=_default_serializer)
+            self._file.write(f",\n  {json.dumps(key, ensure_ascii=False)}: " + _indent(body, 2)[2:])
+        self._file.write("\n}")
+
+
+class CsvReportWriter(_StreamingWriter):
+    def __init__(self, path: str):
+        super().__init__(path, newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_HEADER)
+
+    def write(self, record: dict):
+        self._writer.writerow(_csv_row(record))
+
+
+class JsonlReportWriter(_StreamingWriter):
+    """每行一条条目记录，便于逐行处理大报告。"""
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=_default_serializer) + "\n")
+
+
+def _indent(text: str, n: int) -> str:
+    pad = " " * n
+    return "\n".join(pad + line for line in text.split("\n"))
 
 
-def print_summary(report: dict):
+def print_summary(report: dict, error_keys: List[str] = None):
     stats = report["stats"]
     print("====== BibCheck 汇总 ======")
     print(f"总条目数: {stats['total']}")
@@ -103,10 +278,13 @@ def print_summary(report: dict):
         print(f"文件级问题: {len(report['file_issues'])}")
         for iss in report["file_issues"]:
             print(f"  {iss['type']}: {iss['message']}")
+    for source, info in (report.get("degraded_sources") or {}).items():
+        print(f"降级数据源: {source}（熔断 {info['trips']} 次，跳过 {info['short_circuited']} 次调用，最近错误: {info['last_error']}）")
     print("按错误类型计数:")
     for k, v in stats["by_issue_type"].items():
         print(f"  {k}: {v}")
-    error_keys = [e["citekey"] for e in report["entries"] if e["status"] == "ERROR"]
+    if error_keys is None:
+        error_keys = [e["citekey"] for e in report["entries"] if e["status"] == "ERROR"]
     if error_keys:
         print("ERROR citekey 列表:")
         print(", ".join(error_keys))
@@ -0,0 +1,98 @@
+import threading
+from copy import deepcopy
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .metrics import cache_source
+from .sources.http import DeadlineExceeded
+
+
+class _Call:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """按缓存 key 合并相同的在线查询（single-flight）。
+
+    - 并发的相同 key 只发出一次请求，其余调用等待并共享结果；
+    - 预规划（expect）阶段登记被多个条目共享的 key，结果在本次运行内保留，
+      直到最后一个使用者取走，负结果（None/空列表）同样复用；
+    - 每个调用者拿到结果的深拷贝，避免条目之间互相改写候选字典；
+    - 传入 remaining（如 SourceHTTP.remaining）时，等待者只按自己线程的剩余时限等待；
+      发起者因自身时限超时（DeadlineExceeded）时，仍有余量的等待者重新发起查询。
+    """
+
+    def __init__(self, remaining: Optional[Callable[[], Optional[float]]] = None):
+        self._remaining = remaining
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._pending: Dict[str, int] = {}
+        self._results: Dict[str, Any] = {}
+        self.stats = {"executed": 0, "coalesced": 0, "reused": 0}
+
+    def expect(self, keys: Iterable[str]) -> None:
+        """登记预计的查询；同一 key 出现多次即表示会被多个条目共享。"""
+        with self._lock:
+            for key in keys:
+                self._pending[key] = self._pending.get(key, 0) + 1
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                if key in self._results:
+                    self.stats["reused"] += 1
+                    return deepcopy(self._take(key))
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = _Call()
+                    self._calls[key] = call
+                    self.stats["executed"] += 1
+                else:
+                    self.stats["coalesced"] += 1
+            if leader:
+                return self._lead(key, call, fn)
+            if not call.event.wait(self._budget()):
+                raise DeadlineExceeded(cache_source(key), "deadline exceeded waiting for shared lookup")
+            if isinstance(call.error, DeadlineExceeded) and self._budget() != 0:
+                # 发起者的时限与本线程无关，本线程仍有余量时重新查询
+                continue
+            if call.error is not None:
+                raise call.error
+            return deepcopy(call.value)
+
+    def _budget(self) -> Optional[float]:
+        remaining = self._remaining() if self._remaining is not None else None
+        return None if remaining is None else max(remaining, 0.0)
+
+    def _lead(self, key: str, call: _Call, fn: Callable[[], Any]) -> Any:
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                if call.error is None and self._pending.get(key, 0) > 1:
+                    self._results[key] = call.value
+                self._consume(key)
+            call.event.set()
+        return deepcopy(call.value)
+
+    def _take(self, key: str) -> Any:
+        value = self._results[key]
+        self._consume(key)
+        return value
+
+    def _consume(self, key: str) -> None:
+        remaining = self._pending.get(key, 0) - 1
+        if remaining > 0:
+            self._pending[key] = remaining
+            return
+        self._pending.pop(key, None)
+        self._results.pop(key, None)
@@ -1,25 +1,51 @@
 import re
-import time
 import xml.etree.ElementTree as ET
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 import requests
 
+from ..singleflight import SingleFlight
+from .http import SourceHTTP
+
 
 ARXIV_ID_RE = re.compile(r"arxiv\.org/(abs|pdf)/([^?#\s]+)", flags=re.I)
+ARXIV_VERSION_RE = re.compile(r"v\d+$")
+ATOM_NS = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+# 单次 id_list 请求的 ID 数，避免 URL 过长
+BATCH_SIZE = 100
+_MISS = object()
 
 
 class ArxivClient:
-    def __init__(self, session: requests.Session, cache, rate_limiter):
+    DEFAULT_BASE = "http://export.arxiv.org/api/query"
+
+    def __init__(
+        self,
+        session: requests.Session,
+        cache,
+        rate_limiter,
+        flight: Optional[SingleFlight] = None,
+        base: Optional[str] = None,
+        http: Optional[SourceHTTP] = None,
+    ):
         self.session = session
         self.cache = cache
         self.rate_limiter = rate_limiter
-        self.base = "http://export.arxiv.org/api/query"
+        self.flight = flight or SingleFlight()
+        self.base = (base or self.DEFAULT_BASE).rstrip("/")
+        self.http = http or SourceHTTP(session)
+
+    def id_key(self, arxiv_id: str) -> str:
+        return f"arxiv:id:{arxiv_id}"
 
     def fetch_by_id(self, arxiv_id: str) -> Optional[Dict]:
-        cache_key = f"arxiv:id:{arxiv_id}"
-        cached = self.cache.get(cache_key)
-        if cached is not None:
+        cache_key = self.id_key(arxiv_id)
+        return self.flight.do(cache_key, lambda: self._fetch_by_id(cache_key, arxiv_id))
+
+    def _fetch_by_id(self, cache_key: str, arxiv_id: str) -> Optional[Dict]:
+        # 负结果（None）同样缓存，与 fetch_many 的写入一致
+        cached = self.cache.get(cache_key, _MISS)
+        if cached is not _MISS:
             return cached
         self.rate_limiter("arxiv")
         data = self._request(self.base, params={"id_list": arxiv_id})
@@ -27,15 +53,52 @@ class ArxivClient:
         self.cache.set(cache_key, parsed)
         return parsed
 
+    def fetch_many(self, arxiv_ids: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """批量获取：未缓存的 ID 按 BATCH_SIZE 合并为一次 id_list 请求，结果逐个写入与 fetch_by_id 相同的缓存 key。
+
+        请求失败（SourceUnavailable）向上抛出，不写缓存；返回 ID -> 元数据（未找到为 None）。
+        """
+        results: Dict[str, Optional[Dict]] = {}
+        missing = []
+        for arxiv_id in dict.fromkeys(arxiv_ids):
+            cached = self.cache.get(self.id_key(arxiv_id), _MISS)
+            if cached is _MISS:
+                missing.append(arxiv_id)
+            else:
+                results[arxiv_id] = cached
+        for start in range(0, len(missing), BATCH_SIZE):
+            chunk = missing[start:start + BATCH_SIZE]
+            self.rate_limiter("arxiv")
+            data = self._request(self.base, params={"id_list": ",".join(chunk), "max_results": len(chunk)})
+            if not data:
+                # 整批失败时不写负缓存，留给逐条查询
+                continue
+            by_id = self._parse_feed(data)
+            for arxiv_id in chunk:
+                # 请求不带版本号时 arXiv 返回最新版本的 ID
+                parsed = by_id.get(arxiv_id) or by_id.get(ARXIV_VERSION_RE.sub("", arxiv_id))
+                self.cache.set(self.id_key(arxiv_id), parsed)
+                results[arxiv_id] = parsed
+        return results
+
     def _parse_atom(self, text: str) -> Optional[Dict]:
-        try:
-            root = ET.fromstring(text)
-        except ET.ParseError:
-            return None
-        ns = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
-        entry = root.find("atom:entry", ns)
-        if entry is None:
-            return None
+        root = _parse_xml(text)
+        entry = root.find("atom:entry", ATOM_NS) if root is not None else None
+        return self._parse_entry(entry) if entry is not None else None
+
+    def _parse_feed(self, text: str) -> Dict[str, Dict]:
+        """解析 id_list 响应中的全部条目，按带版本与不带版本的 ID 建索引。"""
+        root = _parse_xml(text)
+        by_id: Dict[str, Dict] = {}
+        for entry in root.findall("atom:entry", ATOM_NS) if root is not None else []:
+            parsed = self._parse_entry(entry)
+            if parsed and parsed.get("id"):
+                by_id[parsed["id"]] = parsed
+                by_id.setdefault(ARXIV_VERSION_RE.sub("", parsed["id"]), parsed)
+        return by_id
+
+    def _parse_entry(self, entry: ET.Element) -> Optional[Dict]:
+        ns = ATOM_NS
         title = (entry.findtext("atom:title", default="", namespaces=ns) or "").strip()
         if not title:
             return None
@@ -66,19 +129,11 @@ class ArxivClient:
         }
 
     def _request(self, url: str, params: Dict = None):
-        backoff = 0.5
-        for _ in range(3):
-            try:
-                resp = self.session.get(url, params=params, timeout=10)
-                if resp.status_code == 404:
-                    return None
-                if resp.status_code >= 500:
-                    time.sleep(backoff)
-                    backoff *= 2
-                    continue
-                resp.raise_for_status()
-                return resp.text
-            except requests.RequestException:
-                time.sleep(backoff)
-                backoff *= 2
+        return self.http.get("arxiv", url, params, as_text=True)
+
+
+def _parse_xml(text: str) -> Optional[ET.Element]:
+    try:
+        return ET.fromstring(text)
+    except ET.ParseError:
         return None
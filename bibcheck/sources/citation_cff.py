@@ -1,25 +1,46 @@
-import time
 from typing import Dict, Optional
 
 import requests
 import yaml
 
+from ..singleflight import SingleFlight
+from .http import SourceHTTP
+
 
 class CitationCffClient:
-    def __init__(self, session: requests.Session, cache, rate_limiter):
+    DEFAULT_BASE = "https://raw.githubusercontent.com"
+
+    def __init__(
+        self,
+        session: requests.Session,
+        cache,
+        rate_limiter,
+        flight: Optional[SingleFlight] = None,
+        base: Optional[str] = None,
+        http: Optional[SourceHTTP] = None,
+    ):
         self.session = session
         self.cache = cache
         self.rate_limiter = rate_limiter
+        self.flight = flight or SingleFlight()
+        self.base = (base or self.DEFAULT_BASE).rstrip("/")
+        self.http = http or SourceHTTP(session)
+
+    def repo_key(self, owner: str, repo: str) -> str:
+        return f"citationcff:{owner}/{repo}"
 
     def fetch_by_repo(self, owner: str, repo: str) -> Dict[str, Optional[Dict]]:
-        cache_key = f"citationcff:{owner}/{repo}"
+        cache_key = self.repo_key(owner, repo)
+        return self.flight.do(cache_key, lambda: self._fetch_by_repo(cache_key, owner, repo))
+
+    def _fetch_by_repo(self, cache_key: str, owner: str, repo: str) -> Dict[str, Optional[Dict]]:
         cached = self.cache.get(cache_key)
         if cached is not None:
             return cached
 
         result = {"status": "missing", "candidate": None}
         for branch in ("main", "master"):
-            url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/CITATION.cff"
+            url = f"{self.base}/{owner}/{repo}/{branch}/CITATION.cff"
             self.rate_limiter("citation_cff")
             data = self._request(url)
             if data is None:
@@ -64,19 +85,4 @@ class CitationCffClient:
         }
 
     def _request(self, url: str) -> Optional[str]:
-        backoff = 0.5
-        for _ in range(3):
-            try:
-                resp = self.session.get(url, timeout=10)
-                if resp.status_code == 404:
-                    return None
-                if resp.status_code >= 500:
-                    time.sleep(backoff)
-                    backoff *= 2
-                    continue
-                resp.raise_for_status()
-                return resp.text
-            except requests.RequestException:
-                time.sleep(backoff)
-                backoff *= 2
-        return None
+        return self.http.get("citation_cff", url, as_text=True)
@@ -1,22 +1,45 @@
-import time
 from typing import Dict, List, Optional
 
 import requests
 
+from ..singleflight import SingleFlight
+from .http import SourceHTTP
+
 
 class DblpClient:
-    def __init__(self, session: requests.Session, cache, rate_limiter):
+    DEFAULT_BASE = "https://dblp.org/search/publ/api"
+
+    def __init__(
+        self,
+        session: requests.Session,
+        cache,
+        rate_limiter,
+        flight: Optional[SingleFlight] = None,
+        base: Optional[str] = None,
+        http: Optional[SourceHTTP] = None,
+    ):
         self.session = session
         self.cache = cache
         self.rate_limiter = rate_limiter
-        self.base = "https://dblp.org/search/publ/api"
+        self.flight = flight or SingleFlight()
+        self.base = (base or self.DEFAULT_BASE).rstrip("/")
+        self.http = http or SourceHTTP(session)
+
+    def doi_key(self, doi: str) -> str:
+        return self.search_key(doi)
+
+    def search_key(self, norm_title: str, year: str = None, first_author: str = None) -> str:
+        return f"dblp:search:{norm_title}:{year}:{first_author}"
 
     def fetch_by_doi(self, doi: str) -> Optional[Dict]:
         results = self.search(doi, year=None, first_author=None)
         return results[0] if results else None
 
     def search(self, norm_title: str, year: str = None, first_author: str = None) -> List[Dict]:
-        cache_key = f"dblp:search:{norm_title}:{year}:{first_author}"
+        cache_key = self.search_key(norm_title, year, first_author)
+        return self.flight.do(cache_key, lambda: self._search(cache_key, norm_title, year, first_author))
+
+    def _search(self, cache_key: str, norm_title: str, year: str = None, first_author: str = None) -> List[Dict]:
         cached = self.cache.get(cache_key)
         if cached is not None:
             return cached
@@ -64,19 +87,4 @@ class DblpClient:
         }
 
     def _request(self, url: str, params: Dict = None):
-        backoff = 0.5
-        for _ in range(3):
-            try:
-                resp = self.session.get(url, params=params, timeout=10)
-                if resp.status_code == 404:
-                    return None
-                if resp.status_code >= 500:
-                    time.sleep(backoff)
-                    backoff *= 2
-                    continue
-                resp.raise_for_status()
-                return resp.json()
-            except requests.RequestException:
-                time.sleep(backoff)
-                backoff *= 2
-        return None
+        return self.http.get("dblp", url, params)
@@ -0,0 +1,287 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+
+from ..metrics import Metrics
+
+
+class SourceUnavailable(Exception):
+    """数据源暂不可用（重试耗尽、超出总时限或熔断打开），区别于“查无结果”。
+
+    客户端不捕获该异常，因此失败不会被当作空结果写入缓存。
+    """
+
+    kind = "unavailable"
+
+    def __init__(self, source: str, reason: str):
+        super().__init__(f"{source}: {reason}")
+        self.source = source
+        self.reason = reason
+
+
+class DeadlineExceeded(SourceUnavailable):
+    """超出调用方设定的条目/运行时限（SourceHTTP.deadline），不计入熔断失败。"""
+
+    kind = "timeout"
+
+
+@dataclass
+class RetryPolicy:
+    """各数据源共用的重试策略。
+
+    - 5xx / 连接错误：指数退避 base_delay * multiplier^n（上限 max_delay），按 jitter 比例随机缩短；
+    - 429：优先遵守 Retry-After（上限 max_retry_after），单独计数 rate_limit_retries 次；
+    - 其他 4xx 不重试；单次调用（含重试与等待）不超过 deadline 秒。
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    multiplier: float = 2.0
+    max_delay: float = 8.0
+    jitter: float = 0.5
+    rate_limit_retries: int = 3
+    max_retry_after: float = 20.0
+    deadline: float = 30.0
+    timeout: float = 10.0
+    seed: Optional[int] = None
+    _rng: random.Random = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def backoff(self, failures: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** max(0, failures - 1))
+        return delay * (1.0 - self.jitter * self._rng.random())
+
+    def retry_after(self, resp: requests.Response, throttles: int) -> float:
+        delay = _parse_retry_after(resp.headers.get("Retry-After"))
+        if delay is None:
+            delay = self.backoff(throttles)
+        return min(delay, self.max_retry_after)
+
+
+class CircuitBreaker:
+    """单个数据源的熔断器：连续 threshold 次调用失败后打开，reset_timeout 秒后放行一次试探。"""
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 60.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self.short_circuited = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """只读判断：打开且未到试探时间。"""
+        with self._lock:
+            return self.state == "open" and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def release_probe(self) -> None:
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self, reason: str) -> bool:
+        """记录一次失败的调用，返回是否因此（重新）打开。"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = reason
+            if self.state == "half_open" or self.failures >= self.threshold:
+                opened = self.state != "open"
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probing = False
+                if opened:
+                    self.trips += 1
+                return opened
+            return False
+
+
+class CircuitBreakers:
+    def __init__(self, threshold: int = 5, reset_timeout: float = 60.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(source)
+            if breaker is None:
+                breaker = self._breakers[source] = CircuitBreaker(self.threshold, self.reset_timeout)
+            return breaker
+
+    def is_open(self, source: str) -> bool:
+        breaker = self._breakers.get(source)
+        return breaker is not None and breaker.is_open()
+
+    def degraded(self) -> Dict[str, dict]:
+        """本次运行中熔断过的数据源，写入报告的 degraded_sources。"""
+        return {
+            source: {
+                "state": b.state,
+                "trips": b.trips,
+                "short_circuited": b.short_circuited,
+                "last_error": b.last_error,
+            }
+            for source, b in sorted(self._breakers.items())
+            if b.trips
+        }
+
+
+class SourceHTTP:
+    """各数据源客户端共用的 GET 执行器：重试策略 + 按数据源熔断 + 指标。
+
+    返回解析后的 JSON（或文本）；404 及其他非 429 的 4xx 返回 None；
+    无法得到答复时抛 SourceUnavailable。
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        policy: Optional[RetryPolicy] = None,
+        metrics: Optional[Metrics] = None,
+        breakers: Optional[CircuitBreakers] = None,
+    ):
+        self.session = session
+        self.policy = policy or RetryPolicy()
+        self.metrics = metrics
+        self.breakers = breakers or CircuitBreakers()
+        self._local = threading.local()
+
+    @contextmanager
+    def deadline(self, at: Optional[float]):
+        """在当前线程内为所有数据源调用设置截止时刻（time.monotonic），可嵌套，取最早者。"""
+        outer = getattr(self._local, "deadline", None)
+        if at is not None and outer is not None:
+            at = min(at, outer)
+        self._local.deadline = at if at is not None else outer
+        try:
+            yield
+        finally:
+            self._local.deadline = outer
+
+    def remaining(self) -> Optional[float]:
+        at = getattr(self._local, "deadline", None)
+        return None if at is None else at - time.monotonic()
+
+    def get(self, source: str, url: str, params: Dict = None, as_text: bool = False):
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(source, "deadline exceeded")
+        breaker = self.breakers.get(source)
+        if not breaker.allow():
+            self._event("observe_short_circuit", source)
+            raise SourceUnavailable(source, "circuit open")
+        try:
+            result = self._get_with_retries(source, url, params, as_text)
+        except DeadlineExceeded:
+            # 时限是调用方的预算，不代表数据源故障；半开试探的名额需要归还
+            breaker.release_probe()
+            raise
+        except SourceUnavailable as exc:
+            if breaker.record_failure(exc.reason):
+                self._event("observe_breaker_open", source)
+            raise
+        breaker.record_success()
+        return result
+
+    def _get_with_retries(self, source: str, url: str, params: Optional[Dict], as_text: bool):
+        policy = self.policy
+        deadline = time.monotonic() + policy.deadline
+        caller_deadline = getattr(self._local, "deadline", None)
+        exceeded = SourceUnavailable
+        if caller_deadline is not None and caller_deadline < deadline:
+            deadline, exceeded = caller_deadline, DeadlineExceeded
+        failures = throttles = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise exceeded(source, "deadline exceeded")
+            started = time.perf_counter()
+            try:
+                resp = self.session.get(url, params=params, timeout=min(policy.timeout, remaining))
+            except requests.RequestException as exc:
+                self._observe(source, started, type(exc).__name__, 0)
+                if time.monotonic() >= deadline:
+                    raise exceeded(source, f"{type(exc).__name__}; deadline exceeded")
+                failures += 1
+                reason = type(exc).__name__
+                delay = policy.backoff(failures) if failures < policy.attempts else None
+            else:
+                self._observe(source, started, resp.status_code, len(resp.content or b""))
+                status = resp.status_code
+                if status == 429:
+                    throttles += 1
+                    reason = "429 too many requests"
+                    delay = policy.retry_after(resp, throttles) if throttles <= policy.rate_limit_retries else None
+                elif status >= 500:
+                    failures += 1
+                    reason = f"{status} server error"
+                    delay = policy.backoff(failures) if failures < policy.attempts else None
+                elif status >= 400:
+                    return None
+                else:
+                    try:
+                        return resp.text if as_text else resp.json()
+                    except ValueError:
+                        failures += 1
+                        reason = "invalid response body"
+                        delay = policy.backoff(failures) if failures < policy.attempts else None
+            if delay is None:
+                raise SourceUnavailable(source, reason)
+            if time.monotonic() + delay >= deadline:
+                raise exceeded(source, f"{reason}; deadline exceeded")
+            if self.metrics is not None:
+                self.metrics.observe_retry(source, delay)
+            time.sleep(delay)
+
+    def _observe(self, source: str, started: float, status, nbytes: int) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_request(source, time.perf_counter() - started, status, nbytes)
+
+    def _event(self, name: str, source: str) -> None:
+        if self.metrics is not None:
+            getattr(self.metrics, name)(source)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 可以是秒数或 HTTP 日期。"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
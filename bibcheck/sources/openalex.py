@@ -1,18 +1,41 @@
-import time
 from typing import Dict, List, Optional
 
 import requests
 
+from ..singleflight import SingleFlight
+from .http import SourceHTTP
+
 
 class OpenAlexClient:
-    def __init__(self, session: requests.Session, cache, rate_limiter):
+    DEFAULT_BASE = "https://api.openalex.org/works"
+
+    def __init__(
+        self,
+        session: requests.Session,
+        cache,
+        rate_limiter,
+        flight: Optional[SingleFlight] = None,
+        base: Optional[str] = None,
+        http: Optional[SourceHTTP] = None,
+    ):
         self.session = session
         self.cache = cache
         self.rate_limiter = rate_limiter
-        self.base = "https://api.openalex.org/works"
+        self.flight = flight or SingleFlight()
+        self.base = (base or self.DEFAULT_BASE).rstrip("/")
+        self.http = http or SourceHTTP(session)
+
+    def doi_key(self, doi: str) -> str:
+        return f"openalex:doi:{doi}"
+
+    def search_key(self, norm_title: str, year: str = None, first_author: str = None) -> str:
+        return f"openalex:search:{norm_title}:{year}:{first_author}"
 
     def fetch_by_doi(self, doi: str) -> Optional[Dict]:
-        cache_key = f"openalex:doi:{doi}"
+        cache_key = self.doi_key(doi)
+        return self.flight.do(cache_key, lambda: self._fetch_by_doi(cache_key, doi))
+
+    def _fetch_by_doi(self, cache_key: str, doi: str) -> Optional[Dict]:
         cached = self.cache.get(cache_key)
         if cached:
             return cached
@@ -27,7 +50,10 @@ class OpenAlexClient:
         return None
 
     def search(self, norm_title: str, year: str = None, first_author: str = None) -> List[Dict]:
-        cache_key = f"openalex:search:{norm_title}:{year}:{first_author}"
+        cache_key = self.search_key(norm_title, year, first_author)
+        return self.flight.do(cache_key, lambda: self._search(cache_key, norm_title, year, first_author))
+
+    def _search(self, cache_key: str, norm_title: str, year: str = None, first_author: str = None) -> List[Dict]:
         cached = self.cache.get(cache_key)
         if cached is not None:
             return cached
@@ -68,20 +94,5 @@ class OpenAlexClient:
         return {"source": "openalex", "doi": doi, "title": title, "year": year, "venue": venue, "authors": authors, "url": item.get("id")}
 
     def _request(self, url: str, params: Dict = None):
-        backoff = 0.5
-        for _ in range(3):
-            try:
-                resp = self.session.get(url, params=params, timeout=10)
-                if resp.status_code == 404:
-                    return None
-                if resp.status_code >= 500:
-                    time.sleep(backoff)
-                    backoff *= 2
-                    continue
-                resp.raise_for_status()
-                return resp.json()
-            except requests.RequestException:
-                time.sleep(backoff)
-                backoff *= 2
-        return None
+        return self.http.get("openalex", url, params)
 
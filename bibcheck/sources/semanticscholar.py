@@ -1,18 +1,41 @@
-import time
 from typing import Dict, List, Optional
 
 import requests
 
+from ..singleflight import SingleFlight
+from .http import SourceHTTP
+
 
 class SemanticScholarClient:
-    def __init__(self, session: requests.Session, cache, rate_limiter):
+    DEFAULT_BASE = "https://api.semanticscholar.org/graph/v1/paper"
+
+    def __init__(
+        self,
+        session: requests.Session,
+        cache,
+        rate_limiter,
+        flight: Optional[SingleFlight] = None,
+        base: Optional[str] = None,
+        http: Optional[SourceHTTP] = None,
+    ):
         self.session = session
         self.cache = cache
         self.rate_limiter = rate_limiter
-        self.base = "https://api.semanticscholar.org/graph/v1/paper"
+        self.flight = flight or SingleFlight()
+        self.base = (base or self.DEFAULT_BASE).rstrip("/")
+        self.http = http or SourceHTTP(session)
+
+    def doi_key(self, doi: str) -> str:
+        return f"s2:doi:{doi}"
+
+    def search_key(self, norm_title: str, year: str = None, first_author: str = None) -> str:
+        return f"s2:search:{norm_title}:{year}:{first_author}"
 
     def fetch_by_doi(self, doi: str) -> Optional[Dict]:
-        cache_key = f"s2:doi:{doi}"
+        cache_key = self.doi_key(doi)
+        return self.flight.do(cache_key, lambda: self._fetch_by_doi(cache_key, doi))
+
+    def _fetch_by_doi(self, cache_key: str, doi: str) -> Optional[Dict]:
         cached = self.cache.get(cache_key)
         if cached:
             return cached
@@ -27,13 +50,16 @@ class SemanticScholarClient:
         return None
 
     def search(self, norm_title: str, year: str = None, first_author: str = None) -> List[Dict]:
-        cache_key = f"s2:search:{norm_title}:{year}:{first_author}"
+        cache_key = self.search_key(norm_title, year, first_author)
+        return self.flight.do(cache_key, lambda: self._search(cache_key, norm_title, year, first_author))
+
+    def _search(self, cache_key: str, norm_title: str, year: str = None, first_author: str = None) -> List[Dict]:
         cached = self.cache.get(cache_key)
         if cached is not None:
             return cached
         params = {"query": norm_title, "limit": 5, "fields": "title,year,authors,venue,url,externalIds"}
         self.rate_limiter("s2")
-        url = "https://api.semanticscholar.org/graph/v1/paper/search"
+        url = f"{self.base}/search"
         data = self._request(url, params=params)
         results: List[Dict] = []
         if data and data.get("data"):
@@ -58,21 +84,6 @@ class SemanticScholarClient:
         return {"source": "s2", "doi": doi, "title": title, "year": str(year) if year else None, "venue": venue, "authors": authors, "url": item.get("url")}
 
     def _request(self, url: str, params: Dict = None):
-        backoff = 0.5
-        for _ in range(3):
-            try:
-                resp = self.session.get(url, params=params, timeout=10)
-                if resp.status_code == 404:
-                    return None
-                if resp.status_code >= 500:
-                    time.sleep(backoff)
-                    backoff *= 2
-                    continue
-                resp.raise_for_status()
-                return resp.json()
-            except requests.RequestException:
-                time.sleep(backoff)
-                backoff *= 2
-        return None
+        return self.http.get("s2", url, params)
 
 
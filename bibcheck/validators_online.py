@@ -1,3 +1,4 @@
+import threading
 import time
 import re
 from dataclasses import dataclass
@@ -6,19 +7,26 @@ from typing import Dict, List, Optional, Tuple
 import requests
 
 from .kind import classify_entry, extract_arxiv_id, extract_github_repo, get_field
-from .matching import compute_match_confidence
+from .matching import compute_match_confidences, title_score_matrix
 from .cache import HTTPCache
-from .normalize import normalize_authors, normalize_doi, normalize_title, normalize_venue, title_similarity, contains_cjk
+from .metrics import InstrumentedCache, Metrics
+from .query_planner import QueryPlanner
+from .singleflight import SingleFlight
+from .normalize import memoized, normalize_authors, normalize_doi, normalize_title, normalize_venue, title_similarity, contains_cjk
 from .sources.arxiv import ArxivClient
 from .sources.citation_cff import CitationCffClient
 from .sources.crossref import CrossrefClient
 from .sources.dblp import DblpClient
 from .sources.openalex import OpenAlexClient
 from .sources.semanticscholar import SemanticScholarClient
+from .sources.http import CircuitBreakers, DeadlineExceeded, RetryPolicy, SourceHTTP, SourceUnavailable
 
 Issue = Dict[str, object]
 Entry = Dict[str, object]
 
+# 在线数据源名，OnlineValidator.clients、base_urls 与限流均以此为键
+SOURCES = ("crossref", "openalex", "s2", "arxiv", "dblp", "citation_cff")
+
 
 @dataclass
 class OnlineValidatorConfig:
@@ -31,10 +39,27 @@ class OnlineValidatorConfig:
     enable_citation_cff: bool = True
     high_conf: float = 0.8
     mid_conf: float = 0.6
+    # 候选打分的 cdist 线程数；单条目只有几个候选，多线程启动开销大于计算，默认单线程
+    match_workers: int = 1
+    early_stop: bool = True
+    min_interval: float = 1.0
+    # 数据源 -> 覆盖的 API base（如指向本地 bibcheck.mockserver），未列出的沿用默认地址
+    base_urls: Dict[str, str] = None
+    # 重试策略与熔断：连续 breaker_threshold 次调用失败后该数据源熔断 breaker_reset 秒
+    retry: RetryPolicy = None
+    breaker_threshold: int = 5
+    breaker_reset: float = 60.0
+    # 单个条目全部在线查询的时限、整个运行（自创建校验器起）的时限，秒；None 表示不限
+    entry_timeout: Optional[float] = None
+    run_deadline: Optional[float] = None
 
     def __post_init__(self):
         if self.sources is None:
             self.sources = ["crossref", "openalex", "s2"]
+        if self.base_urls is None:
+            self.base_urls = {}
+        if self.retry is None:
+            self.retry = RetryPolicy()
 
 
 class OnlineValidator:
@@ -42,31 +67,125 @@ class OnlineValidator:
         self.config = config
         self.session = requests.Session()
         self.session.headers["User-Agent"] = config.user_agent
-        self.cache = cache or HTTPCache()
-        self.rate_marks = {
-            "crossref": 0.0,
-            "openalex": 0.0,
-            "s2": 0.0,
-            "arxiv": 0.0,
-            "dblp": 0.0,
-            "citation_cff": 0.0,
-        }
+        # 在线请求与缓存访问的按数据源统计，写入 report.json 的 metrics 段
+        self.metrics = Metrics()
+        self.cache = InstrumentedCache(cache or HTTPCache(), self.metrics)
+        self.rate_marks = {source: 0.0 for source in SOURCES}
+        self._rate_lock = threading.Lock()
+        # 记录当前线程的上一次查询是否真正发出了请求（缓存命中不经过限流）
+        self._sent = threading.local()
+        self.planner = QueryPlanner(self.cache)
+        self.http = SourceHTTP(
+            self.session, config.retry, self.metrics, CircuitBreakers(config.breaker_threshold, config.breaker_reset)
+        )
+        # 所有数据源共享一个 single-flight，相同缓存 key 的查询在本次运行内只发一次；
+        # 等待者按各自条目的剩余时限等待
+        self.flight = SingleFlight(remaining=self.http.remaining)
+        self.run_deadline_at = time.monotonic() + config.run_deadline if config.run_deadline is not None else None
+        bases = config.base_urls
         self.clients = {
-            "crossref": CrossrefClient(self.session, self.cache, self._rate_limit),
-            "openalex": OpenAlexClient(self.session, self.cache, self._rate_limit),
-            "s2": SemanticScholarClient(self.session, self.cache, self._rate_limit),
-            "arxiv": ArxivClient(self.session, self.cache, self._rate_limit),
-            "dblp": DblpClient(self.session, self.cache, self._rate_limit),
-            "citation_cff": CitationCffClient(self.session, self.cache, self._rate_limit),
+            "crossref": CrossrefClient(self.session, self.cache, self._rate_limit, self.flight, bases.get("crossref"), self.http),
+            "openalex": OpenAlexClient(self.session, self.cache, self._rate_limit, self.flight, bases.get("openalex"), self.http),
+            "s2": SemanticScholarClient(self.session, self.cache, self._rate_limit, self.flight, bases.get("s2"), self.http),
+            "arxiv": ArxivClient(self.session, self.cache, self._rate_limit, self.flight, bases.get("arxiv"), self.http),
+            "dblp": DblpClient(self.session, self.cache, self._rate_limit, self.flight, bases.get("dblp"), self.http),
+            "citation_cff": CitationCffClient(self.session, self.cache, self._rate_limit, self.flight, bases.get("citation_cff"), self.http),
         }
 
     def _rate_limit(self, source: str):
-        last = self.rate_marks.get(source, 0.0)
-        now = time.time()
-        elapsed = now - last
-        if elapsed < 1.0:
-            time.sleep(1.0 - elapsed)
-        self.rate_marks[source] = time.time()
+        self._sent.value = True
+        if self.http.breakers.is_open(source):
+            # 熔断中的数据源请求会被直接跳过，无需等待
+            return
+        # 并发调用时在锁内为每个请求预约发送时刻，锁外等待，同一数据源的请求间隔仍不小于 min_interval
+        with self._rate_lock:
+            now = time.time()
+            slot = max(now, self.rate_marks.get(source, 0.0) + self.config.min_interval)
+            wait = slot - now
+            if wait > 0:
+                remaining = self.http.remaining()
+                if remaining is not None and wait >= remaining:
+                    raise DeadlineExceeded(source, "deadline exceeded while rate limited")
+            self.rate_marks[source] = slot
+        if wait > 0:
+            self.metrics.observe_wait(source, wait)
+            time.sleep(wait)
+
+    def plan_lookups(self, entries: List[Entry]) -> Dict[str, int]:
+        """预扫描全部条目，登记每条将发出的查询 key。
+
+        多个条目共享的 key（同一 DOI/arXiv ID/规范化标题）只请求一次，结果保留到最后一个使用者。
+        返回计划查询数与去重后的查询数。
+        """
+        keys: List[str] = []
+        if not self.config.offline:
+            for entry in entries:
+                keys.extend(self._lookup_keys(entry))
+        self.flight.expect(keys)
+        return {"planned": len(keys), "unique": len(set(keys))}
+
+    def prefetch_arxiv(self, entries: List[Entry]) -> int:
+        """arXiv 的批量路径：将走 arXiv 查询的条目合并为 id_list 请求，结果写入缓存，逐条校验时直接命中。返回预取的 ID 数。"""
+        if self.config.offline or not self.config.enable_arxiv:
+            return 0
+        ids = []
+        for entry in entries:
+            if normalize_doi(get_field(entry, "doi")) or classify_entry(entry) != "preprint_arxiv":
+                continue
+            arxiv_id = extract_arxiv_id(entry)
+            if arxiv_id:
+                ids.append(arxiv_id)
+        if ids:
+            with self.http.deadline(self.run_deadline_at):
+                try:
+                    self.clients["arxiv"].fetch_many(ids)
+                except SourceUnavailable:
+                    # 预取失败不影响结果，逐条查询时按原路径重试/标记
+                    pass
+        return len(ids)
+
+    def cached_records(self, entry: Entry, cache=None) -> List[dict]:
+        """只读缓存、不发请求：按在线查询所用的规范化 key 取出该条目已缓存的 DOI / arXiv / 标题检索结果。"""
+        cache = cache if cache is not None else self.cache
+        keys: List[str] = []
+        doi = normalize_doi(get_field(entry, "doi"))
+        if doi:
+            keys.extend(self.clients[src].doi_key(doi) for src in self.config.sources if src in self.clients)
+        arxiv_id = extract_arxiv_id(entry)
+        if arxiv_id and self.config.enable_arxiv:
+            keys.append(self.clients["arxiv"].id_key(arxiv_id))
+        params = _search_params(entry)
+        if params[0]:
+            keys.extend(
+                self.clients[src].search_key(*params) for src in self._search_sources(classify_entry(entry)) if src in self.clients
+            )
+        records: List[dict] = []
+        for key in keys:
+            value = cache.get(key)
+            if isinstance(value, dict):
+                records.append(value)
+            elif isinstance(value, list):
+                records.extend(v for v in value if isinstance(v, dict))
+        return records
+
+    def _lookup_keys(self, entry: Entry) -> List[str]:
+        entry_kind = classify_entry(entry)
+        doi = normalize_doi(get_field(entry, "doi"))
+        if doi:
+            # 按顺序查询，首个命中即停止，这里只登记必然发出的第一个
+            for src in self.config.sources:
+                client = self.clients.get(src)
+                if client:
+                    return [client.doi_key(doi)]
+            return []
+        if entry_kind == "preprint_arxiv" and self.config.enable_arxiv:
+            arxiv_id = extract_arxiv_id(entry)
+            return [self.clients["arxiv"].id_key(arxiv_id)] if arxiv_id else []
+        if entry_kind == "software_github" and self.config.enable_citation_cff:
+            repo = extract_github_repo(entry)
+            return [self.clients["citation_cff"].repo_key(*repo.split("/", 1))] if repo else []
+        params = _search_params(entry)
+        return [self.clients[src].search_key(*params) for src in self._search_sources(entry_kind) if src in self.clients]
 
     def validate_entry(self, entry: Entry) -> Dict[str, object]:
         online_data = {
@@ -82,51 +201,80 @@ class OnlineValidator:
         online_data["checked"] = True
         entry_kind = classify_entry(entry)
         online_data["entry_kind"] = entry_kind
-        doi = normalize_doi(get_field(entry, "doi"))
-        issues: List[Issue] = []
-        resolved = None
-
-        if doi:
-            resolved, candidate_matches, issues = self._check_with_doi(entry, doi)
-            online_data["resolved"] = resolved
-            online_data["candidate_matches"] = candidate_matches
-            if resolved:
-                online_data["title_match_score"] = title_similarity(entry.get("title", ""), resolved.get("title", ""))
-        else:
-            if entry_kind == "preprint_arxiv" and self.config.enable_arxiv:
-                arxiv_id = extract_arxiv_id(entry)
-                resolved, candidate_matches, issues = self._check_with_arxiv(entry, arxiv_id)
-            elif entry_kind == "software_github" and self.config.enable_citation_cff:
-                repo = extract_github_repo(entry)
-                resolved, candidate_matches, issues = self._check_with_citation_cff(entry, repo)
-            else:
-                resolved, candidate_matches, issues = self._search_without_doi(entry, entry_kind)
-            online_data["resolved"] = resolved
-            online_data["candidate_matches"] = candidate_matches
-            if resolved:
-                online_data["title_match_score"] = title_similarity(entry.get("title", ""), resolved.get("title", ""))
+        # 本条目查询中未能得到答复的数据源 -> unavailable（重试耗尽/熔断）或 timeout（超出时限）
+        unavailable: Dict[str, str] = {}
+        deadline = self._entry_deadline()
+        if deadline is not None and deadline <= time.monotonic():
+            # 运行时限已到：不再发起查询，直接标记
+            online_data["timed_out"] = True
+            entry.setdefault("_online_issues", []).append(_unavailable_issue({"*": "timeout"}))
+            return online_data
+        with self.http.deadline(deadline):
+            resolved, candidate_matches, issues = self._lookup(entry, entry_kind, unavailable)
+        online_data["resolved"] = resolved
+        online_data["candidate_matches"] = candidate_matches
+        if resolved:
+            online_data["title_match_score"] = _resolved_title_score(entry, resolved)
+        if unavailable:
+            online_data["unavailable_sources"] = list(unavailable)
+        if "timeout" in unavailable.values():
+            online_data["timed_out"] = True
 
         entry.setdefault("_online_issues", []).extend(issues)
         return online_data
 
-    def _check_with_doi(self, entry: Entry, doi: str) -> Tuple[Optional[dict], List[dict], List[Issue]]:
+    def run_expired(self) -> bool:
+        return self.run_deadline_at is not None and time.monotonic() >= self.run_deadline_at
+
+    def _entry_deadline(self) -> Optional[float]:
+        limits = [self.run_deadline_at]
+        if self.config.entry_timeout is not None:
+            limits.append(time.monotonic() + self.config.entry_timeout)
+        limits = [d for d in limits if d is not None]
+        return min(limits) if limits else None
+
+    def _lookup(self, entry: Entry, entry_kind: str, unavailable: Dict[str, str]) -> Tuple[Optional[dict], List[dict], List[Issue]]:
+        doi = normalize_doi(get_field(entry, "doi"))
+        if doi:
+            return self._check_with_doi(entry, doi, unavailable)
+        if entry_kind == "preprint_arxiv" and self.config.enable_arxiv:
+            return self._check_with_arxiv(entry, extract_arxiv_id(entry), unavailable)
+        if entry_kind == "software_github" and self.config.enable_citation_cff:
+            return self._check_with_citation_cff(entry, extract_github_repo(entry), unavailable)
+        return self._search_without_doi(entry, entry_kind, unavailable)
+
+    def _check_with_doi(self, entry: Entry, doi: str, unavailable: Dict[str, str]) -> Tuple[Optional[dict], List[dict], List[Issue]]:
         issues: List[Issue] = []
         candidate_matches: List[dict] = []
         resolved = None
+        tried = 0
         for src in self.config.sources:
             client = self.clients.get(src)
             if not client:
                 continue
-            metadata = client.fetch_by_doi(doi)
+            tried += 1
+            try:
+                metadata = client.fetch_by_doi(doi)
+            except SourceUnavailable as exc:
+                unavailable[src] = exc.kind
+                continue
             if metadata:
                 resolved = metadata
                 break
+        if not resolved and tried and len(unavailable) == tried:
+            # 没有任何数据源给出答复，不能断言 DOI 不存在
+            issues.append(_unavailable_issue(unavailable))
+            return None, candidate_matches, issues
         if not resolved:
+            # 有数据源未答复时只能说明已答复的数据源没有该 DOI，降为 WARNING；
+            # 后续数据源已解析出 DOI 时，前面的失败不影响结论，不再提示
+            if unavailable:
+                issues.append(_unavailable_issue(unavailable, partial=True))
             issues.append(
                 {
                     "type": "DOI_NOT_FOUND",
-                    "severity": "ERROR",
-                    "message": f"在线数据源均未找到 DOI {doi}",
+                    "severity": "WARNING" if unavailable else "ERROR",
+                    "message": f"已答复的数据源均未找到 DOI {doi}" if unavailable else f"在线数据源均未找到 DOI {doi}",
                     "details": {},
                 }
             )
@@ -135,7 +283,7 @@ class OnlineValidator:
         issues.extend(self._compare_metadata(entry, resolved))
         return resolved, candidate_matches, issues
 
-    def _check_with_arxiv(self, entry: Entry, arxiv_id: Optional[str]) -> Tuple[Optional[dict], List[dict], List[Issue]]:
+    def _check_with_arxiv(self, entry: Entry, arxiv_id: Optional[str], unavailable: Dict[str, str]) -> Tuple[Optional[dict], List[dict], List[Issue]]:
         issues: List[Issue] = []
         candidate_matches: List[dict] = []
         if not arxiv_id:
@@ -149,7 +297,11 @@ class OnlineValidator:
             )
             return None, candidate_matches, issues
         client = self.clients.get("arxiv")
-        resolved = client.fetch_by_id(arxiv_id) if client else None
+        try:
+            resolved = client.fetch_by_id(arxiv_id) if client else None
+        except SourceUnavailable as exc:
+            unavailable["arxiv"] = exc.kind
+            return None, candidate_matches, [_unavailable_issue(unavailable)]
         if not resolved:
             issues.append(
                 {
@@ -165,7 +317,7 @@ class OnlineValidator:
         issues.extend(gate_issues)
         return resolved, candidate_matches, issues
 
-    def _check_with_citation_cff(self, entry: Entry, repo: Optional[str]) -> Tuple[Optional[dict], List[dict], List[Issue]]:
+    def _check_with_citation_cff(self, entry: Entry, repo: Optional[str], unavailable: Dict[str, str]) -> Tuple[Optional[dict], List[dict], List[Issue]]:
         issues: List[Issue] = []
         candidate_matches: List[dict] = []
         if not repo:
@@ -180,7 +332,11 @@ class OnlineValidator:
             return None, candidate_matches, issues
         owner, repo_name = repo.split("/", 1)
         client = self.clients.get("citation_cff")
-        result = client.fetch_by_repo(owner, repo_name) if client else {"status": "missing", "candidate": None}
+        try:
+            result = client.fetch_by_repo(owner, repo_name) if client else {"status": "missing", "candidate": None}
+        except SourceUnavailable as exc:
+            unavailable["citation_cff"] = exc.kind
+            return None, candidate_matches, [_unavailable_issue(unavailable)]
         if result.get("status") != "found":
             issues.append(
                 {
@@ -198,32 +354,66 @@ class OnlineValidator:
         issues.extend(gate_issues)
         return resolved, candidate_matches, issues
 
-    def _search_without_doi(self, entry: Entry, entry_kind: str) -> Tuple[Optional[dict], List[dict], List[Issue]]:
+    def _search_without_doi(self, entry: Entry, entry_kind: str, unavailable: Dict[str, str]) -> Tuple[Optional[dict], List[dict], List[Issue]]:
         issues: List[Issue] = []
         candidate_matches: List[dict] = []
-        norm_title = normalize_title(entry.get("title", ""))
-        authors = normalize_authors(entry.get("author", ""))
-        first_author = authors[0] if authors else ""
-        year = entry.get("year")
-
-        sources = list(self.config.sources)
-        if self.config.enable_dblp and entry_kind == "scholarly_cslike":
-            sources.append("dblp")
-        for src in sources:
+        norm_title, year, first_author = _search_params(entry)
+        # 逐源算出的标题分数与置信度，门控时直接复用
+        title_scores: List[float] = []
+        scored: List[Tuple[float, Dict[str, float]]] = []
+        tried = 0
+        for src in self.planner.order(entry_kind, self._search_sources(entry_kind)):
             client = self.clients.get(src)
             if not client:
                 continue
-            matches = client.search(norm_title, year, first_author)
-            for m in matches:
-                score = title_similarity(entry.get("title", ""), m.get("title", ""))
-                m["score"] = score
-                candidate_matches.append(m)
+            tried += 1
+            self._sent.value = False
+            started = time.perf_counter()
+            try:
+                matches = client.search(norm_title, year, first_author)
+            except SourceUnavailable as exc:
+                # 不计入查询规划统计，避免把故障当成“快速未命中”
+                unavailable[src] = exc.kind
+                continue
+            latency = time.perf_counter() - started
+            workers = self.config.match_workers
+            title_row = title_score_matrix([entry.get("title", "")], [m.get("title", "") for m in matches], workers=workers)[0]
+            confs = compute_match_confidences(entry, matches, workers=workers, title_scores=title_row)
+            candidate_matches.extend(matches)
+            title_scores.extend(title_row)
+            scored.extend(confs)
+            hit = any(conf >= self.config.high_conf for conf, _ in confs)
+            # 只统计真正发出请求的查询；缓存命中的耗时会让已缓存的数据源显得更快
+            if self._sent.value:
+                self.planner.record(entry_kind, src, latency, hit)
+            # 已有候选能通过高置信门控，后续数据源不会改变结论
+            if hit and self.config.early_stop:
+                break
 
-        resolved, candidate_matches, gate_issues = self._apply_confidence_gating(entry, candidate_matches, entry_kind)
+        if not candidate_matches and tried and len(unavailable) == tried:
+            return None, candidate_matches, [_unavailable_issue(unavailable)]
+        if unavailable:
+            issues.append(_unavailable_issue(unavailable, partial=True))
+        resolved, candidate_matches, gate_issues = self._apply_confidence_gating(
+            entry, candidate_matches, entry_kind, scores=(title_scores, scored)
+        )
+        for issue in gate_issues:
+            if unavailable and issue["type"] == "NOT_FOUND_ONLINE":
+                # 未答复的数据源可能有该条目，不能断言查无此文
+                issue["severity"] = "WARNING"
         issues.extend(gate_issues)
         return resolved, candidate_matches, issues
 
-    def _apply_confidence_gating(self, entry: Entry, candidates: List[dict], entry_kind: str) -> Tuple[Optional[dict], List[dict], List[Issue]]:
+    def _search_sources(self, entry_kind: str) -> List[str]:
+        sources = list(self.config.sources)
+        if self.config.enable_dblp and entry_kind == "scholarly_cslike":
+            sources.append("dblp")
+        return sources
+
+    def _apply_confidence_gating(
+        self, entry: Entry, candidates: List[dict], entry_kind: str, scores: Optional[Tuple[List[float], List[tuple]]] = None
+    ) -> Tuple[Optional[dict], List[dict], List[Issue]]:
+        """scores 为调用方已按 candidates 顺序算好的 (标题分数行, 置信度列表)，传入时不再重复计算。"""
         issues: List[Issue] = []
         if not candidates:
             if entry_kind in {"scholarly_doi", "preprint_arxiv", "scholarly_cslike", "unknown"}:
@@ -238,10 +428,15 @@ class OnlineValidator:
                 )
             return None, candidates, issues
 
-        for c in candidates:
+        if scores is not None:
+            title_row, scored = scores
+        else:
+            workers = self.config.match_workers
+            title_row = title_score_matrix([entry.get("title", "")], [c.get("title", "") for c in candidates], workers=workers)[0]
+            scored = compute_match_confidences(entry, candidates, workers=workers, title_scores=title_row)
+        for c, raw_title, (conf, components) in zip(candidates, title_row, scored):
             if "score" not in c:
-                c["score"] = title_similarity(entry.get("title", ""), c.get("title", ""))
-            conf, components = compute_match_confidence(entry, c)
+                c["score"] = int(raw_title)
             c["confidence"] = conf
             c["confidence_components"] = components
 
@@ -260,7 +455,7 @@ class OnlineValidator:
                         "details": best,
                     }
                 )
-            issues.extend(self._compare_metadata(entry, resolved))
+            issues.extend(self._compare_metadata(entry, resolved, title_score=best["score"]))
             return resolved, candidates, issues
 
         top_candidates = [
@@ -294,9 +489,9 @@ class OnlineValidator:
         )
         return None, candidates, issues
 
-    def _compare_metadata(self, entry: Entry, resolved: dict) -> List[Issue]:
+    def _compare_metadata(self, entry: Entry, resolved: dict, title_score: Optional[int] = None) -> List[Issue]:
         issues: List[Issue] = []
-        score = title_similarity(entry.get("title", ""), resolved.get("title", ""))
+        score = title_score if title_score is not None else title_similarity(entry.get("title", ""), resolved.get("title", ""))
         if score < 70:
             issues.append(
                 {
@@ -364,6 +559,41 @@ class OnlineValidator:
         return issues
 
 
+def _unavailable_issue(unavailable: Dict[str, str], partial: bool = False) -> Issue:
+    """partial 为真表示其余数据源已答复，结论只基于部分数据源。"""
+    sources = [src for src in unavailable if src != "*"]
+    outcome = "结果只基于已答复的数据源" if partial else "未能在线核验"
+    if "timeout" in unavailable.values():
+        where = f"（{', '.join(sources)}）" if sources else ""
+        return {
+            "type": "ONLINE_TIMEOUT",
+            "severity": "WARNING",
+            "message": f"在线查询超出时限{where}，{outcome}",
+            "details": {"sources": sources, "partial": partial},
+        }
+    return {
+        "type": "ONLINE_SOURCE_UNAVAILABLE",
+        "severity": "WARNING",
+        "message": f"数据源暂不可用（{', '.join(sources)}），{outcome}",
+        "details": {"sources": sources, "partial": partial},
+    }
+
+
+def _search_params(entry: Entry) -> Tuple[str, Optional[str], str]:
+    norm_title = normalize_title(entry.get("title", ""))
+    authors = normalize_authors(entry.get("author", ""))
+    first_author = authors[0] if authors else ""
+    return norm_title, entry.get("year"), first_author
+
+
+def _resolved_title_score(entry: Entry, resolved: dict) -> int:
+    """门控阶段已算过的 score 直接复用，避免再次规范化标题。"""
+    score = resolved.get("score")
+    if score is None:
+        score = title_similarity(entry.get("title", ""), resolved.get("title", ""))
+    return score
+
+
 def _authors_match(local: List[str], online: List[str]) -> bool:
     if not local or not online:
         return True
@@ -376,6 +606,7 @@ def _authors_match(local: List[str], online: List[str]) -> bool:
     return True
 
 
+@memoized
 def _surname(author: str) -> str:
     if "," in author:
         # 形如 "He, Kaiming" -> 取逗号前部分的最后一个词
@@ -386,16 +617,19 @@ def _surname(author: str) -> str:
     return parts[-1] if parts else author
 
 
+_VENUE_PAREN_RE = re.compile(r"\([^)]*\)")
+_VENUE_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+_VENUE_PREFIX_RE = re.compile(r"\bproceedings of the\b|\bproc\.?\b|\bconference on\b|\bieee\b|\bacm\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@memoized
 def _clean_venue(venue: str) -> str:
     v = venue.lower()
     # 去括号内容与年份
-    v = re.sub(r"\([^)]*\)", " ", v)
-    v = re.sub(r"\b(19|20)\d{2}\b", " ", v)
+    v = _VENUE_PAREN_RE.sub(" ", v)
+    v = _VENUE_YEAR_RE.sub(" ", v)
     # 去常见前缀
-    v = re.sub(r"\bproceedings of the\b", " ", v)
-    v = re.sub(r"\bproc\.?\b", " ", v)
-    v = re.sub(r"\bconference on\b", " ", v)
-    v = re.sub(r"\bieee\b", " ", v)
-    v = re.sub(r"\bacm\b", " ", v)
-    v = re.sub(r"\s+", " ", v)
+    v = _VENUE_PREFIX_RE.sub(" ", v)
+    v = _WHITESPACE_RE.sub(" ", v)
     return v.strip()
@@ -3,6 +3,7 @@ from collections import defaultdict
 from datetime import datetime
 from typing import Dict, List
 
+from .duplicates import find_duplicate_clusters
 from .normalize import normalize_doi, normalize_venue
 
 Issue = Dict[str, object]
@@ -33,6 +34,22 @@ def run_static_validations(entries: List[Entry]) -> Dict[str, List[Issue]]:
                 }
             )
 
+    for cluster in find_duplicate_clusters(entries):
+        keys = list(dict.fromkeys(cluster["citekeys"]))
+        if len(keys) < 2:
+            # 同一 citekey 的重复已由 DUPLICATE_CITEKEY 报告
+            continue
+        for key in keys:
+            others = [k for k in keys if k != key]
+            issues_by_key[key].append(
+                {
+                    "type": "DUPLICATE_ENTRY",
+                    "severity": "WARNING",
+                    "message": f"疑似与 {', '.join(f'`{k}`' for k in others)} 为同一文献",
+                    "details": {"cluster": keys, "reasons": cluster["reasons"]},
+                }
+            )
+
     current_year = datetime.now().year
     for e in entries:
         key = e["ID"]
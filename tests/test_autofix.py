@@ -25,7 +25,7 @@ def test_autofix_no_network_skips(monkeypatch, tmp_path):
 def test_conf_threshold_applied(monkeypatch, tmp_path):
     # patch resolve to force low confidence -> not applied
     from bibcheck.auto import autofix as af
-    def fake_plan(entry, online_result, session, cache, min_conf, scope, allow_network, user_agent):
+    def fake_plan(entry, online_result, min_conf, scope):
         return [], [{"citekey": entry["ID"], "field": "title", "old": entry.get("title"), "new": "NEW", "confidence": 0.5, "source": "mock"}]
     monkeypatch.setattr(af, "_plan_and_apply", fake_plan)
     infile = tmp_path / "in.bib"
@@ -37,3 +37,73 @@ def test_conf_threshold_applied(monkeypatch, tmp_path):
     text = out_bib.read_text(encoding="utf-8")
     assert "NEW" not in text
 
+
+
+def test_concurrent_autofix_matches_serial(monkeypatch, tmp_path):
+    import json
+    from bibcheck.auto import autofix as af
+    from bibcheck.mockserver import MockServer
+
+    records = [
+        {"title": "Attention Is All You Need", "authors": ["Ashish Vaswani"], "year": "2017", "venue": "NeurIPS",
+         "doi": "10.5555/attention"},
+        {"title": "Deep Residual Learning for Image Recognition", "authors": ["Kaiming He"], "year": "2016", "venue": "CVPR"},
+    ]
+    infile = tmp_path / "in.bib"
+    infile.write_text(
+        "@article{a, title={Attention is all you need}, author={Vaswani, Ashish}, year={2017}, doi={10.5555/attention}}\n"
+        "% comment kept as is\n"
+        "@inproceedings{b, title={Deep Residual Learning for Image Recognition}, author={He, Kaiming}, year={2015}}\n"
+        "@article{c, title={Attention Is All You Need}, author={Vaswani, A.}, year={2017}, doi={10.5555/attention}}\n",
+        encoding="utf-8",
+    )
+    outputs = []
+    with MockServer(records) as server:
+        for workers in (1, 4):
+            home = tmp_path / f"home{workers}"
+            monkeypatch.setenv("HOME", str(home))
+            out = tmp_path / f"w{workers}"
+            out.mkdir()
+            af.run_autofix(
+                str(infile), str(out / "fixed.bib"), str(out / "r.json"), str(out / "r.csv"),
+                min_interval=0.0, base_urls=server.base_urls, workers=workers,
+            )
+            report = json.loads((out / "r.json").read_text(encoding="utf-8"))
+            report.pop("metrics")
+            outputs.append(((out / "fixed.bib").read_text(encoding="utf-8"), report, (out / "r.csv").read_text(encoding="utf-8")))
+    assert outputs[0] == outputs[1]
+    assert [e["citekey"] for e in outputs[1][1]["entries"]] == ["a", "b", "c"]
+    assert "% comment kept as is" in outputs[1][0]
+
+
+def test_autofix_makes_no_requests_beyond_validation(monkeypatch, tmp_path):
+    from bibcheck.auto import autofix as af
+    from bibcheck.cache import HTTPCache
+    from bibcheck.mockserver import MockServer
+    from bibcheck.parser import load_bib_entries
+    from bibcheck.validators_online import OnlineValidator, OnlineValidatorConfig
+
+    records = [{"title": "Deep Residual Learning for Image Recognition", "authors": ["Kaiming He"], "year": "2016", "venue": "CVPR"}]
+    infile = tmp_path / "in.bib"
+    infile.write_text(
+        "@inproceedings{b, title={Deep Residual Learning for Image Recognition}, author={He, Kaiming}, year={2015}}\n"
+        "@article{d, title={A Completely Unknown Work}, author={Roe, Richard}, year={2020}, doi={10.1/missing}}\n"
+        "@misc{e, title={Some Preprint}, author={Doe, Jane}, eprint={2101.00001}}\n",
+        encoding="utf-8",
+    )
+    with MockServer(records) as server:
+        validator = OnlineValidator(
+            OnlineValidatorConfig(min_interval=0.0, base_urls=server.base_urls), cache=HTTPCache(path=":memory:")
+        )
+        for entry in load_bib_entries(str(infile), max_entries=None)[0]:
+            validator.validate_entry(entry)
+        validation_only = sum(server.state.responses.values())
+
+        server.state.responses.clear()
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        af.run_autofix(
+            str(infile), str(tmp_path / "out.bib"), str(tmp_path / "r.json"), str(tmp_path / "r.csv"),
+            min_interval=0.0, base_urls=server.base_urls, scope="all",
+        )
+        assert sum(server.state.responses.values()) == validation_only
+    assert "year={2016}" in (tmp_path / "out.bib").read_text(encoding="utf-8")
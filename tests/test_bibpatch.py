@@ -0,0 +1,73 @@
+import difflib
+
+from bibcheck.bibpatch import write_bib_patched
+from bibcheck.fixer.applier import ApplyConfig, FixApplier
+from bibcheck.parser import load_bib_entries
+
+SOURCE = """% my references
+@string{nips = "Advances in NeurIPS"}
+
+@article{first,
+    title     = {Attention Is All You Need},
+    journal   = nips,
+    pages     = {1-2},
+    doi = "10.5555/x",
+    year      = 2017
+}
+
+@software{tool, title={Some Tool}, url={https://github.com/a/b}}
+
+@misc( second ,
+  title = {Second} # { Paper},
+  note  = {keep me}
+)
+"""
+
+
+def _action(citekey, field, new, extra=None):
+    return {"citekey": citekey, "field": field, "new": new, "confidence": 0.95, "source": "t", "extra": extra}
+
+
+def test_patch_only_rewrites_changed_fields(tmp_path):
+    src = tmp_path / "refs.bib"
+    src.write_bytes(SOURCE.encode("utf-8"))
+    entries, _ = load_bib_entries(str(src))
+    assert [e["ID"] for e in entries] == ["first", "second"]
+
+    plans = {
+        "first": {"actions": [_action("first", "pages", "1--2"), _action("first", "howpublished", "arXiv", {"remove_fields": ["doi"]})]},
+        "second": {"actions": []},
+    }
+    new_entries, _, _ = FixApplier(ApplyConfig()).apply(entries, plans)
+    out = tmp_path / "fixed.bib"
+    FixApplier(ApplyConfig()).write_bib(new_entries, str(out), source_path=str(src), originals={0: entries[0]})
+
+    diff = [
+        line for line in difflib.unified_diff(SOURCE.splitlines(), out.read_text(encoding="utf-8").splitlines(), lineterm="", n=0)
+        if line[:1] in "+-" and not line.startswith(("+++", "---"))
+    ]
+    assert diff == [
+        "-    pages     = {1-2},",
+        '-    doi = "10.5555/x",',
+        "-    year      = 2017",
+        "+    pages     = {1--2},",
+        "+    year      = 2017,",
+        "+    howpublished = {arXiv}",
+    ]
+    fixed, _ = load_bib_entries(str(out))
+    assert fixed[0]["journal"] == "Advances in NeurIPS" and "doi" not in fixed[0]
+    assert fixed[1]["title"] == "Second Paper"
+
+
+def test_unchanged_entries_copied_byte_for_byte(tmp_path):
+    src = tmp_path / "refs.bib"
+    src.write_bytes(SOURCE.replace("\n", "\r\n").encode("utf-8"))
+    entries, _ = load_bib_entries(str(src))
+    out = tmp_path / "out.bib"
+    assert write_bib_patched(str(src), str(out), entries, {})
+    assert out.read_bytes() == src.read_bytes()
+
+    # 源文件在解析后被改动时放弃补丁，交给调用方整体序列化
+    src.write_bytes(b"\n" * 10 + src.read_bytes())
+    changed = dict(entries[0], title="X")
+    assert not write_bib_patched(str(src), str(out), [changed, entries[1]], {0: entries[0]})
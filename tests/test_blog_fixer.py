@@ -22,3 +22,114 @@ def test_blog_canonical_and_title_applied():
     assert any(p["field"] == "title" and p["applied"] for p in applied)
     assert entry["title"] == "My Blog Post"
 
+
+
+class _StreamedPage:
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    encoding = "utf-8"
+
+    def __init__(self, html: bytes):
+        self.html = html
+        self.read = 0
+
+    def iter_content(self, size):
+        for i in range(0, len(self.html), size):
+            self.read = i + size
+            yield self.html[i:i + size]
+
+
+def test_read_page_stops_after_bibtex_block():
+    from bibcheck.auto.resolvers.blog_resolver import _CHUNK, _read_page
+
+    # <head> 已有作者时仍要读到正文末尾的 BibTeX 块
+    head = b'<html><head><title>T</title><meta name="citation_author" content="Alice"/></head><body><p>'
+    tail = b"</p><pre><code>@misc{k, title={T}}</code></pre></body></html>"
+    page = _StreamedPage(head + b"x" * (6 * _CHUNK) + tail)
+    meta = _read_page(page, max_bytes=1 << 20).result()
+    assert meta["authors"] == ["Alice"] and meta["bibtex_snippet"] == "@misc{k, title={T}}"
+
+    # 找到 BibTeX 块后停止，且不超过上限
+    page = _StreamedPage(b"<head><title>T</title></head><pre><code>@misc{k, title={T}}</code></pre>" + b"y" * (4 << 20))
+    assert _read_page(page, max_bytes=1 << 20).bibtex == "@misc{k, title={T}}"
+    assert page.read <= 64 * 1024
+    page = _StreamedPage(b"<head></head><p>" + b"z" * (4 << 20))
+    assert _read_page(page, max_bytes=100_000).result()["title"] is None and page.read <= 100_000 + 16 * 1024
+
+
+def test_extract_metadata_single_pass():
+    from bibcheck.auto.resolvers.html_meta import extract_metadata
+
+    html = """<html><head><title>Post | Lab Blog</title>
+    <link rel="canonical" href="https://lab.org/post"/>
+    <meta property="article:published_time" content="2024-03-05T10:00:00Z">
+    <script type="application/ld+json">{"@graph": [{"@type": "WebPage"},
+      {"@type": "ScholarlyArticle", "headline": "Post", "author": [{"@type": "Person", "name": "Ann Lee"}, "Bo Wu"]}]}</script>
+    </head><body><p>Cite as:</p><p>```bibtex
+    @article{lee2024, title={Post}}
+    ```</p></body></html>"""
+    meta = extract_metadata(html)
+    assert meta == {
+        "title": "Post | Lab Blog",
+        "canonical_url": "https://lab.org/post",
+        "authors": ["Ann Lee", "Bo Wu"],
+        "published_date": "2024-03-05T10:00:00Z",
+        "bibtex_snippet": "@article{lee2024, title={Post}}",
+    }
+
+
+@responses.activate
+def test_blog_fetch_revalidates_with_etag(monkeypatch):
+    from bibcheck.auto.resolvers import blog_resolver
+
+    url = "https://example.com/post"
+    responses.add(responses.GET, url, body="<head><title>Post</title></head>", status=200, headers={"ETag": '"v1"'})
+    responses.add(responses.GET, url, status=304)
+    session = __import__("requests").Session()
+    cache = HTTPCache(path=":memory:")
+    assert blog_resolver.fetch_blog(url, session, cache, "ua")["title"] == "Post"
+    # 未过期时直接用缓存
+    assert blog_resolver.fetch_blog(url, session, cache, "ua")["title"] == "Post"
+    assert len(responses.calls) == 1
+
+    monkeypatch.setattr(blog_resolver, "REVALIDATE_AFTER", 0)
+    assert blog_resolver.fetch_blog(url, session, cache, "ua")["title"] == "Post"
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+
+def test_host_limiter_spaces_same_host_only():
+    import time
+    from bibcheck.auto.host_limiter import HostLimiter
+
+    limiter = HostLimiter(min_interval=0.2)
+    started = time.monotonic()
+    for url in ("https://a.org/1", "https://b.org/1"):
+        with limiter.slot(url):
+            pass
+    assert time.monotonic() - started < 0.15
+    with limiter.slot("https://A.org/2"):
+        pass
+    assert time.monotonic() - started >= 0.2
+
+
+def test_blog_detector_matches_registered_suffixes(tmp_path):
+    from bibcheck.auto.blog_detector import BlogDetector, is_web_scholarly
+
+    def misc(url, **fields):
+        return {"ID": "k", "ENTRYTYPE": "misc", "url": url, **fields}
+
+    assert is_web_scholarly(misc("https://example.com/post"))
+    assert is_web_scholarly(misc("https://www.Example.COM./post"))
+    assert is_web_scholarly(misc("https://blog.openai.com/x"))
+    assert not is_web_scholarly(misc("https://notexample.com/post"))
+    assert not is_web_scholarly(misc("https://example.com.evil/post"))
+    assert not is_web_scholarly(misc("https://evil.org/?u=example.com"))
+    assert not is_web_scholarly({**misc("https://example.com/post"), "doi": "10.1/x"})
+    assert is_web_scholarly(misc("https://lab.org/x", howpublished="Research   Blog"))
+
+    config = tmp_path / "blogs.yaml"
+    config.write_text("domains: [lab.org, 'https://*.ai-lab.net/']\nhints: [tech note]\n", encoding="utf-8")
+    detector = BlogDetector.from_config(str(config))
+    assert detector.is_web_scholarly(misc("https://lab.org/x"))
+    assert detector.is_web_scholarly(misc("https://team.ai-lab.net/x"))
+    assert detector.is_web_scholarly(misc("https://example.com/p"))
+    assert detector.is_web_scholarly({"ENTRYTYPE": "article", "url": "https://z.org", "note": "Tech Note 3"})
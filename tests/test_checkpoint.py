@@ -0,0 +1,50 @@
+import json
+
+from bibcheck import cli
+from bibcheck.checkpoint import Checkpoint
+
+BIB = (
+    "@article{a, title={Attention Is All You Need}, author={Vaswani, Ashish}, journal={NeurIPS}, year={2017}, doi={10.5555/attention}}\n"
+    "@article{b, title={Another Paper}, author={Doe, Jane}, journal={J}, year={2019}}\n"
+    "@article{c, title={Third Paper}, author={Roe, Richard}, journal={J}, year={2020}}\n"
+)
+
+
+def _run(tmp_path, *extra):
+    argv = [str(tmp_path / "refs.bib"), "--outdir", str(tmp_path), "--offline", "--progress", "never", *extra]
+    cli.run_check(cli.build_parser().parse_args(argv))
+    report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    report.pop("metrics")
+    return report, (tmp_path / "report.csv").read_text(encoding="utf-8")
+
+
+def test_resume_matches_uninterrupted_run(tmp_path, monkeypatch):
+    (tmp_path / "refs.bib").write_text(BIB, encoding="utf-8")
+    full_report, full_csv = _run(tmp_path)
+
+    # 模拟在第二个条目写到一半时被杀
+    path = tmp_path / "checkpoint.jsonl"
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    assert len(lines) == 4
+    path.write_text(lines[0] + lines[1] + lines[2][:20], encoding="utf-8")
+
+    calls = []
+    original = cli.OnlineValidator.validate_entry
+    monkeypatch.setattr(cli.OnlineValidator, "validate_entry", lambda self, e: calls.append(e["ID"]) or original(self, e))
+    resumed_report, resumed_csv = _run(tmp_path, "--resume")
+
+    assert calls == ["b", "c"]
+    assert resumed_report == full_report
+    assert resumed_csv == full_csv
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+
+
+def test_changed_bib_invalidates_checkpoint(tmp_path):
+    path = str(tmp_path / "cp.jsonl")
+    cp = Checkpoint(path, "fp-1")
+    cp.append(0, "a", {"status": "OK", "online": {}}, {"ID": "a"})
+    cp.close()
+
+    assert Checkpoint(path, "fp-1", resume=True).get(0, "a") is not None
+    stale = Checkpoint(path, "fp-2", resume=True)
+    assert stale.stale and stale.get(0, "a") is None
@@ -0,0 +1,79 @@
+import json
+import time
+
+from bibcheck import cli
+from bibcheck.cache import HTTPCache
+from bibcheck.mockserver import FaultRule, MockServer
+from bibcheck.sources.http import RetryPolicy
+from bibcheck.validators_online import OnlineValidator, OnlineValidatorConfig
+
+RECORDS = [{"title": "Attention Is All You Need", "authors": ["Ashish Vaswani"], "year": "2017", "doi": "10.5555/attention"}]
+ENTRY = {"ID": "a", "ENTRYTYPE": "article", "title": "Attention Is All You Need", "author": "Vaswani, Ashish", "year": "2017", "doi": "10.5555/attention"}
+
+
+def test_entry_timeout_marks_online_timeout():
+    with MockServer(RECORDS, faults=[FaultRule(source="crossref", status=0, delay=2.0)]) as server:
+        validator = OnlineValidator(
+            OnlineValidatorConfig(sources=["crossref"], min_interval=0.0, base_urls=server.base_urls, entry_timeout=0.3),
+            cache=HTTPCache(path=":memory:"),
+        )
+        entry = dict(ENTRY)
+        started = time.monotonic()
+        result = validator.validate_entry(entry)
+    assert time.monotonic() - started < 1.5
+    assert result["timed_out"] and result["unavailable_sources"] == ["crossref"]
+    assert [i["type"] for i in entry["_online_issues"]] == ["ONLINE_TIMEOUT"]
+    # 时限不算数据源故障
+    assert validator.http.breakers.degraded() == {}
+
+
+def test_run_deadline_still_writes_report(tmp_path, capsys):
+    bib = tmp_path / "refs.bib"
+    bib.write_text(
+        "@article{a, title={Attention Is All You Need}, author={Vaswani, Ashish}, journal={NeurIPS}, year={2017}, doi={10.5555/attention}}\n"
+        "@article{b, title={Another Paper}, author={Doe, Jane}, journal={J}, year={2019}, doi={10.5555/other}}\n",
+        encoding="utf-8",
+    )
+    with MockServer(RECORDS) as server:
+        argv = [str(bib), "--outdir", str(tmp_path), "--min-interval", "0", "--run-deadline", "0", "--progress", "never"]
+        for source, url in server.base_urls.items():
+            argv += ["--base-url", f"{source}={url}"]
+        cli.run_check(cli.build_parser().parse_args(argv))
+        assert sum(server.state.requests.values()) == 0
+    report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    assert report["stats"]["total"] == 2
+    assert report["stats"]["by_issue_type"]["ONLINE_TIMEOUT"] == 2
+    assert all(e["online"]["timed_out"] for e in report["entries"])
+
+
+def test_partial_timeout_downgrades_not_found():
+    # Crossref 答复“查无结果”，S2 超时：既要标记 ONLINE_TIMEOUT，也不能给出 ERROR 级的未找到
+    with MockServer([], faults=[FaultRule(source="s2", status=0, delay=2.0)]) as server:
+        validator = OnlineValidator(
+            OnlineValidatorConfig(sources=["crossref", "s2"], min_interval=0.0, base_urls=server.base_urls, entry_timeout=0.3),
+            cache=HTTPCache(path=":memory:"),
+        )
+        search_entry = {k: v for k, v in ENTRY.items() if k != "doi"}
+        doi_entry = dict(ENTRY)
+        results = [validator.validate_entry(e) for e in (search_entry, doi_entry)]
+    for entry, result in zip((search_entry, doi_entry), results):
+        assert result["timed_out"] and result["unavailable_sources"] == ["s2"]
+        issues = {i["type"]: i for i in entry["_online_issues"]}
+        assert issues["ONLINE_TIMEOUT"]["details"] == {"sources": ["s2"], "partial": True}
+        assert all(i["severity"] == "WARNING" for i in issues.values())
+    assert "NOT_FOUND_ONLINE" in {i["type"] for i in search_entry["_online_issues"]}
+    assert "DOI_NOT_FOUND" in {i["type"] for i in doi_entry["_online_issues"]}
+
+
+def test_doi_resolved_by_later_source_has_no_unavailable_warning():
+    # Crossref 不可用，S2 解析出 DOI：结论已确定，不再附带部分不可用提示
+    with MockServer(RECORDS, faults=[FaultRule(source="crossref", status=503)]) as server:
+        validator = OnlineValidator(
+            OnlineValidatorConfig(sources=["crossref", "s2"], min_interval=0.0, base_urls=server.base_urls, retry=RetryPolicy(attempts=1)),
+            cache=HTTPCache(path=":memory:"),
+        )
+        entry = dict(ENTRY)
+        result = validator.validate_entry(entry)
+    assert result["resolved"]
+    assert result["unavailable_sources"] == ["crossref"]
+    assert not {"ONLINE_TIMEOUT", "ONLINE_SOURCE_UNAVAILABLE"} & {i["type"] for i in entry["_online_issues"]}
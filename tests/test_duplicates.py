@@ -0,0 +1,43 @@
+from bibcheck.duplicates import find_duplicate_clusters
+from bibcheck.validators_static import run_static_validations
+
+
+def _entry(key, title, **fields):
+    return {"ID": key, "ENTRYTYPE": "article", "title": title, "author": "A", "year": "2020", "journal": "J", **fields}
+
+
+def test_near_duplicate_titles_clustered():
+    entries = [
+        _entry("a", "Deep Residual Learning for Image Recognition"),
+        _entry("b", "Cats on a Mat"),
+        _entry("c", "Deep residual learning for image recognition."),
+        _entry("d", "Deep Residual Learning for Image Recognitions", year="2021"),
+        _entry("e", "Deep Residual Learning for Image Recognition", year="2005"),
+    ]
+    clusters = find_duplicate_clusters(entries)
+    assert [c["citekeys"] for c in clusters] == [["a", "c", "d"]]
+    assert clusters[0]["reasons"] == ["title"]
+
+
+def test_duplicate_by_doi_and_arxiv():
+    entries = [
+        _entry("a", "Title One", doi="https://doi.org/10.1/ABC"),
+        _entry("b", "Completely Different", doi="10.1/abc"),
+        _entry("c", "Attention", eprint="1706.03762v2"),
+        _entry("d", "Transformers", url="https://arxiv.org/abs/1706.03762"),
+    ]
+    clusters = find_duplicate_clusters(entries)
+    assert [(c["citekeys"], c["reasons"]) for c in clusters] == [(["a", "b"], ["doi"]), (["c", "d"], ["arxiv"])]
+
+
+def test_static_reports_duplicate_entry_but_not_same_citekey():
+    entries = [
+        _entry("a", "Deep Residual Learning for Image Recognition"),
+        _entry("b", "Deep Residual Learning for Image Recognition"),
+        _entry("x", "Cats on a Mat"),
+        _entry("x", "Cats on a Mat"),
+    ]
+    issues = run_static_validations(entries)
+    assert any(i["type"] == "DUPLICATE_ENTRY" and i["details"]["cluster"] == ["a", "b"] for i in issues["a"])
+    assert not any(i["type"] == "DUPLICATE_ENTRY" for i in issues["x"])
+    assert any(i["type"] == "DUPLICATE_CITEKEY" for i in issues["x"])
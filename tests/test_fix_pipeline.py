@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from bibcheck import cli
+from bibcheck.fixer import FixConfig, FixPlanner, PlanStage
+from bibcheck.fixer.plan_cache import plan_fingerprint
+from bibcheck.fixer.planfile import read_plan_file
+
+BIB = "".join(
+    f"@article{{k{i}, title={{Paper {i}}}, author={{Doe, Jane}}, journal={{J}}, year={{2020}}, pages={{pp. {i}-{i + 5}}}}}\n"
+    for i in range(12)
+)
+
+
+def _entry(i):
+    return {"ID": f"k{i}", "ENTRYTYPE": "article", "title": f"T{i}", "pages": f"{i}-{i + 1}"}
+
+
+def test_plan_stage_merges_in_submission_order():
+    stage = PlanStage(FixPlanner(FixConfig()), workers=2, max_pending=3)
+    merged = []
+    for i in range(8):
+        if i == 3:
+            merged += stage.push(i, {"citekey": "restored", "actions": []})
+        else:
+            merged += stage.submit(i, _entry(i), [], {"resolved": None, "candidate_matches": []})
+    merged += stage.finish()
+    assert [ctx for ctx, _ in merged] == list(range(8))
+    assert merged[0][1]["actions"][0]["new"] == "0--1"
+    assert merged[3][1]["citekey"] == "restored"
+
+
+def _run_fix(tmp_path, workers):
+    out = tmp_path / f"w{workers}"
+    out.mkdir()
+    argv = [str(tmp_path / "refs.bib"), "--fix", "--offline", "--progress", "never", "--outdir", str(out), "--fix-workers", str(workers)]
+    argv += ["--plan-cache", str(tmp_path / "plans.sqlite")]
+    cli.run_fix(cli.build_parser().parse_args(argv))
+    report = json.loads((out / "report.json").read_text(encoding="utf-8"))
+    report.pop("metrics")
+    plan_cache = report.pop("plan_cache")
+    changes = [json.loads(line) for line in (out / "changes.jsonl").read_text(encoding="utf-8").splitlines()]
+    for c in changes:
+        c.pop("timestamp")
+    return report, changes, (out / "refs.fixed.bib").read_text(encoding="utf-8"), plan_cache
+
+
+def test_parallel_fix_matches_serial(tmp_path):
+    (tmp_path / "refs.bib").write_text(BIB, encoding="utf-8")
+    *serial, cold = _run_fix(tmp_path, 1)
+    assert len(serial[1]) == 12 and serial[1][0]["citekey"] == "k0"
+    assert cold == {"hits": 0, "misses": 12}
+    # 第二次运行计划全部来自缓存，结果不变
+    *parallel, warm = _run_fix(tmp_path, 2)
+    assert parallel == serial
+    assert warm == {"hits": 12, "misses": 0}
+
+
+def test_plan_fingerprint_inputs():
+    entry = _entry(1)
+    online = {"resolved": {"title": "T1", "doi": "10.1/x"}, "title_match_score": 100, "candidate_matches": [{"score": 1}]}
+    base = plan_fingerprint(entry, online, FixConfig())
+    assert plan_fingerprint(dict(entry, _online_issues=[1]), dict(online, candidate_matches=[]), FixConfig()) == base
+    assert plan_fingerprint(dict(entry, pages="2-3"), online, FixConfig()) != base
+    assert plan_fingerprint(entry, dict(online, resolved={"title": "T1"}), FixConfig()) != base
+    assert plan_fingerprint(entry, online, FixConfig(mid_threshold=0.7)) != base
+
+
+def test_apply_plan_replays_offline_with_new_thresholds(tmp_path, monkeypatch):
+    bib = tmp_path / "refs.bib"
+    bib.write_text(BIB, encoding="utf-8")
+    _run_fix(tmp_path, 1)
+    plan = tmp_path / "w1" / "fix_plan.jsonl"
+    assert len(plan.read_text(encoding="utf-8").splitlines()) == 13
+
+    # apply-plan 不得联网或重新校验
+    monkeypatch.setattr(cli.OnlineValidator, "validate_entry", lambda *a: pytest.fail("validated"))
+    out = tmp_path / "replay"
+
+    def replay(*extra):
+        with pytest.raises(SystemExit) as exc:
+            cli.main(["apply-plan", str(plan), str(bib), "--outdir", str(out), *extra])
+        return exc.value.code, (out / "refs.fixed.bib").read_text(encoding="utf-8")
+
+    code, text = replay()
+    assert code == 0 and "pp. 0-5" in text
+    code, text = replay("--aggressive")
+    assert code == 0 and "pages={p. 0--5}" in text and "pp. 0-5" not in text
+
+    bib.write_text(BIB + "@misc{new, title={X}}\n", encoding="utf-8")
+    assert replay()[0] == 2
+
+
+def test_negative_fix_workers_rejected_by_parser(capsys):
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["refs.bib", "--fix", "--fix-workers", "-1"])
+    assert "--fix-workers" in capsys.readouterr().err
+    assert cli.build_parser().parse_args(["refs.bib", "--fix-workers", "0"]).fix_workers == 0
+
+
+def test_plan_file_keeps_low_confidence_candidates(tmp_path, monkeypatch):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@article{c, title={Cats on Mats}, author={Doe, Jane}, journal={J}, year={2020}}\n", encoding="utf-8")
+    online = {"checked": True, "resolved": None, "title_match_score": None, "entry_kind": "unknown"}
+    candidate = {"doi": "10.1/cats", "score": 70, "source": "crossref", "title": "Cats on Mats"}
+    monkeypatch.setattr(cli.OnlineValidator, "validate_entry", lambda self, e: dict(online, candidate_matches=[dict(candidate)]))
+    out = tmp_path / "out"
+    out.mkdir()
+    argv = [str(bib), "--fix", "--aggressive", "--progress", "never", "--outdir", str(out), "--no-plan-cache"]
+    cli.run_fix(cli.build_parser().parse_args(argv))
+    # 默认中置信阈值 0.8：0.7 的候选 DOI 只作为建议
+    assert "doi" not in (out / "refs.fixed.bib").read_text(encoding="utf-8")
+
+    replay = tmp_path / "replay"
+    with pytest.raises(SystemExit):
+        cli.main(["apply-plan", str(out / "fix_plan.jsonl"), str(bib), "--outdir", str(replay), "--aggressive", "--mid-threshold", "0.7"])
+    assert "doi = {10.1/cats}" in (replay / "refs.fixed.bib").read_text(encoding="utf-8")
+
+
+def test_low_confidence_candidate_not_reported(tmp_path, monkeypatch):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@article{c, title={Cats on Mats}, author={Doe, Jane}, journal={J}, year={2020}}\n", encoding="utf-8")
+    online = {"checked": True, "resolved": None, "title_match_score": None, "entry_kind": "unknown"}
+    candidate = {"doi": "10.1/cats", "score": 50, "source": "crossref", "title": "Cats on Mats"}
+    monkeypatch.setattr(cli.OnlineValidator, "validate_entry", lambda self, e: dict(online, candidate_matches=[dict(candidate)]))
+    out = tmp_path / "out"
+    out.mkdir()
+    argv = [str(bib), "--fix", "--progress", "never", "--outdir", str(out), "--no-plan-cache"]
+    cli.run_fix(cli.build_parser().parse_args(argv))
+    # 0.5 的候选低于中置信阈值：不进变更日志、汇总与报告预览，只留在计划文件中
+    changes = out / "changes.jsonl"
+    assert not changes.exists() or "10.1/cats" not in changes.read_text(encoding="utf-8")
+    assert "10.1/cats" not in (out / "fix_summary.md").read_text(encoding="utf-8")
+    report = json.loads((out / "report.json").read_text(encoding="utf-8"))
+    assert report["entries"][0]["fix_plan_preview"] == []
+    _, plans = read_plan_file(str(out / "fix_plan.jsonl"))
+    assert plans["c"]["actions"][0]["new"] == "10.1/cats" and plans["c"]["actions"][0]["confidence"] == 0.5
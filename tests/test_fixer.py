@@ -1,5 +1,8 @@
 from bibcheck.fixer.planner import FixPlanner, FixConfig
 from bibcheck.fixer.applier import FixApplier, ApplyConfig
+from bibcheck.entries import BibEntry
+from bibcheck.kind import get_field
+from bibcheck.parser import load_bib_entries
 
 
 def test_arxiv_doi_normalize():
@@ -55,3 +58,27 @@ def test_aggressive_threshold():
     assert any(c["field"] == "doi" and c["applied"] for c in applied2)
 
 
+
+
+def test_apply_copies_only_changed_entries(tmp_path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@Article{a, Title={A}, pages={1-2}}\n@misc{b, title={B}}\n", encoding="utf-8")
+    entries, _ = load_bib_entries(str(bib))
+    assert isinstance(entries[0], BibEntry) and entries[0]["ENTRYTYPE"] == "article"
+    assert get_field(entries[0], "TITLE") == "A" and get_field(entries[0], "ID") == "a"
+
+    plan = {"actions": [{"citekey": "a", "field": "pages", "old": "1-2", "new": "1--2", "confidence": 0.95, "source": "t"}]}
+    new_entries, applied, _ = FixApplier(ApplyConfig()).apply(entries, {"a": plan})
+    assert len(applied) == 1
+    assert new_entries[0]["pages"] == "1--2" and isinstance(new_entries[0], BibEntry)
+    assert entries[0]["pages"] == "1-2"
+    assert new_entries[1] is entries[1]
+
+
+def test_parsed_field_names_are_interned(tmp_path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text("@Article{a, Title={A}, Year={2020}}\n@article{b, title={B}, year={2021}}\n", encoding="utf-8")
+    entries, _ = load_bib_entries(str(bib))
+    keys = [{k: k for k in e} for e in entries]
+    assert keys[0]["title"] is keys[1]["title"] and keys[0]["year"] is keys[1]["year"]
+    assert entries[0]["ENTRYTYPE"] is entries[1]["ENTRYTYPE"]
@@ -0,0 +1,35 @@
+from bibcheck.matching import compute_match_confidence, compute_match_confidences, title_score_matrix
+from bibcheck.normalize import title_similarity
+
+
+def test_title_score_matrix_matches_pairwise():
+    local = ["Deep Residual Learning", "", "Attention Is All You Need"]
+    candidates = ["deep residual learning!", "Attention is all you need", ""]
+    matrix = title_score_matrix(local, candidates, workers=-1)
+    assert matrix.shape == (3, 3)
+    for i, a in enumerate(local):
+        for j, b in enumerate(candidates):
+            assert int(matrix[i][j]) == title_similarity(a, b)
+
+
+def test_batch_confidence_equals_single():
+    entry = {"title": "Cats on Mat", "author": "Alice Smith and Bob Lee", "year": "2020", "journal": "J. Cats", "doi": "10.1/x"}
+    candidates = [
+        {"title": "Cats on Mat", "authors": ["Alice Smith"], "year": "2021", "venue": "Journal of Cats"},
+        {"title": "Other", "authors": [], "year": None, "doi": "https://doi.org/10.1/X"},
+        {"title": "", "authors": ["Bob Lee"], "year": "2020"},
+    ]
+    batch = compute_match_confidences(entry, candidates)
+    assert batch == [compute_match_confidence(entry, c) for c in candidates]
+    assert batch[1][0] == 1.0
+
+
+def test_small_matrix_runs_single_threaded(monkeypatch):
+    from bibcheck import matching
+
+    seen = []
+    cdist = matching.process.cdist
+    monkeypatch.setattr(matching.process, "cdist", lambda *a, **kw: seen.append(kw["workers"]) or cdist(*a, **kw))
+    title_score_matrix(["Deep Residual Learning"], ["deep residual learning", "other"], workers=-1)
+    title_score_matrix(["t%d" % i for i in range(100)], ["c%d" % i for i in range(100)], workers=-1)
+    assert seen == [1, -1]
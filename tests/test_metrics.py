@@ -0,0 +1,47 @@
+import responses
+
+from bibcheck.cache import HTTPCache
+from bibcheck.metrics import InstrumentedCache, Metrics
+from bibcheck.validators_online import OnlineValidator, OnlineValidatorConfig
+
+
+def test_cache_hit_miss_negative():
+    metrics = Metrics()
+    cache = InstrumentedCache(HTTPCache(path=":memory:"), metrics)
+    assert cache.get("crossref:doi:x") is None
+    cache.set("crossref:doi:x", {"title": "T"})
+    cache.set("crossref:search:t:None:None", [])
+    cache.set("citationcff:a/b", {"status": "missing", "candidate": None})
+    assert cache.get("crossref:doi:x") == {"title": "T"}
+    assert cache.get("crossref:search:t:None:None") == []
+    cache.get("citationcff:a/b")
+
+    snap = metrics.snapshot()["cache"]
+    assert (snap["crossref"]["hits"], snap["crossref"]["negative_hits"], snap["crossref"]["misses"]) == (1, 1, 1)
+    assert snap["crossref"]["sets"] == 2
+    assert snap["citation_cff"]["negative_hits"] == 1
+
+
+@responses.activate
+def test_request_metrics_and_prometheus(monkeypatch):
+    monkeypatch.setattr("bibcheck.sources.http.time.sleep", lambda s: None)
+    url = "https://api.crossref.org/works/10.1/x"
+    responses.add(responses.GET, url, status=503)
+    responses.add(responses.GET, url, json={"status": "ok", "message": {"title": ["T"], "DOI": "10.1/x"}})
+    validator = OnlineValidator(
+        OnlineValidatorConfig(min_interval=0.0), cache=HTTPCache(path=":memory:")
+    )
+    assert validator.clients["crossref"].fetch_by_doi("10.1/x")["title"] == "T"
+
+    crossref = validator.metrics.snapshot()["sources"]["crossref"]
+    assert crossref["requests"] == 2
+    assert crossref["status"] == {"200": 1, "503": 1}
+    assert crossref["errors"] == 1
+    assert crossref["retries"] == 1 and 0.25 <= crossref["backoff_s"] <= 0.5
+    assert crossref["bytes"] > 0
+    assert crossref["latency_s"]["count"] == 2
+
+    text = validator.metrics.to_prometheus()
+    assert 'bibcheck_source_requests_total{source="crossref",status="503"} 1' in text
+    assert 'bibcheck_source_request_duration_seconds_bucket{source="crossref",le="+Inf"} 2' in text
+    assert 'bibcheck_cache_lookups_total{source="crossref",result="miss"} 1' in text
@@ -0,0 +1,101 @@
+import pytest
+
+from bibcheck.cache import HTTPCache
+from bibcheck.mockserver import FaultRule, MockServer
+from bibcheck.validators_online import OnlineValidator, OnlineValidatorConfig
+
+
+RECORDS = [
+    {
+        "title": "Attention Is All You Need",
+        "authors": ["Ashish Vaswani", "Noam Shazeer"],
+        "year": "2017",
+        "venue": "NeurIPS",
+        "doi": "10.5555/attention",
+        "arxiv_id": "1706.03762",
+    },
+    {"title": "Deep Residual Learning for Image Recognition", "authors": ["Kaiming He"], "year": "2016", "venue": "CVPR"},
+]
+
+
+@pytest.fixture
+def server():
+    with MockServer(RECORDS) as srv:
+        yield srv
+
+
+def _validator(server, **kwargs):
+    config = OnlineValidatorConfig(min_interval=0.0, base_urls=server.base_urls, **kwargs)
+    return OnlineValidator(config, cache=HTTPCache(path=":memory:"))
+
+
+def test_clients_resolve_against_mock_server(server):
+    validator = _validator(server, enable_citation_cff=False)
+    assert validator.clients["crossref"].base == server.url + "/crossref"
+
+    by_doi = validator.validate_entry(
+        {"ID": "v", "ENTRYTYPE": "inproceedings", "title": "Attention Is All You Need", "doi": "10.5555/attention", "year": "2017"}
+    )
+    assert by_doi["resolved"]["source"] == "crossref"
+
+    hits = validator.clients["s2"].search("deep residual learning for image recognition")
+    assert hits and hits[0]["year"] == "2016"
+    paper = validator.clients["arxiv"].fetch_by_id("1706.03762v5")
+    assert paper["title"] == "Attention Is All You Need"
+
+
+def test_scripted_fault_is_retried(server, monkeypatch):
+    monkeypatch.setattr("bibcheck.sources.http.time.sleep", lambda s: None)
+    rule = server.inject(FaultRule(source="crossref", path=r"^/works/", status=503, count=2))
+    validator = _validator(server)
+
+    assert validator.clients["crossref"].fetch_by_doi("10.5555/attention")["title"] == "Attention Is All You Need"
+    assert rule.fired == 2
+    assert server.state.responses[("crossref", 503)] == 2
+    assert server.state.responses[("crossref", 200)] == 1
+
+
+def test_rate_limit_returns_retry_after():
+    with MockServer(RECORDS, rate_limits={"openalex": 1}) as srv:
+        import requests
+
+        first = requests.get(srv.base_urls["openalex"], params={"filter": "display_name.search:attention"})
+        second = requests.get(srv.base_urls["openalex"], params={"filter": "display_name.search:attention"})
+    assert first.status_code == 200 and first.json()["results"]
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
+
+
+def test_arxiv_entries_prefetched_in_one_request():
+    preprint = {"title": "Some Preprint", "authors": ["Jane Doe"], "year": "2021", "arxiv_id": "2101.00001v2"}
+    with MockServer(RECORDS + [preprint]) as server:
+        validator = _validator(server)
+        entries = [
+            {"ID": "a", "ENTRYTYPE": "misc", "title": "Attention Is All You Need", "eprint": "1706.03762", "archiveprefix": "arXiv"},
+            {"ID": "b", "ENTRYTYPE": "misc", "title": "Some Preprint", "url": "https://arxiv.org/abs/2101.00001v2"},
+            {"ID": "c", "ENTRYTYPE": "misc", "title": "Missing", "eprint": "2202.99999", "archiveprefix": "arXiv"},
+        ]
+        assert validator.prefetch_arxiv(entries) == 3
+        assert server.state.requests["arxiv"] == 1
+        results = [validator.validate_entry(e) for e in entries]
+        assert server.state.requests["arxiv"] == 1
+        assert [r["candidate_matches"][0]["title"] if r["candidate_matches"] else None for r in results] == [
+            "Attention Is All You Need", "Some Preprint", None,
+        ]
+
+        # 已缓存的 ID 不再请求；不带版本号的 ID 对应到 arXiv 返回的最新版本
+        found = validator.clients["arxiv"].fetch_many(["1706.03762", "2202.99999", "2101.00001"])
+        assert server.state.requests["arxiv"] == 2
+        assert {k for k, v in found.items() if v} == {"1706.03762", "2101.00001"}
+        assert found["1706.03762"]["authors"] == ["Ashish Vaswani", "Noam Shazeer"]
+        assert found["2101.00001"]["id"] == "2101.00001v2"
+
+
+def test_base_url_names_match_validator_sources(server):
+    from bibcheck.cli import parse_base_urls
+    from bibcheck.validators_online import SOURCES
+
+    assert set(server.base_urls) == set(SOURCES)
+    assert parse_base_urls([f"citation_cff={server.base_urls['citation_cff']}"]) == {"citation_cff": server.url + "/citation_cff"}
+    with pytest.raises(SystemExit):
+        parse_base_urls(["crosref=http://127.0.0.1:1/crossref"])
@@ -0,0 +1,16 @@
+from bibcheck.normalize import clear_normalize_caches, normalize_authors, normalize_cache_info, normalize_title
+
+
+def test_normalize_memo_runs_regex_once():
+    clear_normalize_caches()
+    for _ in range(3):
+        assert normalize_title("Deep Residual $x$ Learning!") == "deep residual learning"
+    stats = normalize_cache_info()["bibcheck.normalize.normalize_title"]
+    assert stats["calls"] == 3
+    assert stats["misses"] == 1
+
+
+def test_normalize_authors_returns_copy():
+    authors = normalize_authors("He, Kaiming and Zhang, Xiangyu")
+    authors.append("Mutated")
+    assert normalize_authors("He, Kaiming and Zhang, Xiangyu") == ["He, Kaiming", "Zhang, Xiangyu"]
@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+
+from bibcheck.metrics import Metrics
+from bibcheck.profiling import Profiler
+
+
+def test_profiler_phases_entries_and_trace(tmp_path, capsys):
+    profiler = Profiler(enabled=True)
+    metrics = Metrics()
+    profiler.attach(metrics)
+    with profiler.phase("parse"):
+        data = [0] * 1000
+    for key in ("fast", "slow"):
+        with profiler.entry(key):
+            with profiler.phase("online"):
+                if key == "slow":
+                    # slowest() 按实际耗时排序，真实等待一段时间保证顺序稳定
+                    time.sleep(0.05)
+                    metrics.observe_request("crossref", 0.2, 503)
+                    metrics.observe_retry("crossref", 0.5)
+                    metrics.observe_request("crossref", 0.1, 200)
+
+    assert profiler.phases["online"]["count"] == 2
+    assert profiler.phases["parse"]["alloc_kb"] > 0
+    slowest = profiler.slowest(1)[0]
+    assert slowest["citekey"] == "slow"
+    assert [c["status"] for c in slowest["calls"] if c["event"] == "request"] == [503, 200]
+
+    trace = tmp_path / "trace.json"
+    profiler.finish(str(trace), top=1)
+    payload = json.loads(trace.read_text(encoding="utf-8"))
+    cats = {e["cat"] for e in payload["traceEvents"]}
+    assert cats == {"phase", "entry", "source"}
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in payload["traceEvents"])
+    assert "crossref: 2 次请求" in capsys.readouterr().out
+    del data
+
+
+def test_disabled_profiler_is_noop():
+    profiler = Profiler()
+    with profiler.entry("k"), profiler.phase("online"):
+        pass
+    assert not profiler.events and not profiler.entries
+
+
+def test_concurrent_entries_skip_memory(capsys):
+    profiler = Profiler(enabled=True)
+
+    def work(key):
+        with profiler.entry(key), profiler.phase("online"):
+            data = [0] * 1000
+            del data
+
+    with profiler.concurrent(1):
+        work("serial")
+    with profiler.concurrent(2):
+        threads = [threading.Thread(target=work, args=(f"k{i}",)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    with profiler.phase("write_report"):
+        pass
+
+    by_key = {e["citekey"]: e for e in profiler.entries}
+    assert "alloc_kb" in by_key["serial"]
+    assert not {"alloc_kb", "peak_kb"} & (set(by_key["k0"]) | set(by_key["k1"]))
+    assert "peak_kb" in next(e for e in profiler.events if e["name"] == "write_report")["args"]
+    assert "memory_note" in profiler.summary()
+    profiler.finish()
+    assert "未统计内存" in capsys.readouterr().out
@@ -0,0 +1,58 @@
+import responses
+
+from bibcheck.cache import HTTPCache
+from bibcheck.query_planner import QueryPlanner
+from bibcheck.validators_online import OnlineValidator, OnlineValidatorConfig
+
+
+def test_planner_orders_by_history_and_persists():
+    cache = HTTPCache(path=":memory:")
+    planner = QueryPlanner(cache)
+    assert planner.order("unknown", ["crossref", "openalex", "s2"]) == ["crossref", "openalex", "s2"]
+    for _ in range(5):
+        planner.record("unknown", "crossref", 2.0, hit=False)
+        planner.record("unknown", "s2", 0.2, hit=True)
+    planner.save()
+    reloaded = QueryPlanner(cache)
+    assert reloaded.order("unknown", ["crossref", "openalex", "s2"]) == ["s2", "openalex", "crossref"]
+    assert reloaded.order("scholarly_cslike", ["crossref", "s2"]) == ["crossref", "s2"]
+
+
+@responses.activate
+def test_search_stops_after_high_confidence_source():
+    responses.add(
+        responses.GET,
+        "https://api.crossref.org/works",
+        json={
+            "status": "ok",
+            "message": {"items": [{"title": ["Cats on Mat"], "author": [{"given": "Alice", "family": "Smith"}], "issued": {"date-parts": [[2020]]}, "DOI": "10.1/cats"}]},
+        },
+        status=200,
+    )
+    validator = OnlineValidator(
+        OnlineValidatorConfig(sources=["crossref", "s2"], enable_arxiv=False, enable_citation_cff=False),
+        cache=HTTPCache(path=":memory:"),
+    )
+    entry = {"ID": "k", "ENTRYTYPE": "article", "title": "Cats on Mat", "author": "Alice Smith", "year": "2020"}
+    online = validator.validate_entry(entry)
+    assert online["resolved"]["doi"] == "10.1/cats"
+    assert len(responses.calls) == 1
+    assert validator.planner.stats["unknown"]["crossref"]["hits"] == 1
+
+
+@responses.activate
+def test_cache_hits_not_recorded_in_planner_stats():
+    responses.add(
+        responses.GET,
+        "https://api.crossref.org/works",
+        json={"status": "ok", "message": {"items": []}},
+        status=200,
+    )
+    cache = HTTPCache(path=":memory:")
+    config = OnlineValidatorConfig(sources=["crossref"], enable_arxiv=False, enable_citation_cff=False)
+    entry = {"ID": "k", "ENTRYTYPE": "article", "title": "Dogs on Logs", "author": "Bob Jones", "year": "2021"}
+    OnlineValidator(config, cache=cache).validate_entry(dict(entry))
+    second = OnlineValidator(config, cache=cache)
+    second.validate_entry(dict(entry))
+    assert len(responses.calls) == 1
+    assert "crossref" not in second.planner.stats.get("unknown", {})
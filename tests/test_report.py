@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from bibcheck.columnar import ColumnarReportWriter, columnar_row
+from bibcheck.report import (
+    CsvReportWriter,
+    JsonlReportWriter,
+    JsonReportWriter,
+    ReportBuilder,
+    shape_record,
+    write_csv_report,
+    write_json_report,
+)
+
+ENTRIES = [
+    ({"ID": "a", "ENTRYTYPE": "article", "title": "T’1", "year": "2020"}, []),
+    (
+        {"ID": "b", "ENTRYTYPE": "misc", "title": "T2"},
+        [{"type": "MISSING_FIELD", "severity": "ERROR", "message": "缺少 author", "details": {"field": "author"}}],
+    ),
+]
+
+
+def _collect(builder):
+    for entry, issues in ENTRIES:
+        builder.collect_entry(entry, issues, {"resolved": None, "candidate_matches": [{"title": "x", "authors": ["A", "B"]}]})
+    report = builder.build()
+    report["degraded_sources"] = {}
+    report["metrics"] = {"sources": {}, "cache": {}}
+    return report
+
+
+def test_streaming_writers_match_batch_output(tmp_path):
+    full = _collect(ReportBuilder())
+    write_json_report(full, tmp_path / "batch.json")
+    write_csv_report(full, tmp_path / "batch.csv")
+
+    sinks = [
+        JsonReportWriter(str(tmp_path / "stream.json")),
+        CsvReportWriter(str(tmp_path / "stream.csv")),
+        JsonlReportWriter(str(tmp_path / "stream.jsonl")),
+    ]
+    builder = ReportBuilder(sinks=sinks, keep_entries=False)
+    streamed = _collect(builder)
+    builder.finish(streamed)
+
+    assert builder.entries == [] and builder.error_keys == ["b"]
+    assert streamed["stats"] == full["stats"]
+    assert (tmp_path / "stream.json").read_bytes() == (tmp_path / "batch.json").read_bytes()
+    assert (tmp_path / "stream.csv").read_bytes() == (tmp_path / "batch.csv").read_bytes()
+    lines = (tmp_path / "stream.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["citekey"] for line in lines] == ["a", "b"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_streaming_json_without_entries(tmp_path):
+    path = tmp_path / "empty.json"
+    builder = ReportBuilder(sinks=[JsonReportWriter(str(path))], keep_entries=False)
+    builder.finish(builder.build())
+    assert json.loads(path.read_text(encoding="utf-8"))["entries"] == []
+
+
+def _ambiguous_record():
+    candidates = [
+        {"title": f"C{i}", "authors": ["A"] * 50, "doi": f"10.1/{i}", "source": "crossref", "confidence": 0.7 - i / 100,
+         "confidence_components": {"title": 0.9}}
+        for i in range(5)
+    ]
+    issue = {"type": "AMBIGUOUS_MATCH", "severity": "WARNING", "message": "m", "details": {"candidates": candidates[:3]}}
+    builder = ReportBuilder()
+    builder.collect_entry({"ID": "k", "ENTRYTYPE": "article"}, [issue], {"checked": True, "resolved": None, "candidate_matches": candidates})
+    return builder.last_record
+
+
+def test_detail_levels():
+    record = _ambiguous_record()
+    topk = shape_record(record, "topk", top_k=2)
+    assert [c["title"] for c in topk["online"]["candidate_matches"]] == ["C0", "C1"]
+    assert len(topk["issues"][0]["details"]["candidates"]) == 2
+
+    summary = shape_record(record, "summary")
+    assert summary["online"] == {"checked": True, "resolved": None, "candidate_count": 5}
+    assert summary["issues"][0]["details"] == {"candidate_count": 3}
+    # 原记录不被修改
+    assert len(record["online"]["candidate_matches"]) == 5
+
+    row = columnar_row(summary, run_id="r1")
+    assert row["candidate_count"] == 5 and row["issue_types"] == ["AMBIGUOUS_MATCH"] and row["status"] == "WARNING"
+
+
+def test_columnar_writer_roundtrip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    writer = ColumnarReportWriter(str(tmp_path / "r.parquet"), "parquet", run_id="r1", batch_size=1)
+    writer.write(_ambiguous_record())
+    writer.close()
+    table = pq.read_table(tmp_path / "r.parquet")
+    assert table.column("citekey").to_pylist() == ["k"]
@@ -0,0 +1,80 @@
+import pytest
+import requests
+import responses
+
+from bibcheck.cache import HTTPCache
+from bibcheck.sources.http import CircuitBreakers, RetryPolicy, SourceHTTP, SourceUnavailable
+from bibcheck.validators_online import OnlineValidator, OnlineValidatorConfig
+
+URL = "https://api.crossref.org/works/10.1/x"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr("bibcheck.sources.http.time.sleep", calls.append)
+    return calls
+
+
+@responses.activate
+def test_429_honours_retry_after_and_5xx_uses_jittered_backoff(sleeps):
+    responses.add(responses.GET, URL, status=429, headers={"Retry-After": "3"})
+    responses.add(responses.GET, URL, status=502)
+    responses.add(responses.GET, URL, json={"ok": True})
+    http = SourceHTTP(requests.Session(), RetryPolicy(base_delay=1.0, jitter=0.5, seed=1))
+    assert http.get("crossref", URL) == {"ok": True}
+    assert sleeps[0] == 3.0
+    assert 0.5 <= sleeps[1] <= 1.0
+
+
+@responses.activate
+def test_deadline_stops_retries(sleeps):
+    responses.add(responses.GET, URL, status=503)
+    http = SourceHTTP(requests.Session(), RetryPolicy(attempts=10, base_delay=5.0, jitter=0.0, deadline=2.0))
+    with pytest.raises(SourceUnavailable, match="deadline"):
+        http.get("crossref", URL)
+    assert sleeps == [] and len(responses.calls) == 1
+
+
+@responses.activate
+def test_other_4xx_is_not_retried(sleeps):
+    responses.add(responses.GET, URL, status=400)
+    assert SourceHTTP(requests.Session()).get("crossref", URL) is None
+    assert len(responses.calls) == 1
+
+
+def test_breaker_half_open_probe(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("bibcheck.sources.http.time.monotonic", lambda: clock[0])
+    breakers = CircuitBreakers(threshold=2, reset_timeout=10)
+    b = breakers.get("s2")
+    b.record_failure("503")
+    assert b.allow()
+    assert b.record_failure("503") is True
+    assert breakers.is_open("s2") and not b.allow()
+    clock[0] += 11
+    assert b.allow() and not b.allow()  # 半开状态只放行一次试探
+    b.record_success()
+    assert b.state == "closed" and breakers.degraded()["s2"]["short_circuited"] == 2
+
+
+@responses.activate
+def test_open_breaker_skips_source_and_reports_degraded(sleeps):
+    responses.add(responses.GET, "https://api.semanticscholar.org/graph/v1/paper/search", status=503)
+    validator = OnlineValidator(
+        OnlineValidatorConfig(sources=["s2"], min_interval=0.0, retry=RetryPolicy(attempts=2), breaker_threshold=2),
+        cache=HTTPCache(path=":memory:"),
+    )
+    results = []
+    for i in range(4):
+        entry = {"ID": f"k{i}", "ENTRYTYPE": "article", "title": f"Some Paper Title {i}", "year": "2020"}
+        results.append(validator.validate_entry(entry))
+        assert [iss["type"] for iss in entry["_online_issues"]] == ["ONLINE_SOURCE_UNAVAILABLE"]
+
+    assert len(responses.calls) == 4  # 前两个条目各 2 次尝试，之后熔断直接跳过
+    assert all(r["unavailable_sources"] == ["s2"] for r in results)
+    degraded = validator.http.breakers.degraded()
+    assert degraded["s2"]["trips"] == 1 and degraded["s2"]["short_circuited"] == 2
+    assert validator.metrics.snapshot()["sources"]["s2"]["short_circuited"] == 2
+    # 失败不写入缓存
+    assert validator.metrics.snapshot()["cache"].get("s2", {}).get("sets", 0) == 0
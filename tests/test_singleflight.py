@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+import requests
+import responses
+
+from bibcheck.cache import HTTPCache
+from bibcheck.singleflight import SingleFlight
+from bibcheck.sources.http import DeadlineExceeded, SourceHTTP
+from bibcheck.validators_online import OnlineValidator, OnlineValidatorConfig
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"title": "T"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [{"title": "T"}] * 5
+    assert results[0] is not results[1]
+
+
+def test_expected_key_result_kept_until_last_consumer():
+    flight = SingleFlight()
+    calls = []
+    flight.expect(["k", "k"])
+    assert flight.do("k", lambda: calls.append(1)) is None
+    assert flight.do("k", lambda: calls.append(1)) is None
+    assert len(calls) == 1
+    # 第三次超出预规划，结果已释放，需要重新执行
+    flight.do("k", lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_follower_with_budget_retries_after_leader_timeout():
+    http = SourceHTTP(requests.Session())
+    flight = SingleFlight(remaining=http.remaining)
+    started = threading.Event()
+    calls = []
+
+    def lookup():
+        calls.append(threading.current_thread().name)
+        if len(calls) == 1:
+            started.set()
+            time.sleep(0.1)
+            raise DeadlineExceeded("crossref", "deadline exceeded")
+        return {"title": "T"}
+
+    def leader():
+        with http.deadline(time.monotonic() + 0.05):
+            with pytest.raises(DeadlineExceeded):
+                flight.do("crossref:doi:10.1/x", lookup)
+
+    results = []
+
+    def follower():
+        started.wait()
+        with http.deadline(time.monotonic() + 5):
+            results.append(flight.do("crossref:doi:10.1/x", lookup))
+
+    threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [{"title": "T"}]
+    assert len(calls) == 2
+
+
+def test_follower_stops_waiting_at_own_deadline():
+    http = SourceHTTP(requests.Session())
+    flight = SingleFlight(remaining=http.remaining)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return {"title": "T"}
+
+    leader = threading.Thread(target=lambda: flight.do("crossref:doi:10.1/x", slow))
+    leader.start()
+    started.wait()
+    begin = time.monotonic()
+    with http.deadline(time.monotonic() + 0.05):
+        with pytest.raises(DeadlineExceeded) as exc:
+            flight.do("crossref:doi:10.1/x", slow)
+    assert time.monotonic() - begin < 1
+    assert exc.value.source == "crossref"
+    release.set()
+    leader.join()
+
+
+@responses.activate
+def test_shared_doi_requested_once():
+    responses.add(responses.GET, "https://api.crossref.org/works/10.1/missing", status=404)
+    validator = OnlineValidator(
+        OnlineValidatorConfig(sources=["crossref"], enable_arxiv=False, enable_citation_cff=False),
+        cache=HTTPCache(path=":memory:"),
+    )
+    entries = [
+        {"ID": "a", "ENTRYTYPE": "article", "title": "T", "doi": "10.1/missing"},
+        {"ID": "b", "ENTRYTYPE": "article", "title": "T", "doi": "https://doi.org/10.1/missing"},
+    ]
+    assert validator.plan_lookups(entries) == {"planned": 2, "unique": 1}
+    for entry in entries:
+        validator.validate_entry(entry)
+        assert any(i["type"] == "DOI_NOT_FOUND" for i in entry["_online_issues"])
+    assert len(responses.calls) == 1